@@ -1,7 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+from nucleo import CONCEPTOS_CVP, rango_volumenes
+from cuadricula import CuadriculaCanvas
+from dependencias import GrafoCVP
+from numeros import convertir, convertir_texto
+from instrumentacion import instrumentar, fase
+
+# Tope de columnas del cuadro (5 filas x 1,000,000 columnas = 40 MB)
+MAXIMO_VOLUMENES = 1_000_000
 
 class CuadroPuntoEquilibrioApp:
     def __init__(self, root):
@@ -19,59 +26,109 @@ class CuadroPuntoEquilibrioApp:
         self.calcular_btn.grid(row=7, column=0, columnspan=6, pady=10)
 
     def create_form(self):
-        conceptos = ["Ventas", "Costos variables", "Margen de Contribución", "Costos Fijos", "Utilidad o Pérdida"]
-        unidades = ["2,000", "4,000", "6,000", "8,000", "10,000"]
-
-        # Crear cabeceras
-        tk.Label(self.root, text="Concepto").grid(row=0, column=0, padx=10, pady=10)
-        for i, unidad in enumerate(unidades):
-            tk.Label(self.root, text=unidad).grid(row=0, column=i+1)
-
-        # Crear campos para ingresar datos
-        for i, concepto in enumerate(conceptos):
-            tk.Label(self.root, text=concepto).grid(row=i+1, column=0, padx=10, pady=5)
-            self.entradas[concepto] = []
-            for j in range(5):
-                entry = tk.Entry(self.root)
-                entry.grid(row=i+1, column=j+1, padx=5)
-                self.entradas[concepto].append(entry)
-
-        # Llenar Costos Fijos con valor predefinido
-        for entry in self.entradas["Costos Fijos"]:
-            entry.insert(0, "200,000")
-            entry.config(state="disabled")  # Deshabilitar las entradas de Costos Fijos
+        campos = [("Precio por unidad", "precio", ""),
+                  ("Costo variable por unidad", "costo_variable", ""),
+                  ("Costos Fijos", "costo_fijo", "200,000")]
+
+        # Datos del producto
+        for i, (texto, clave, valor) in enumerate(campos):
+            tk.Label(self.root, text=texto).grid(row=i, column=0, padx=10, pady=5, sticky="w")
+            entry = tk.Entry(self.root)
+            entry.grid(row=i, column=1, padx=5)
+            entry.insert(0, valor)
+            # Enter en un dato actualiza solo las celdas que dependen de él
+            entry.bind("<Return>", lambda e: self.mostrar_cuadro())
+            self.entradas[clave] = entry
+
+        # Volúmenes: rango Desde/Hasta/Paso o una lista separada por espacios o ';'
+        tk.Label(self.root, text="Unidades desde").grid(row=3, column=0, padx=10, pady=5, sticky="w")
+        for j, (texto, clave, valor) in enumerate([(None, "desde", "2,000"), ("hasta", "hasta", "10,000"),
+                                                   ("paso", "paso", "2,000")]):
+            if texto:
+                tk.Label(self.root, text=texto).grid(row=3, column=2 * j)
+            entry = tk.Entry(self.root, width=10)
+            entry.grid(row=3, column=2 * j + 1, padx=5, sticky="w")
+            entry.insert(0, valor)
+            self.entradas[clave] = entry
+        tk.Label(self.root, text="Lista de unidades (opcional)").grid(row=4, column=0, padx=10, pady=5, sticky="w")
+        self.entradas["lista"] = tk.Entry(self.root)
+        self.entradas["lista"].grid(row=4, column=1, columnspan=5, padx=5, sticky="we")
+
+        # Cuadro costo-volumen-utilidad: un solo Canvas sin importar el número de columnas.
+        # Los volúmenes (encabezado) y los Costos Fijos se editan con doble clic.
+        self.grafo = None
+        # Datos del formulario con que se armó o actualizó el cuadro por última vez
+        self.formulario = None
+        self.volumenes_formulario = None
+        self.cuadricula = CuadriculaCanvas(self.root, CONCEPTOS_CVP,
+                                           filas_editables=(-1, CONCEPTOS_CVP.index("Costos Fijos")),
+                                           al_editar=self.editar_celda)
+        self.cuadricula.marco.grid(row=5, column=0, columnspan=6, padx=10, pady=10, sticky="we")
 
+    def valor(self, clave):
+        # Acepta "Q200,000.00", "200.000,00", "(1,500)"...
+        return convertir_texto(self.entradas[clave].get())
+
+    def leer_volumenes(self):
+        """Volúmenes de la lista si se escribió alguno; si no, los del rango Desde/Hasta/Paso."""
+        lista = self.entradas["lista"].get().replace(';', ' ').split()
+        if lista:
+            return convertir(lista)
+        return rango_volumenes(self.valor("desde"), self.valor("hasta"), self.valor("paso"), MAXIMO_VOLUMENES)
+
+    @instrumentar()
     def mostrar_cuadro(self):
         # Extraer los valores de las entradas
-        datos = {}
         try:
-            for concepto in self.entradas:
-                datos[concepto] = [float(entry.get().replace(',', '')) for entry in self.entradas[concepto]]
+            precio = self.valor("precio")
+            costo_variable = self.valor("costo_variable")
+            costo_fijo = self.valor("costo_fijo")
+            volumenes = self.leer_volumenes()
+        except ValueError as error:
+            messagebox.showerror("Error", f"Asegúrese de ingresar solo valores numéricos ({error})")
+            return
+
+        formulario = {"precio": precio, "costo_variable": costo_variable, "costo_fijo": costo_fijo}
+
+        # Mismos volúmenes en el formulario: solo se aplican los datos que cambiaron desde la
+        # última vez, así no se pisan las celdas editadas a mano (Costos Fijos o volúmenes)
+        if self.grafo is not None and np.array_equal(volumenes, self.volumenes_formulario):
+            with fase("calculo"):
+                afectados = {}
+                for nombre, valor in formulario.items():
+                    if valor != self.formulario[nombre]:
+                        afectados.update(self.grafo.cambiar(nombre, valor))
+            self.formulario = formulario
+            with fase("render"):
+                self.repintar(afectados)
+            return
+
+        # Cuadro nuevo: todo en una sola pasada vectorizada
+        with fase("calculo"):
+            self.grafo = GrafoCVP(volumenes, precio, costo_variable, costo_fijo)
+        self.formulario = formulario
+        self.volumenes_formulario = volumenes
+
+        # Solo se dibujan las columnas visibles
+        with fase("render"):
+            self.cuadricula.configurar(self.grafo.volumenes, self.grafo.cuadro)
+
+    def editar_celda(self, fila, columna, texto):
+        try:
+            valor = convertir_texto(texto)
         except ValueError:
             messagebox.showerror("Error", "Asegúrese de ingresar solo valores numéricos")
             return
+        concepto = None if fila == -1 else CONCEPTOS_CVP[fila]
+        self.repintar(self.grafo.cambiar_celda(concepto, columna, valor), columna if concepto is None else None)
+
+    def repintar(self, afectados, volumen_editado=None):
+        # Solo las celdas recalculadas; el encabezado si se editó un volumen
+        if volumen_editado is not None:
+            self.cuadricula.refrescar([], [volumen_editado], encabezado=True)
+        for concepto, columnas in afectados.items():
+            self.cuadricula.refrescar([self.grafo.filas[concepto]], columnas)
 
-        # Crear el DataFrame con los datos
-        data = {
-            'Concepto': ["Ventas", "Costos variables", "Margen de Contribución", "Costos Fijos", "Utilidad o Pérdida"],
-            '2,000': [datos["Ventas"][0], datos["Costos variables"][0], datos["Margen de Contribución"][0], datos["Costos Fijos"][0], datos["Utilidad o Pérdida"][0]],
-            '4,000': [datos["Ventas"][1], datos["Costos variables"][1], datos["Margen de Contribución"][1], datos["Costos Fijos"][1], datos["Utilidad o Pérdida"][1]],
-            '6,000': [datos["Ventas"][2], datos["Costos variables"][2], datos["Margen de Contribución"][2], datos["Costos Fijos"][2], datos["Utilidad o Pérdida"][2]],
-            '8,000': [datos["Ventas"][3], datos["Costos variables"][3], datos["Margen de Contribución"][3], datos["Costos Fijos"][3], datos["Utilidad o Pérdida"][3]],
-            '10,000': [datos["Ventas"][4], datos["Costos variables"][4], datos["Margen de Contribución"][4], datos["Costos Fijos"][4], datos["Utilidad o Pérdida"][4]],
-        }
-        
-        df = pd.DataFrame(data)
-
-        # Crear la tabla con los valores ingresados
-        fig, ax = plt.subplots(figsize=(8, 4))
-        table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
-
-        # Ajustar la tabla
-        table.scale(1.5, 1.5)
-        ax.axis('off')
-
-        plt.show()
 
 # Crear la aplicación
 root = tk.Tk()
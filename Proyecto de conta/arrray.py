@@ -1,7 +1,14 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
+from grafica import GraficaEquilibrio, MapaSensibilidad
+from nucleo import muestrear_curva, sensibilidad
+from validacion import validar, mensaje
+from no_lineal import CurvasNoLineales
+
+METRICA_UNIDADES = "Punto de Equilibrio (unidades)"
+METRICA_UTILIDAD = "Utilidad o Pérdida (Q)"
+PUNTOS_MAXIMOS_MAPA = 2000
 
 class BreakEvenApp:
     def __init__(self, root):
@@ -64,17 +71,78 @@ class BreakEvenApp:
         self.utilidad_perdida_btn.grid(row=4, column=0)
 
     def create_grafica_tab(self):
-        ttk.Button(self.tab_grafica, text="Mostrar Gráfica", command=self.plot_breakeven).pack(pady=20)
+        controles = ttk.Frame(self.tab_grafica)
+        controles.pack(pady=10)
 
-    def calculate_breakeven(self):
-        fixed_costs = self.fixed_costs.get()
-        sale_price = self.sale_price.get()
-        variable_cost = self.variable_cost.get()
+        ttk.Button(controles, text="Mostrar Gráfica", command=self.plot_breakeven).grid(column=0, row=0, columnspan=2, pady=5)
+        ttk.Button(controles, text="Mapa de Sensibilidad", command=self.plot_sensitivity).grid(column=2, row=0, columnspan=2, pady=5)
+
+        # Rangos del mapa de sensibilidad (vacío = ±50 % alrededor de los valores actuales)
+        self.sens_price_min = tk.StringVar()
+        self.sens_price_max = tk.StringVar()
+        self.sens_cost_min = tk.StringVar()
+        self.sens_cost_max = tk.StringVar()
+        self.sens_points = tk.StringVar(value="200")
+        self.sens_units = tk.StringVar(value="0")
+        self.sens_metric = tk.StringVar(value=METRICA_UNIDADES)
+
+        campos = [
+            ("Precio desde:", self.sens_price_min), ("Precio hasta:", self.sens_price_max),
+            ("Costo var. desde:", self.sens_cost_min), ("Costo var. hasta:", self.sens_cost_max),
+            ("Puntos por eje:", self.sens_points), ("Unidades (utilidad):", self.sens_units),
+        ]
+        for i, (texto, variable) in enumerate(campos):
+            ttk.Label(controles, text=texto).grid(column=(i % 2) * 2, row=1 + i // 2, padx=5, sticky=tk.E)
+            ttk.Entry(controles, textvariable=variable, width=10).grid(column=(i % 2) * 2 + 1, row=1 + i // 2)
+        ttk.Combobox(controles, textvariable=self.sens_metric, state="readonly", width=30,
+                     values=[METRICA_UNIDADES, METRICA_UTILIDAD]).grid(column=0, row=4, columnspan=4, pady=5)
+
+        # Curvas no lineales (vacío = sin ese efecto; volúmenes vacíos = según el punto de equilibrio lineal)
+        self.curve_elasticity = tk.StringVar()
+        self.curve_reference = tk.StringVar()
+        self.curve_discount = tk.StringVar()
+        self.curve_learning = tk.StringVar()
+        self.curve_max_units = tk.StringVar()
+        campos = [
+            ("Elasticidad demanda:", self.curve_elasticity), ("Volumen referencia:", self.curve_reference),
+            ("Descuento máx. (%):", self.curve_discount), ("Aprendizaje (%):", self.curve_learning),
+            ("Volumen máximo:", self.curve_max_units),
+        ]
+        for i, (texto, variable) in enumerate(campos):
+            ttk.Label(controles, text=texto).grid(column=(i % 2) * 2, row=5 + i // 2, padx=5, sticky=tk.E)
+            ttk.Entry(controles, textvariable=variable, width=10).grid(column=(i % 2) * 2 + 1, row=5 + i // 2)
+        ttk.Button(controles, text="Curvas no Lineales", command=self.plot_nonlinear).grid(column=2, row=7, columnspan=2, pady=5)
+
+        # Las figuras se crean al primer uso y después solo se actualizan sus datos
+        self.grafica = None
+        self.mapa = None
+        self.curvas = None
 
-        if sale_price <= variable_cost:
+    def show_chart(self, chart):
+        """Muestra en la pestaña la gráfica indicada y oculta la otra"""
+        for other in (self.grafica, self.mapa, self.curvas):
+            if other is not None and other is not chart:
+                other.widget.pack_forget()
+        chart.widget.pack(fill='both', expand=True)
+
+    def read_inputs(self):
+        """(costos fijos, precio, costo variable) si cumplen las reglas de validacion.py; si no, None"""
+        try:
+            valores = (self.fixed_costs.get(), self.sale_price.get(), self.variable_cost.get())
+            error = mensaje(validar(valores[1], valores[0], valores[2]).codigos)
+        except tk.TclError:
+            error = "Por favor, ingresa valores numéricos."
+        if error:
             self.update_result_buttons(0, 0, 0, 0, 0)
-            self.punto_equilibrio_btn.config(text="Error: El precio de venta debe ser mayor que el costo variable.")
+            self.punto_equilibrio_btn.config(text="Error: " + error.replace("\n", " "))
+            return None
+        return valores
+
+    def calculate_breakeven(self):
+        valores = self.read_inputs()
+        if valores is None:
             return
+        fixed_costs, sale_price, variable_cost = valores
 
         # Cálculo del punto de equilibrio en unidades y quetzales
         breakeven_units = fixed_costs / (sale_price - variable_cost)
@@ -100,32 +168,113 @@ class BreakEvenApp:
         self.utilidad_perdida_btn.config(text=f"Utilidad o Pérdida: {utility_loss:.2f}")
 
     def plot_breakeven(self):
-        fixed_costs = self.fixed_costs.get()
-        sale_price = self.sale_price.get()
-        variable_cost = self.variable_cost.get()
+        valores = self.read_inputs()
+        if valores is None:
+            return
+        fixed_costs, sale_price, variable_cost = valores
 
         breakeven_units = fixed_costs / (sale_price - variable_cost)
 
+        if self.grafica is None:
+            self.grafica = GraficaEquilibrio(self.tab_grafica, [
+                ("Ingresos Totales", dict(color='green')),
+                ("Costos Totales", dict(color='red')),
+                ("Costos Variables", dict(color='orange')),
+                ("Costos Fijos", dict(color='blue', linestyle='--')),
+            ])
+        self.show_chart(self.grafica)
+
         # Datos para la gráfica
-        units = np.arange(0, breakeven_units * 2, 1)
+        units = muestrear_curva(0, breakeven_units * 2, especiales=[breakeven_units],
+                                presupuesto=self.grafica.presupuesto_puntos())
         revenue = sale_price * units
         total_costs = fixed_costs + variable_cost * units
         variable_costs = variable_cost * units  
         fixed_costs_line = np.full_like(units, fixed_costs)
 
         # Gráfica del punto de equilibrio
-        plt.figure(figsize=(10, 6))
-        plt.plot(units, revenue, label='Ingresos Totales', color='green')
-        plt.plot(units, total_costs, label='Costos Totales', color='red')
-        plt.plot(units, variable_costs, label='Costos Variables', color='orange')
-        plt.plot(units, fixed_costs_line, label='Costos Fijos', color='blue', linestyle='--')
-        plt.axvline(x=breakeven_units, color='black', linestyle='--', label='Punto de Equilibrio')
-        plt.title('Gráfica del Punto de Equilibrio')
-        plt.xlabel('Unidades')
-        plt.ylabel('Quetzales')
-        plt.legend()
-        plt.grid()
-        plt.show()
+        self.grafica.actualizar(units, (revenue, total_costs, variable_costs, fixed_costs_line), breakeven_units)
+
+    def plot_nonlinear(self):
+        """Ingresos, costos y utilidad con demanda elástica, descuento por volumen y curva de aprendizaje"""
+        valores = self.read_inputs()
+        if valores is None:
+            return
+        fixed_costs, sale_price, variable_cost = valores
+        lineal = fixed_costs / (sale_price - variable_cost)
+
+        try:
+            reference = self._value_or(self.curve_reference, max(lineal, 1.0))
+            modelo = CurvasNoLineales(sale_price, variable_cost, fixed_costs,
+                                      elasticidad=self._value_or(self.curve_elasticity, np.inf),
+                                      volumen_referencia=reference,
+                                      descuento=self._value_or(self.curve_discount, 0) / 100,
+                                      aprendizaje=self._value_or(self.curve_learning, 100) / 100)
+            max_units = self._value_or(self.curve_max_units, 3 * max(lineal, reference))
+        except ValueError as e:
+            messagebox.showerror("Error", f"Parámetros de las curvas no válidos: {e}")
+            return
+        if max_units <= 0:
+            messagebox.showerror("Error", "El volumen máximo debe ser mayor que cero.")
+            return
+
+        if self.curvas is None:
+            self.curvas = GraficaEquilibrio(self.tab_grafica, [
+                ("Ingresos Totales", dict(color='green')),
+                ("Costos Totales", dict(color='red')),
+                ("Utilidad o Pérdida", dict(color='purple')),
+            ], "Curvas no Lineales")
+        self.show_chart(self.curvas)
+
+        # Mismo presupuesto de puntos que la gráfica lineal, con los cruces y el máximo incluidos
+        units, series, cruces, optimo = modelo.series_grafica(0, max_units, self.curvas.presupuesto_puntos())
+        if len(cruces):
+            texto = "Puntos de Equilibrio: " + ", ".join(f"{c:,.0f}" for c in cruces)
+        else:
+            texto = "Sin punto de equilibrio en el rango"
+        texto += f"\nUtilidad máxima: Q{optimo.utilidad[0]:,.2f} con {optimo.unidades[0]:,.0f} unidades"
+        self.curvas.actualizar(units, series, cruces[0] if len(cruces) else np.nan, texto)
+
+    @staticmethod
+    def _value_or(variable, default):
+        texto = variable.get().strip()
+        return float(texto) if texto else default
+
+    def plot_sensitivity(self):
+        """Mapa de calor de la malla precio x costo variable con los costos fijos constantes"""
+        fixed_costs = self.fixed_costs.get()
+        sale_price = self.sale_price.get()
+        variable_cost = self.variable_cost.get()
+
+        try:
+            price_min = self._value_or(self.sens_price_min, 0.5 * sale_price)
+            price_max = self._value_or(self.sens_price_max, 1.5 * sale_price)
+            cost_min = self._value_or(self.sens_cost_min, 0.5 * variable_cost)
+            cost_max = self._value_or(self.sens_cost_max, 1.5 * variable_cost if variable_cost > 0 else sale_price)
+            points = int(self._value_or(self.sens_points, 200))
+            units = self._value_or(self.sens_units, 0)
+        except ValueError:
+            messagebox.showerror("Error", "Los rangos del mapa deben ser numéricos.")
+            return
+        if price_max <= price_min or cost_max < cost_min:
+            messagebox.showerror("Error", "Los rangos del mapa no son válidos.")
+            return
+
+        points = min(max(points, 2), PUNTOS_MAXIMOS_MAPA)
+        prices = np.linspace(price_min, price_max, points)
+        costs = np.linspace(cost_min, cost_max, points)
+
+        # Toda la malla en una sola pasada con broadcasting
+        resultado = sensibilidad(prices, costs, fixed_costs, units)
+
+        if self.mapa is None:
+            self.mapa = MapaSensibilidad(self.tab_grafica)
+        self.show_chart(self.mapa)
+
+        if self.sens_metric.get() == METRICA_UTILIDAD:
+            self.mapa.actualizar(resultado.utilidad, prices, costs, f"Utilidad o Pérdida con {units:,.0f} unidades", divergente=True)
+        else:
+            self.mapa.actualizar(resultado.unidades, prices, costs, "Punto de Equilibrio (unidades)")
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,310 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Mediciones de las rutas críticas a tamaños crecientes, con las mismas
+# funciones y clases que usan las ventanas (conta.BreakEvenApp.plot_table,
+# cuadricula.CuadriculaCanvas, grafica.GraficaEquilibrio y el PNG con Agg de
+# wef.py/edn.py). Los resultados se guardan en JSON para compararlos entre commits:
+#
+#   python benchmark.py --salida bench_nuevo.json --comparar bench_anterior.json
+#
+# Las tablas y gráficas necesitan una pantalla (la gráfica dibuja con Agg dentro
+# de Tk); si no hay DISPLAY se intenta iniciar Xvfb. Sin pantalla esas pruebas
+# se marcan como omitidas. El PNG de cache_graficas no necesita pantalla.
+
+TAMANOS_NUCLEO = [1_000, 100_000, 1_000_000, 10_000_000]
+RANGOS_TABLA_VIRTUAL = [1_000, 1_000_000, 10_000_000]
+PUNTOS_GRAFICA = [11, 10_000, 1_000_000]
+COLUMNAS_CUADRO = [5, 1_000, 100_000]
+UMBRAL_REGRESION = 1.25  # 25 % más lento que la referencia
+
+
+def medir(funcion, repeticiones=5):
+    """Ejecuta `funcion` varias veces y devuelve (mínimo, mediana) en segundos."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), statistics.median(tiempos)
+
+
+@contextlib.contextmanager
+def pantalla_virtual():
+    """Garantiza un DISPLAY para Tk (Xvfb si hace falta); devuelve False si no hay ninguno."""
+    if os.environ.get("DISPLAY"):
+        yield True
+        return
+    if not shutil.which("Xvfb"):
+        yield False
+        return
+
+    pantalla = ":%d" % (90 + os.getpid() % 100)
+    proceso = subprocess.Popen(["Xvfb", pantalla, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = pantalla
+    time.sleep(0.5)
+    try:
+        yield proceso.poll() is None
+    finally:
+        del os.environ["DISPLAY"]
+        proceso.terminate()
+        proceso.wait()
+
+
+def bench_nucleo(resultados, escala):
+    from nucleo import calcular_punto_equilibrio, cuadro_cvp
+    from dependencias import GrafoCVP
+    from numeros import convertir
+    from escenarios import AlmacenEscenarios
+    from metas import resolver_metas
+    from periodos import equilibrio_por_periodo
+    from escalonados import CostosEscalonados
+    from no_lineal import CurvasNoLineales
+    from precios import optimizar_lineal, optimizar_tabla
+
+    generador = np.random.default_rng(0)
+    for n in TAMANOS_NUCLEO[:len(TAMANOS_NUCLEO) - escala]:
+        precio = generador.uniform(1, 100, n)
+        costo_variable = precio * generador.uniform(0.2, 1.1, n)
+        costo_fijo = generador.uniform(0, 1e6, n)
+        minimo, mediana = medir(lambda: calcular_punto_equilibrio(precio, costo_fijo, costo_variable, 1000.0))
+        resultados.append(("nucleo.calcular_punto_equilibrio", n, minimo, mediana))
+
+        volumenes = np.arange(1, n + 1) * 2000.0
+        minimo, mediana = medir(lambda: cuadro_cvp(50.0, 30.0, 200000.0, volumenes))
+        resultados.append(("nucleo.cuadro_cvp", n, minimo, mediana))
+
+        # Editar una celda de Costos Fijos: solo se recalculan dos celdas
+        grafo = GrafoCVP(volumenes, 50.0, 30.0, 200000.0)
+        ciclo = iter(range(10 ** 9))
+        minimo, mediana = medir(lambda: grafo.cambiar_celda("Costos Fijos", n // 2, next(ciclo)))
+        resultados.append(("dependencias.cambiar_celda", n, minimo, mediana))
+
+        # Montos como salen de una hoja de cálculo ("Q1,234.56"); el texto de 10M filas no cabe cómodo en memoria
+        if n <= 1_000_000:
+            textos = np.char.add("Q", np.char.mod("%.2f", costo_fijo))
+            minimo, mediana = medir(lambda: convertir(textos, "gt"), 3)
+            resultados.append(("numeros.convertir", n, minimo, mediana))
+
+        # Escenarios guardados: ordenar por punto de equilibrio y filtrar por margen
+        almacen = AlmacenEscenarios.desde_arreglos(precio, costo_fijo, costo_variable)
+        minimo, mediana = medir(lambda: almacen.ordenar("unidades_equilibrio"), 3)
+        resultados.append(("escenarios.ordenar", n, minimo, mediana))
+        minimo, mediana = medir(lambda: almacen.filtrar(margen=(10, None), unidades_equilibrio=(None, 50_000)))
+        resultados.append(("escenarios.filtrar", n, minimo, mediana))
+
+        # Metas de utilidad: forma cerrada en todo el arreglo
+        minimo, mediana = medir(lambda: resolver_metas(100_000.0, precio, costo_fijo, costo_variable, 20_000.0))
+        resultados.append(("metas.resolver_metas", n, minimo, mediana))
+
+        # Equilibrio en el tiempo: n celdas = (n / 120) productos x 120 meses
+        productos = max(1, n // 120)
+        volumen_mensual = generador.uniform(0, 1000, (productos, 120))
+        costo_fijo_mensual = np.full((productos, 120), 20_000.0)
+        minimo, mediana = medir(lambda: equilibrio_por_periodo(volumen_mensual, precio[:productos, np.newaxis],
+                                                               costo_variable[:productos, np.newaxis],
+                                                               costo_fijo_mensual))
+        resultados.append(("periodos.equilibrio_por_periodo", n, minimo, mediana))
+
+        # Costos fijos por tramos: n consultas de utilidad contra 1000 tramos
+        capacidades = np.cumsum(generador.uniform(100, 1000, 1000))
+        escalonado = CostosEscalonados(capacidades, np.cumsum(generador.uniform(0, 9000, 1000)), 25.0, 15.0)
+        consultas = generador.uniform(0, capacidades[-1], n)
+        minimo, mediana = medir(lambda: escalonado.utilidad(consultas))
+        resultados.append(("escalonados.utilidad", n, minimo, mediana))
+
+        # Curvas no lineales: todos los cruces por producto (malla de 256 volúmenes + bisección)
+        if n <= 100_000:
+            curvas = CurvasNoLineales(precio, costo_variable * 0.8, costo_fijo * 0.1, elasticidad=3.0,
+                                      volumen_referencia=10_000.0, descuento=0.1, aprendizaje=0.9)
+            minimo, mediana = medir(lambda: curvas.puntos_equilibrio(100_000.0), 3)
+            resultados.append(("no_lineal.puntos_equilibrio", n, minimo, mediana))
+
+        # Precio óptimo: demanda lineal (forma cerrada) y tabla de 12 observaciones por producto
+        minimo, mediana = medir(lambda: optimizar_lineal(1000.0 * precio, 10.0, costo_variable, costo_fijo))
+        resultados.append(("precios.optimizar_lineal", n, minimo, mediana))
+        if n <= 100_000:
+            tabla_precios = np.sort(generador.uniform(1, 150, (n, 12)), axis=1)
+            tabla_volumenes = np.sort(generador.uniform(0, 1e4, (n, 12)), axis=1)[:, ::-1]
+            minimo, mediana = medir(lambda: optimizar_tabla(tabla_precios, tabla_volumenes, costo_variable, costo_fijo))
+            resultados.append(("precios.optimizar_tabla", n, minimo, mediana))
+
+
+def bench_tablas(resultados, escala):
+    import tkinter as tk
+    from conta import BreakEvenApp
+    from cuadricula import CuadriculaCanvas
+    from dependencias import GrafoCVP
+    from escenarios import Escenario
+    from nucleo import CONCEPTOS_CVP
+
+    root = tk.Tk()
+    root.withdraw()
+
+    # plot_table de conta.py tal como se usa: rango Desde/Hasta/Paso -> tabla virtual, y luego desplazarse
+    app = BreakEvenApp(root)
+    app.escenario = Escenario(50.0, 200000.0, 30.0)
+    app.range_step.set("1")
+    for n in RANGOS_TABLA_VIRTUAL[:len(RANGOS_TABLA_VIRTUAL) - escala]:
+        app.range_start.set("0")
+        app.range_end.set(str(n - 1))
+
+        def configurar_y_desplazar():
+            app.plot_table()
+            for fraccion in np.linspace(0, 1, 20):
+                app.table.mostrar(int(fraccion * n))
+            root.update_idletasks()
+
+        minimo, mediana = medir(configurar_y_desplazar)
+        resultados.append(("conta.plot_table", n, minimo, mediana))
+
+    # Cuadro costo-volumen-utilidad de hfbn.py/Pr.py: GrafoCVP + CuadriculaCanvas, y luego desplazarse
+    ventana = tk.Toplevel(root)
+    cuadricula = CuadriculaCanvas(ventana, CONCEPTOS_CVP)
+    cuadricula.marco.pack()
+    ventana.update_idletasks()
+    for k in COLUMNAS_CUADRO[:len(COLUMNAS_CUADRO) - escala]:
+        volumenes = np.arange(1, k + 1) * 2000.0
+
+        def construir():
+            grafo = GrafoCVP(volumenes, 50.0, 30.0, 200000.0)
+            cuadricula.configurar(grafo.volumenes, grafo.cuadro)
+            for fraccion in np.linspace(0, 1, 20):
+                cuadricula.mostrar(int(fraccion * k))
+            root.update_idletasks()
+
+        minimo, mediana = medir(construir, 3)
+        resultados.append(("cuadricula.configurar_desplazar", k, minimo, mediana))
+    ventana.destroy()
+
+    root.destroy()
+
+
+def bench_graficas(resultados, escala):
+    import tkinter as tk
+    from grafica import GraficaEquilibrio
+
+    root = tk.Tk()
+    root.withdraw()
+    ventana = tk.Toplevel(root)
+    grafica = GraficaEquilibrio(ventana, [
+        ("Ventas", dict(color='green')),
+        ("Costos Totales", dict(color='red')),
+        ("Utilidad/Pérdida", dict(color='blue')),
+    ])
+    grafica.widget.pack(fill="both", expand=True)
+    ventana.update_idletasks()
+
+    def series(n, costo_fijo):
+        punto_equilibrio = costo_fijo / 20.0
+        unidades = np.linspace(0, 2 * punto_equilibrio, n)
+        return unidades, (unidades * 50, costo_fijo + unidades * 30, unidades * 20 - costo_fijo), punto_equilibrio
+
+    for n in PUNTOS_GRAFICA[:len(PUNTOS_GRAFICA) - escala]:
+        # Escenarios de distinta escala: cambian los límites y se redibuja la figura completa
+        escenarios = [series(n, 200000.0), series(n, 2000000.0)]
+        ciclo = iter(range(10 ** 9))
+        minimo, mediana = medir(lambda: grafica.actualizar(*escenarios[next(ciclo) % 2]))
+        resultados.append(("grafica.actualizar_redibujo", n, minimo, mediana))
+
+        # Mismo rango de ejes: solo se pintan las líneas sobre el fondo guardado (blit)
+        unidades, valores, punto_equilibrio = escenarios[0]
+        grafica.actualizar(unidades, valores, punto_equilibrio)
+        minimo, mediana = medir(lambda: grafica.actualizar(unidades, valores, punto_equilibrio))
+        resultados.append(("grafica.actualizar_blit", n, minimo, mediana))
+
+    ventana.destroy()
+    root.destroy()
+
+
+def bench_png(resultados):
+    """Dibujo con Agg y guardado del PNG (cache_graficas._renderizar) de wef.py y edn.py."""
+    import tempfile
+    from cache_graficas import CacheGraficas, _renderizar
+    from dibujos import dibujar_edn, dibujar_wef
+
+    # Precio, costo variable, costo fijo y punto de equilibrio en unidades
+    parametros = (50.0, 30.0, 200000.0, 10000.0)
+    with tempfile.TemporaryDirectory() as directorio:
+        cache = CacheGraficas(directorio)
+        for nombre, dibujar in (("wef", dibujar_wef), ("edn", dibujar_edn)):
+            minimo, mediana = medir(lambda: _renderizar(cache, nombre, dibujar, parametros))
+            resultados.append((f"cache_graficas.renderizar_{nombre}", 1, minimo, mediana))
+
+
+def comparar(actual, anterior, umbral=UMBRAL_REGRESION):
+    """Imprime la razón actual/anterior por caso y devuelve la lista de regresiones."""
+    referencia = {(c["nombre"], c["tamano"]): c for c in anterior["casos"]}
+    regresiones = []
+    for caso in actual["casos"]:
+        previo = referencia.get((caso["nombre"], caso["tamano"]))
+        if previo is None:
+            continue
+        razon = caso["segundos_min"] / previo["segundos_min"] if previo["segundos_min"] > 0 else float("inf")
+        marca = "  <-- REGRESIÓN" if razon > umbral else ""
+        print(f"{caso['nombre']:40s} {caso['tamano']:>10,d}  x{razon:.2f}{marca}")
+        if razon > umbral:
+            regresiones.append(caso)
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las rutas críticas.")
+    parser.add_argument("--salida", default="bench_output.json", help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--rapido", action="store_true", help="Omitir el tamaño más grande de cada caso")
+    args = parser.parse_args(argv)
+    escala = 1 if args.rapido else 0
+
+    resultados = []
+    omitidos = []
+    bench_nucleo(resultados, escala)
+    bench_png(resultados)
+    with pantalla_virtual() as hay_pantalla:
+        if hay_pantalla:
+            bench_tablas(resultados, escala)
+            bench_graficas(resultados, escala)
+        else:
+            omitidos.append("tablas y gráficas (no hay DISPLAY ni Xvfb)")
+
+    informe = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "maquina": platform.machine(),
+        "omitidos": omitidos,
+        "casos": [
+            {"nombre": nombre, "tamano": tamano, "segundos_min": minimo, "segundos_mediana": mediana}
+            for nombre, tamano, minimo, mediana in resultados
+        ],
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, ensure_ascii=False, indent=2)
+
+    for caso in informe["casos"]:
+        print(f"{caso['nombre']:40s} {caso['tamano']:>10,d}  {caso['segundos_min'] * 1000:10.2f} ms")
+    for omitido in omitidos:
+        print(f"omitido: {omitido}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+        print()
+        if comparar(informe, anterior):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import queue
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+# Gráficas renderizadas fuera del hilo de Tk. Cada gráfica se dibuja con el
+# backend Agg (sin pyplot) en un hilo de trabajo, se guarda como PNG y se
+# muestra en la ventana con tk.PhotoImage. Los PNG quedan en una caché en disco
+# con política LRU y tamaño máximo, así volver a abrir un escenario ya graficado
+# es inmediato. La clave incluye VERSION y una huella del código de la función
+# de dibujo, así un cambio en cómo se dibuja no sirve imágenes viejas.
+
+DIRECTORIO = os.environ.get("CONTA_CACHE_GRAFICAS",
+                            os.path.join(os.path.expanduser("~"), ".cache", "prue", "graficas"))
+LIMITE_BYTES = 200 * 1024 * 1024
+SONDEO_MS = 30
+DPI = 80
+VERSION = 1  # subir al cambiar algo del dibujo fuera de la función (tamaño, DPI, _renderizar)
+
+
+def _huella(codigo, resumen):
+    # Bytecode, nombres y constantes; las funciones anidadas se recorren (su repr lleva una dirección)
+    resumen.update(codigo.co_code)
+    resumen.update(repr(codigo.co_names).encode("utf-8"))
+    for constante in codigo.co_consts:
+        if isinstance(constante, types.CodeType):
+            _huella(constante, resumen)
+        elif isinstance(constante, frozenset):
+            # El orden de un frozenset cambia entre ejecuciones (hash aleatorio de str)
+            resumen.update(repr(sorted(map(repr, constante))).encode("utf-8"))
+        else:
+            resumen.update(repr(constante).encode("utf-8"))
+
+
+def clave(estilo, parametros, dibujar=None):
+    """Clave estable para (estilo, precio, costo fijo, costo variable, rango...) y el código de `dibujar`."""
+    resumen = hashlib.sha1()
+    texto = f"{VERSION}|{DPI}|{estilo}|" + "|".join(repr(round(float(p), 6)) for p in parametros)
+    resumen.update(texto.encode("utf-8"))
+    if dibujar is not None:
+        _huella(dibujar.__code__, resumen)
+    return resumen.hexdigest()
+
+
+class CacheGraficas:
+    """Caché LRU de archivos PNG en disco con límite de tamaño."""
+
+    def __init__(self, directorio=DIRECTORIO, limite_bytes=LIMITE_BYTES):
+        self.directorio = directorio
+        self.limite_bytes = limite_bytes
+        os.makedirs(directorio, exist_ok=True)
+
+    def ruta(self, llave):
+        return os.path.join(self.directorio, llave + ".png")
+
+    def buscar(self, llave):
+        """Ruta del PNG si está en caché (y lo marca como usado recientemente)."""
+        ruta = self.ruta(llave)
+        try:
+            os.utime(ruta)
+        except FileNotFoundError:
+            return None
+        return ruta
+
+    def guardar(self, llave, figura):
+        """Guarda la figura de forma atómica y recorta la caché si pasa del límite."""
+        ruta = self.ruta(llave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        figura.savefig(temporal, format="png", dpi=DPI)
+        os.replace(temporal, ruta)
+        self.recortar()
+        return ruta
+
+    def recortar(self):
+        archivos = []
+        total = 0
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith(".png"):
+                datos = entrada.stat()
+                archivos.append((datos.st_mtime, datos.st_size, entrada.path))
+                total += datos.st_size
+        # Se borran primero los usados hace más tiempo
+        for _, tamano, ruta in sorted(archivos):
+            if total <= self.limite_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except FileNotFoundError:
+                pass
+            total -= tamano
+
+
+def _renderizar(cache, llave, dibujar, parametros):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figura = Figure(figsize=(8, 5))
+    FigureCanvasAgg(figura)
+    dibujar(figura, *parametros)
+    return cache.guardar(llave, figura)
+
+
+class GraficasEnSegundoPlano:
+    """Pide gráficas a un hilo de trabajo y entrega la ruta del PNG en el hilo de Tk."""
+
+    def __init__(self, root, cache=None):
+        self.root = root
+        self.cache = cache or CacheGraficas()
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graficas")
+        self.cola = queue.Queue()
+        self.generacion = 0
+        self.en_vuelo = 0
+
+    def solicitar(self, estilo, dibujar, parametros, al_terminar, al_fallar=None):
+        """dibujar(figura, *parametros) se ejecuta en segundo plano; al_terminar(ruta) en el hilo de Tk.
+
+        Si el dibujo falla se llama al_fallar(error) en el hilo de Tk; por omisión
+        el error se informa con root.report_callback_exception, como cualquier callback.
+        """
+        self.generacion += 1
+        llave = clave(estilo, parametros, dibujar)
+        ruta = self.cache.buscar(llave)
+        if ruta is not None:
+            al_terminar(ruta)
+            return
+
+        generacion = self.generacion
+        al_fallar = al_fallar or self._informar
+        futuro = self.ejecutor.submit(_renderizar, self.cache, llave, dibujar, parametros)
+        futuro.add_done_callback(lambda f: self.cola.put((generacion, f, al_terminar, al_fallar)))
+        self.en_vuelo += 1
+        if self.en_vuelo == 1:
+            self.root.after(SONDEO_MS, self._sondear)
+
+    def _sondear(self):
+        while True:
+            try:
+                generacion, futuro, al_terminar, al_fallar = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            self.en_vuelo -= 1
+            # Solo se muestra la gráfica pedida más recientemente
+            if generacion != self.generacion:
+                continue
+            if futuro.exception() is not None:
+                al_fallar(futuro.exception())
+            else:
+                al_terminar(futuro.result())
+        if self.en_vuelo > 0:
+            self.root.after(SONDEO_MS, self._sondear)
+
+    def _informar(self, error):
+        self.root.report_callback_exception(type(error), error, error.__traceback__)
@@ -0,0 +1,94 @@
+import json
+import math
+import os
+import subprocess
+import sys
+
+from nucleo import calcular_punto_equilibrio
+
+# Calculadora sin interfaz gráfica: recibe JSON y responde JSON.
+# Solo carga el núcleo numérico (numpy); tkinter, matplotlib y pandas no se
+# importan en esta ruta, así que se puede llamar miles de veces desde scripts.
+#
+#   python calculadora.py '{"precio": 50, "costo_fijo": 200000, "costo_variable": 30}'
+#   echo '[{"precio": 50, "costo_fijo": 1000, "costo_variable": 30, "unidades": 80}]' | python calculadora.py
+#
+# Cada campo puede ser un número o una lista de números (misma longitud).
+
+MODULOS_PESADOS = ["tkinter", "matplotlib", "pandas"]
+LIMITE_ARRANQUE = 0.5  # segundos
+
+
+def _a_json(valor):
+    """Convierte escalares o arreglos de numpy a tipos JSON; inf y nan se vuelven null."""
+    if hasattr(valor, "tolist"):
+        valor = valor.tolist()
+    if isinstance(valor, list):
+        return [_a_json(v) for v in valor]
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+
+def calcular(escenario):
+    """Calcula un escenario (dict con precio, costo_fijo, costo_variable y opcionalmente unidades)."""
+    try:
+        resultado = calcular_punto_equilibrio(
+            escenario["precio"], escenario["costo_fijo"], escenario["costo_variable"], escenario.get("unidades", 0)
+        )
+    except KeyError as e:
+        raise ValueError(f"Falta el campo {e.args[0]}") from None
+    return {
+        "margen": _a_json(resultado.margen),
+        "unidades_equilibrio": _a_json(resultado.unidades),
+        "ventas_equilibrio": _a_json(resultado.ventas),
+        "utilidad": _a_json(resultado.utilidad),
+    }
+
+
+def verificar_arranque(limite=LIMITE_ARRANQUE):
+    """Prueba de regresión del arranque: mide la importación en un proceso nuevo."""
+    codigo = (
+        "import sys, time; t = time.perf_counter(); import calculadora; "
+        "print(time.perf_counter() - t); "
+        f"print(','.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))"
+    )
+    salida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    lineas = salida.stdout.splitlines()
+    segundos = float(lineas[0])
+    cargados = lineas[1] if len(lineas) > 1 else ""
+
+    errores = []
+    if cargados:
+        errores.append(f"se cargaron módulos pesados: {cargados}")
+    if segundos > limite:
+        errores.append(f"la importación tardó {segundos:.3f} s (límite {limite:.3f} s)")
+    return segundos, errores
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] == "--verificar-arranque":
+        segundos, errores = verificar_arranque()
+        print(json.dumps({"segundos": round(segundos, 4), "errores": errores}, ensure_ascii=False))
+        return 1 if errores else 0
+
+    texto = argv[0] if argv and argv[0] != "-" else sys.stdin.read()
+    try:
+        datos = json.loads(texto)
+        if isinstance(datos, list):
+            respuesta = [calcular(escenario) for escenario in datos]
+        else:
+            respuesta = calcular(datos)
+    except (ValueError, TypeError, AttributeError) as e:
+        print(json.dumps({"error": str(e)}, ensure_ascii=False))
+        return 2
+
+    print(json.dumps(respuesta, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
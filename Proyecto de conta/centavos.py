@@ -0,0 +1,135 @@
+import numpy as np
+from collections import namedtuple
+
+# Modo moneda exacto: los quetzales se guardan como centavos en enteros int64
+# dentro de arreglos de NumPy. Sumas y productos son exactos; la única división
+# (el punto de equilibrio) usa una regla de redondeo explícita. Así no aparecen
+# celdas "-0.00" ni totales que difieren por un centavo, y se mantiene la
+# velocidad de las operaciones vectorizadas.
+
+REDONDEOS = ("arriba", "abajo", "mitad_arriba", "mitad_par")
+LIMITE_CENTAVOS = 2.0 ** 63  # int64: montos de hasta unos 9.2e16 quetzales
+SIN_MONTO = "—"  # texto de los montos que no caben en centavos (inf, nan o demasiado grandes)
+
+ResultadoCentavos = namedtuple("ResultadoCentavos", ["margen", "unidades", "ventas", "utilidad", "factible", "exacto"])
+
+
+def _redondear_centavos(quetzales):
+    """Centavos redondeados (aún en float) y dónde caben en int64; inf y nan no caben."""
+    with np.errstate(over="ignore", invalid="ignore"):
+        centavos = np.rint(np.asarray(quetzales, dtype=np.float64) * 100)
+        return centavos, np.abs(centavos) < LIMITE_CENTAVOS
+
+
+def centavos_representables(quetzales):
+    """Centavos int64 (0 donde no caben) y la máscara de los montos que sí caben en int64."""
+    centavos, representables = _redondear_centavos(quetzales)
+    return np.where(representables, centavos, 0).astype(np.int64), representables
+
+
+def a_centavos(quetzales):
+    """Convierte quetzales (float) a centavos int64 redondeando al centavo más cercano.
+
+    Lanza ValueError si algún monto no es finito o no cabe en int64 (en lugar de desbordar).
+    """
+    centavos, representables = _redondear_centavos(quetzales)
+    if not np.all(representables):
+        raise ValueError("Hay montos no finitos o mayores que el límite de centavos int64")
+    return centavos.astype(np.int64)
+
+
+def _restar(a, b):
+    """Diferencia int64 y dónde no desborda (solo puede desbordar con signos distintos)."""
+    with np.errstate(over="ignore"):
+        diferencia = a - b
+    return diferencia, ((a >= 0) == (b >= 0)) | ((diferencia >= 0) == (a >= 0))
+
+
+def _sumar(a, b):
+    """Suma int64 y dónde no desborda (solo puede desbordar con signos iguales)."""
+    with np.errstate(over="ignore"):
+        suma = a + b
+    return suma, ((a >= 0) != (b >= 0)) | ((suma >= 0) == (a >= 0))
+
+
+def _multiplicar(a, b):
+    """Producto int64 y dónde no desborda: el producto envuelto no se deja dividir de vuelta."""
+    with np.errstate(over="ignore", divide="ignore"):
+        producto = a * b
+        divisor = np.where(b == 0, 1, b)
+        return producto, (b == 0) | ((producto // divisor == a) & ~((a == -1) & (b == np.iinfo(np.int64).min)))
+
+
+def a_quetzales(centavos):
+    return np.asarray(centavos, dtype=np.int64) / 100
+
+
+def dividir(numerador, denominador, redondeo="arriba"):
+    """División entera vectorizada con regla de redondeo explícita (denominador > 0)."""
+    if redondeo not in REDONDEOS:
+        raise ValueError(f"Redondeo desconocido: {redondeo}")
+    numerador = np.asarray(numerador, dtype=np.int64)
+    denominador = np.asarray(denominador, dtype=np.int64)
+
+    cociente, residuo = np.divmod(numerador, denominador)  # residuo >= 0 porque denominador > 0
+    if redondeo == "abajo":
+        return cociente
+    if redondeo == "arriba":
+        return cociente + (residuo > 0)
+
+    doble = 2 * residuo
+    if redondeo == "mitad_arriba":
+        return cociente + (doble >= denominador)
+    # mitad_par: en el empate exacto se queda con el cociente par
+    return cociente + ((doble > denominador) | ((doble == denominador) & (cociente % 2 == 1)))
+
+
+def punto_equilibrio_centavos(precio, costo_fijo, costo_variable, unidades=0, redondeo="arriba"):
+    """Punto de equilibrio con montos en centavos int64.
+
+    Las unidades de equilibrio se redondean a unidades enteras según `redondeo`
+    ("arriba" = unidades necesarias para no perder). Las ventas de equilibrio se
+    calculan como costo_fijo * precio / margen redondeado al centavo. Donde el
+    margen es <= 0 no hay equilibrio: `factible` es False y unidades/ventas valen 0.
+    `exacto` es False donde alguna operación desborda int64; ahí los montos no valen.
+    """
+    precio = np.asarray(precio, dtype=np.int64)
+    costo_fijo = np.asarray(costo_fijo, dtype=np.int64)
+    costo_variable = np.asarray(costo_variable, dtype=np.int64)
+    unidades = np.asarray(unidades, dtype=np.int64)
+
+    margen, exacto = _restar(precio, costo_variable)
+    factible = (margen > 0) & exacto
+    divisor = np.where(factible, margen, 1)
+
+    unidades_pe = np.where(factible, dividir(costo_fijo, divisor, redondeo), 0)
+
+    # costo_fijo * precio / margen sin desbordar en el paso intermedio: q * precio + (r * precio) / margen
+    q, r = np.divmod(costo_fijo, divisor)
+    parte_entera, exacto_q = _multiplicar(q, precio)
+    resto, exacto_r = _multiplicar(r, precio)
+    ventas_pe, exacto_suma = _sumar(parte_entera, dividir(resto, divisor, "mitad_par"))
+    exacto = exacto & (~factible | (exacto_q & exacto_r & exacto_suma))
+    ventas_pe = np.where(factible, ventas_pe, 0)
+
+    contribucion, exacto_contribucion = _multiplicar(unidades, margen)
+    utilidad, exacto_utilidad = _restar(contribucion, costo_fijo)
+    exacto = exacto & exacto_contribucion & exacto_utilidad
+    return ResultadoCentavos(margen, unidades_pe, ventas_pe, utilidad, factible, exacto)
+
+
+def formatear_centavos(centavos):
+    """Texto 'Q' sin prefijo con dos decimales exactos; el signo sale del entero, nunca '-0.00'."""
+    centavos = np.asarray(centavos, dtype=np.int64)
+    absoluto = np.abs(centavos)
+    enteros = (absoluto // 100).astype(str)
+    decimales = np.char.zfill((absoluto % 100).astype(str), 2)
+    signo = np.where(centavos < 0, "-", "")
+    return np.char.add(np.char.add(np.char.add(signo, enteros), "."), decimales)
+
+
+def formatear_quetzales(quetzales):
+    """Formatea montos en quetzales (float) pasando por centavos enteros; SIN_MONTO donde no caben."""
+    centavos, representables = centavos_representables(quetzales)
+    textos = formatear_centavos(centavos)
+    return np.where(representables, textos, SIN_MONTO)
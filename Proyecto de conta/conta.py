@@ -1,7 +1,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
-import matplotlib.pyplot as plt
+from grafica import VentanaGrafica
+from tabla_virtual import TablaProgramacion
+from centavos import formatear_quetzales
+from instrumentacion import instrumentar, fase
+from en_vivo import RecalculoEnVivo
+from validacion import validar, mensaje
+from escenarios import Escenario
+
+TABLE_COLUMNS = [
+    ('Concepto', 'Concepto', 100),
+    ('Ventas', 'Ventas (Q)', 120),
+    ('Costos Variables', 'Costos Variables (Q)', 150),
+    ('Margen de Contribución', 'Margen de Contribución (Q)', 150),
+    ('Costos Fijos', 'Costos Fijos (Q)', 100),
+    ('Utilidad o Pérdida', 'Utilidad o Pérdida (Q)', 150),
+]
 
 class BreakEvenApp:
     def __init__(self, root):
@@ -21,9 +36,24 @@ class BreakEvenApp:
         # Botones
         self.create_buttons()
 
+        # Recálculo en vivo mientras se escribe (desactivado por defecto)
+        self.live = RecalculoEnVivo(self.root, [self.price_per_unit, self.fixed_costs, self.variable_cost_per_unit],
+                                    self.prepare_live, self.publish_live, al_fallar=self.fail_live)
+
         # Crear espacio para la tabla
         self.table_frame = ttk.Frame(self.root)
         self.table_frame.grid(column=0, row=4, columnspan=3, pady=10)
+        self.table = None
+
+        # Escenario calculado actualmente (None hasta el primer cálculo)
+        self.escenario = None
+
+        # Gráfica persistente (se crea al primer clic en "Gráfica")
+        self.ventana_grafica = VentanaGrafica(self.root, [
+            ("Ventas", dict(color='green', marker='o')),
+            ("Costos Variables", dict(color='red', marker='o')),
+            ("Utilidad/Pérdida", dict(color='blue', marker='o')),
+        ], "Gráfico del Punto de Equilibrio")
 
     def create_input_fields(self):
         """Crea los campos de entrada para el usuario."""
@@ -44,112 +74,173 @@ class BreakEvenApp:
         self.entry_concepto = tk.StringVar()
         ttk.Entry(self.root, textvariable=self.entry_concepto, width=20).grid(column=1, row=3)
 
+        # Rango de la tabla (vacío = alrededor del punto de equilibrio)
+        self.range_start = tk.StringVar()
+        self.range_end = tk.StringVar()
+        self.range_step = tk.StringVar()
+        ttk.Label(self.root, text="Desde (unidades):").grid(column=2, row=0, padx=10, pady=5)
+        ttk.Entry(self.root, textvariable=self.range_start, width=12).grid(column=3, row=0)
+        ttk.Label(self.root, text="Hasta (unidades):").grid(column=2, row=1, padx=10, pady=5)
+        ttk.Entry(self.root, textvariable=self.range_end, width=12).grid(column=3, row=1)
+        ttk.Label(self.root, text="Paso:").grid(column=2, row=2, padx=10, pady=5)
+        ttk.Entry(self.root, textvariable=self.range_step, width=12).grid(column=3, row=2)
+
     def create_buttons(self):
         """Crea los botones de la aplicación."""
         ttk.Button(self.root, text="Calcular", command=self.calculate_breakeven).grid(column=0, row=5, pady=10)
         ttk.Button(self.root, text="Gráfica", command=self.plot_graph).grid(column=1, row=5, pady=10)
         ttk.Button(self.root, text="Borrar Datos", command=self.clear_fields).grid(column=2, row=5, pady=10)
 
+        self.live_mode = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.root, text="En vivo", variable=self.live_mode, command=self.toggle_live).grid(column=3, row=5, pady=10)
+
+        # Errores de validación en la ventana, sin cuadros de diálogo
+        self.status = tk.StringVar()
+        ttk.Label(self.root, textvariable=self.status, foreground="red").grid(column=0, row=6, columnspan=4)
+
     def validate_inputs(self):
-        """Valida que los campos no estén vacíos ni sean valores no válidos."""
-        if self.price_per_unit.get() <= 0 or self.fixed_costs.get() < 0 or self.variable_cost_per_unit.get() < 0:
-            messagebox.showerror("Error", "Por favor, ingresa valores válidos y mayores que cero.")
+        """Valida los campos con las reglas compartidas (validacion.py) y muestra el error en la ventana."""
+        try:
+            valores = (self.price_per_unit.get(), self.fixed_costs.get(), self.variable_cost_per_unit.get())
+        except tk.TclError:
+            self.status.set("Por favor, ingresa valores numéricos.")
             return False
-        return True
+        self.status.set(mensaje(validar(*valores).codigos))
+        return not self.status.get()
 
+    @instrumentar()
     def calculate_breakeven(self):
         """Realiza el cálculo del Punto de Equilibrio"""
         if not self.validate_inputs():
             return
         
-        self.fixed_costs_value = self.fixed_costs.get()
-        self.price_value = self.price_per_unit.get()
-        self.variable_cost_value = self.variable_cost_per_unit.get()
-
-        # Margen de Contribución por Unidad
-        self.margin_per_unit = self.price_value - self.variable_cost_value
-
-        # Punto de Equilibrio en Unidades
-        self.breakeven_units = self.fixed_costs_value / self.margin_per_unit if self.margin_per_unit > 0 else float('inf')
-
-        # Punto de Equilibrio en Ventas
-        self.breakeven_revenue = self.breakeven_units * self.price_value
+        # Margen de Contribución, Punto de Equilibrio en Unidades y en Ventas
+        with fase("calculo"):
+            self.escenario = Escenario(self.price_per_unit.get(), self.fixed_costs.get(), self.variable_cost_per_unit.get())
 
         self.plot_table()
 
-    def plot_table(self):
-        """Genera una tabla con los datos ajustados en torno al punto de equilibrio"""
-        for widget in self.table_frame.winfo_children():
-            widget.destroy()  # Limpiar tabla previa si existe
-
-        tree = ttk.Treeview(self.table_frame, columns=('Concepto', 'Ventas', 'Costos Variables', 'Margen de Contribución', 'Costos Fijos', 'Utilidad o Pérdida'), show='headings')
-        tree.heading('Concepto', text='Concepto')
-        tree.heading('Ventas', text='Ventas (Q)')
-        tree.heading('Costos Variables', text='Costos Variables (Q)')
-        tree.heading('Margen de Contribución', text='Margen de Contribución (Q)')
-        tree.heading('Costos Fijos', text='Costos Fijos (Q)')
-        tree.heading('Utilidad o Pérdida', text='Utilidad o Pérdida (Q)')
-        
-        tree.column('Concepto', width=100)
-        tree.column('Ventas', width=120)
-        tree.column('Costos Variables', width=150)
-        tree.column('Margen de Contribución', width=150)
-        tree.column('Costos Fijos', width=100)
-        tree.column('Utilidad o Pérdida', width=150)
-
-        # Agregar filas ajustadas alrededor del punto de equilibrio
-        start_units = max(0, self.breakeven_units - 2)
-        end_units = self.breakeven_units + 2
-
-        for i, units in enumerate(np.arange(start_units, end_units + 1)):
-            concpeto = units - self.price_value
-            ventas = units * self.price_value
-            costos_variables = units * self.variable_cost_value
-            margen_contribucion = units * self.margin_per_unit
-            utilidad_perdida = margen_contribucion - self.fixed_costs_value
-
-            # Insertar fila en la tabla
-            tree.insert('', 'end', values=(self.entry_concepto.get(),f"{concpeto:.2f}," f"{ventas:.2f}", f"{costos_variables:.2f}", f"{margen_contribucion:.2f}", f"{self.fixed_costs_value:.2f}", f"{utilidad_perdida:.2f}"))
-
-        tree.pack()
-
+    def schedule_range(self):
+        """Rango de unidades de la tabla; vacío = dos unidades alrededor del punto de equilibrio"""
+        start = self.range_start.get().strip()
+        end = self.range_end.get().strip()
+        step = self.range_step.get().strip()
+
+        breakeven_units = self.escenario.unidades_equilibrio
+        start_units = float(start) if start else max(0, breakeven_units - 2)  # No permitir unidades negativas
+        end_units = float(end) if end else breakeven_units + 2
+        step_units = float(step) if step else 1.0
+        return start_units, end_units, step_units
+
+    @instrumentar()
+    def plot_table(self, en_vivo=False):
+        """Muestra la tabla del rango elegido; solo se calculan las filas visibles.
+
+        En vivo un rango no válido se informa en la ventana, sin cuadro de diálogo.
+        """
+        try:
+            start_units, end_units, step_units = self.schedule_range()
+            with fase("widgets"):
+                if self.table is None:
+                    self.table = TablaProgramacion(self.table_frame, TABLE_COLUMNS)
+                self.table.configurar(start_units, end_units, step_units, self.schedule_rows)
+        except ValueError as e:
+            if en_vivo:
+                self.status.set(f"Rango de la tabla no válido: {e}")
+            else:
+                messagebox.showerror("Error", f"Rango de la tabla no válido: {e}")
+
+    def schedule_rows(self, units):
+        """Filas de la tabla para un arreglo de unidades (solo la ventana visible)"""
+        escenario = self.escenario
+        ventas = units * escenario.precio
+        costos_variables = units * escenario.costo_variable
+        margen_contribucion = units * escenario.margen
+        utilidad_perdida = margen_contribucion - escenario.costo_fijo
+        concepto = self.entry_concepto.get()
+        costos_fijos = formatear_quetzales(escenario.costo_fijo)
+
+        # Montos redondeados al centavo entero: nunca aparece "-0.00"
+        return [(concepto, v, c, m, costos_fijos, u)
+                for v, c, m, u in zip(*map(formatear_quetzales, (ventas, costos_variables, margen_contribucion, utilidad_perdida)))]
+
+    @instrumentar()
     def plot_graph(self):
         """Genera una gráfica visual del punto de equilibrio"""
-        if not hasattr(self, 'breakeven_units'):
+        if self.escenario is None:
             messagebox.showinfo("Error", "Primero calcula el punto de equilibrio.")
             return
 
-        units = np.arange(self.breakeven_units - 5, self.breakeven_units + 6)
-        ventas = units * self.price_value
-        costos_variables = units * self.variable_cost_value
+        with fase("calculo"):
+            units, series = self.graph_series(self.escenario)
+
+        with fase("render"):
+            self.ventana_grafica.mostrar(units, series, self.escenario.unidades_equilibrio)
+
+    @staticmethod
+    def graph_series(escenario):
+        """Datos de la gráfica: Ventas, Costos Variables y Utilidad/Pérdida alrededor del punto de equilibrio"""
+        units = np.arange(escenario.unidades_equilibrio - 5, escenario.unidades_equilibrio + 6)
+        ventas = units * escenario.precio
+        costos_variables = units * escenario.costo_variable
         margen_contribucion = ventas - costos_variables
-        utilidad_perdida = margen_contribucion - self.fixed_costs_value
-
-        plt.figure(figsize=(10, 6))
-       
-        plt.plot(units, ventas, label='Ventas', color='green', marker='o')
-        plt.plot(units, costos_variables, label='Costos Variables', color='red', marker='o')
-        plt.plot(units, utilidad_perdida, label='Utilidad/Pérdida', color='blue', marker='o')
-        plt.axhline(0, color='black', linewidth=1)
-        plt.axvline(self.breakeven_units, color='gray', linestyle='--', label=f'Punto de Equilibrio: {self.breakeven_units:.2f} unidades')
-
-        plt.title("Gráfico del Punto de Equilibrio", fontsize=14)
-        plt.xlabel("Unidades", fontsize=12)
-        plt.ylabel("Quetzales", fontsize=12)
-        plt.legend()
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
+        utilidad_perdida = margen_contribucion - escenario.costo_fijo
+        return units, (ventas, costos_variables, utilidad_perdida)
+
+    def toggle_live(self):
+        self.live.activar(self.live_mode.get())
+
+    def prepare_live(self, valores):
+        """Hilo de trabajo: devuelve (mensaje de validación, datos o None) sin tocar widgets"""
+        price, fixed_costs, variable_cost = valores
+        codigos = validar(price, fixed_costs, variable_cost).codigos
+        if codigos:
+            return mensaje(codigos), None
+        escenario = Escenario(price, fixed_costs, variable_cost)
+        units, series = self.graph_series(escenario)
+        return "", (escenario, units, series)
+
+    def publish_live(self, resultado):
+        """Hilo de Tk: publica el último cálculo, o el error y resultados vacíos si no es válido"""
+        texto, datos = resultado
+        self.status.set(texto)
+        if datos is None:
+            self.clear_results()
+            return
 
+        self.escenario, units, series = datos
+        self.plot_table(en_vivo=True)
+        self.ventana_grafica.actualizar_si_visible(units, series, self.escenario.unidades_equilibrio)
+
+    def fail_live(self, error):
+        """Hilo de Tk: campo ilegible o error del cálculo en vivo"""
+        if isinstance(error, tk.TclError):
+            self.status.set("Por favor, ingresa valores numéricos.")
+        else:
+            self.status.set(f"Error al recalcular: {error}")
+            self.root.report_callback_exception(type(error), error, error.__traceback__)
+        self.clear_results()
+
+    def clear_results(self):
+        """Vacía la tabla y la gráfica para no mostrar un cálculo que ya no corresponde a los datos"""
+        self.escenario = None
+        if self.table is not None:
+            self.table.limpiar()
+        self.ventana_grafica.limpiar_si_visible()
+
+    @instrumentar()
     def clear_fields(self):
         """Borrar todos los campos de entrada y eliminar tabla"""
         self.price_per_unit.set(0)
         self.fixed_costs.set(0)
         self.variable_cost_per_unit.set(0)
         self.entry_concepto.set("")  # Limpiar el campo de concepto
+        self.range_start.set("")
+        self.range_end.set("")
+        self.range_step.set("")
 
-        for widget in self.table_frame.winfo_children():
-            widget.destroy()  # Eliminar la tabla
+        if self.table is not None:
+            self.table.limpiar()  # Vaciar la tabla sin destruirla
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,211 @@
+import math
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+import numpy as np
+
+# Cuadrícula de solo lectura dibujada en un único Canvas, para cuadros con
+# cientos o miles de columnas (p. ej. el cuadro costo-volumen-utilidad). La
+# columna de conceptos queda fija a la izquierda y solo existen los textos de
+# las columnas que caben en pantalla: al desplazarse se cambia su contenido,
+# así el costo de los widgets no crece con el número de celdas.
+#
+# Con `al_editar` algunas filas (y el encabezado, fila -1) se editan con doble
+# clic; `refrescar` vuelve a pintar solo las celdas que el llamador indique.
+
+
+class CuadriculaCanvas:
+    def __init__(self, master, etiquetas, ancho_columna=110, ancho_etiquetas=170, alto_fila=26,
+                 columnas_visibles=5, formato_encabezado="{:,.0f}".format, formato_valor="{:,.2f}".format,
+                 filas_editables=(), al_editar=None):
+        """etiquetas: nombres de las filas; los formatos convierten encabezados y valores en texto.
+
+        al_editar(fila, columna, texto) se llama al confirmar la edición de una celda
+        de `filas_editables` (-1 es el encabezado).
+        """
+        self.etiquetas = list(etiquetas)
+        self.ancho_columna = ancho_columna
+        self.ancho_etiquetas = ancho_etiquetas
+        self.alto_fila = alto_fila
+        self.formato_encabezado = formato_encabezado
+        self.formato_valor = formato_valor
+        self.filas_editables = set(filas_editables)
+        self.al_editar = al_editar
+        self.editor = None
+        self.negrita = tkfont.nametofont("TkDefaultFont").copy()
+        self.negrita.configure(weight="bold")
+
+        self.marco = tk.Frame(master)
+        self.alto = alto_fila * (len(self.etiquetas) + 1)
+        self.canvas = tk.Canvas(self.marco, width=ancho_etiquetas + ancho_columna * columnas_visibles,
+                                height=self.alto, background="white", highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self.marco, orient="horizontal", command=self._desplazar)
+        self.canvas.pack(side='top', fill='x', expand=True)
+        self.scrollbar.pack(side='bottom', fill='x')
+
+        # Columna fija de conceptos y líneas de la cabecera
+        self.canvas.create_text(8, alto_fila / 2, text="Concepto", anchor="w", font=self.negrita)
+        for i, etiqueta in enumerate(self.etiquetas):
+            self.canvas.create_text(8, alto_fila * (i + 1.5), text=etiqueta, anchor="w")
+        self.linea_cabecera = self.canvas.create_line(0, alto_fila, 0, alto_fila, fill="gray")
+        self.canvas.create_line(ancho_etiquetas, 0, ancho_etiquetas, self.alto, fill="gray")
+
+        # Ranuras reutilizables: por columna visible, [encabezado, fila 0, fila 1, ...]
+        self.ranuras = []
+        self.textos = []
+
+        self.encabezados = []
+        self.valores = np.empty((len(self.etiquetas), 0))
+        self.primera = 0
+        self._crear_ranuras(columnas_visibles)
+
+        self.canvas.bind("<Configure>", self._redimensionar)
+        self.canvas.bind("<Double-Button-1>", self._editar)
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(evento, self._rueda)
+
+    @property
+    def total(self):
+        return self.valores.shape[1]
+
+    @property
+    def completas(self):
+        """Columnas que caben enteras en el ancho actual."""
+        ancho = self.canvas.winfo_width()
+        if ancho <= 1:  # todavía no se ha mostrado: se usa el ancho pedido
+            ancho = int(self.canvas["width"])
+        ancho -= self.ancho_etiquetas
+        return max(1, ancho // self.ancho_columna)
+
+    def configurar(self, encabezados, valores):
+        """encabezados: uno por columna; valores: arreglo (filas x columnas).
+
+        Ambos se guardan por referencia: si el llamador los modifica en su lugar,
+        basta con `refrescar` las celdas que cambiaron.
+        """
+        valores = np.asarray(valores, dtype=np.float64)
+        if valores.ndim != 2 or valores.shape[0] != len(self.etiquetas) or valores.shape[1] != len(encabezados):
+            raise ValueError("Las dimensiones de los valores no coinciden con filas y encabezados")
+        self.encabezados = encabezados
+        self.valores = valores
+        self.mostrar(self.primera if self.primera < self.total else 0)
+
+    def limpiar(self):
+        self.encabezados = []
+        self.valores = np.empty((len(self.etiquetas), 0))
+        self.mostrar(0)
+
+    def mostrar(self, primera):
+        """Muestra las columnas a partir del índice `primera`."""
+        self._cerrar_editor()
+        completas = self.completas
+        self.primera = int(min(max(primera, 0), max(0, self.total - completas)))
+
+        for k in range(len(self.ranuras)):
+            j = self.primera + k
+            if j < self.total:
+                columna = self.valores[:, j]
+                textos = (self.formato_encabezado(self.encabezados[j]),
+                          *(self.formato_valor(v) for v in columna))
+                negativos = (False, *(columna < 0))
+            else:
+                textos = ("",) * (len(self.etiquetas) + 1)
+                negativos = (False,) * (len(self.etiquetas) + 1)
+            self._pintar(k, textos, negativos)
+
+        if self.total:
+            self.scrollbar.set(self.primera / self.total, min(self.primera + completas, self.total) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def refrescar(self, filas, columnas=None, encabezado=False):
+        """Repinta solo las filas indicadas en las columnas indicadas (None = todas) que estén visibles."""
+        visibles = range(self.primera, min(self.primera + len(self.ranuras), self.total))
+        if columnas is not None:
+            visibles = np.intersect1d(columnas, np.arange(visibles.start, visibles.stop))
+        for j in visibles:
+            k = j - self.primera
+            if encabezado:
+                self._pintar_celda(k, 0, self.formato_encabezado(self.encabezados[j]), False)
+            for i in filas:
+                valor = self.valores[i, j]
+                self._pintar_celda(k, i + 1, self.formato_valor(valor), valor < 0)
+
+    def _pintar(self, k, textos, negativos):
+        # Solo se tocan los textos que cambiaron
+        for i, texto in enumerate(textos):
+            self._pintar_celda(k, i, texto, negativos[i])
+
+    def _pintar_celda(self, k, i, texto, negativo):
+        if (texto, negativo) != self.textos[k][i]:
+            self.canvas.itemconfigure(self.ranuras[k][i], text=texto, fill="red" if negativo else "black")
+            self.textos[k][i] = (texto, negativo)
+
+    def _editar(self, evento):
+        fila = int(self.canvas.canvasy(evento.y) // self.alto_fila) - 1
+        x = self.canvas.canvasx(evento.x) - self.ancho_etiquetas
+        if self.al_editar is None or fila not in self.filas_editables or x < 0:
+            return
+        k = int(x // self.ancho_columna)
+        columna = self.primera + k
+        if columna >= self.total:
+            return
+
+        self._cerrar_editor()
+        self.editor = tk.Entry(self.canvas, justify="right")
+        self.editor.insert(0, self.textos[k][fila + 1][0])
+        self.editor.select_range(0, tk.END)
+        self.canvas.create_window(self.ancho_etiquetas + k * self.ancho_columna, (fila + 1) * self.alto_fila,
+                                  window=self.editor, anchor="nw", width=self.ancho_columna,
+                                  height=self.alto_fila, tags="editor")
+        self.editor.focus_set()
+        self.editor.bind("<Return>", lambda e: self._confirmar(fila, columna))
+        self.editor.bind("<Escape>", lambda e: self._cerrar_editor())
+        self.editor.bind("<FocusOut>", lambda e: self._cerrar_editor())
+
+    def _confirmar(self, fila, columna):
+        texto = self.editor.get()
+        self._cerrar_editor()
+        self.al_editar(fila, columna, texto)
+
+    def _cerrar_editor(self):
+        if self.editor is not None:
+            self.canvas.delete("editor")
+            self.editor.destroy()
+            self.editor = None
+
+    def _crear_ranuras(self, cantidad):
+        while len(self.ranuras) > cantidad:
+            for item in self.ranuras.pop():
+                self.canvas.delete(item)
+            self.textos.pop()
+        while len(self.ranuras) < cantidad:
+            x = self.ancho_etiquetas + (len(self.ranuras) + 1) * self.ancho_columna - 8
+            items = [self.canvas.create_text(x, self.alto_fila / 2, text="", anchor="e", font=self.negrita)]
+            items += [self.canvas.create_text(x, self.alto_fila * (i + 1.5), text="", anchor="e")
+                      for i in range(len(self.etiquetas))]
+            self.ranuras.append(items)
+            self.textos.append([("", False)] * len(items))
+
+    def _redimensionar(self, evento):
+        self.canvas.coords(self.linea_cabecera, 0, self.alto_fila, evento.width, self.alto_fila)
+        # Una ranura extra para la columna que queda cortada en el borde derecho
+        cantidad = max(1, math.ceil((evento.width - self.ancho_etiquetas) / self.ancho_columna))
+        if cantidad != len(self.ranuras):
+            self._crear_ranuras(cantidad)
+        self.mostrar(self.primera)
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self.mostrar(int(float(cantidad) * self.total))
+        elif accion == "scroll":
+            salto = self.completas if unidad == "pages" else 1
+            self.mostrar(self.primera + int(cantidad) * salto)
+
+    def _rueda(self, evento):
+        if evento.num == 4 or getattr(evento, "delta", 0) > 0:
+            self.mostrar(self.primera - 1)
+        else:
+            self.mostrar(self.primera + 1)
+        return "break"
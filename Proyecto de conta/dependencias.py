@@ -0,0 +1,105 @@
+from functools import reduce
+
+import numpy as np
+
+from nucleo import CONCEPTOS_CVP, cuadro_cvp
+
+# Evaluación incremental del cuadro costo-volumen-utilidad. Cada concepto es un
+# nodo que depende de entradas (volumen, precio, costo variable, costo fijo por
+# columna) o de otros conceptos:
+#
+#   volumen, precio ──────────> Ventas ───────────┐
+#   volumen, costo variable ──> Costos variables ─┴> Margen ─┐
+#   costo fijo ───────────────> Costos Fijos ────────────────┴> Utilidad o Pérdida
+#
+# Al cambiar una entrada solo se recalculan los nodos que dependen de ella y
+# solo en las columnas tocadas, así editar una celda de un cuadro ancho cuesta
+# O(celdas afectadas) y no O(todo el cuadro).
+
+ENTRADAS = ("volumenes", "precio", "costo_variable", "costo_fijo")
+
+# Fórmulas en orden topológico: concepto -> (dependencias, función)
+FORMULAS = {
+    "Ventas": (("volumenes", "precio"), np.multiply),
+    "Costos variables": (("volumenes", "costo_variable"), np.multiply),
+    "Margen de Contribución": (("Ventas", "Costos variables"), np.subtract),
+    "Costos Fijos": (("costo_fijo",), np.positive),
+    "Utilidad o Pérdida": (("Margen de Contribución", "Costos Fijos"), np.subtract),
+}
+
+TODAS = None  # selección de columnas que abarca el cuadro completo
+
+
+def _unir(a, b):
+    """Unión de dos selecciones de columnas (TODAS o arreglos de índices)."""
+    if a is TODAS or b is TODAS:
+        return TODAS
+    return np.union1d(a, b)
+
+
+class GrafoCVP:
+    def __init__(self, volumenes, precio, costo_variable, costo_fijo):
+        """Las entradas pueden ser escalares o arreglos con un valor por columna."""
+        volumenes = np.asarray(volumenes, dtype=np.float64).ravel()
+        n = len(volumenes)
+        self.entradas = {
+            "volumenes": volumenes.copy(),
+            "precio": np.full(n, precio, dtype=np.float64),
+            "costo_variable": np.full(n, costo_variable, dtype=np.float64),
+            "costo_fijo": np.full(n, costo_fijo, dtype=np.float64),
+        }
+        self.filas = {concepto: i for i, concepto in enumerate(CONCEPTOS_CVP)}
+        self.cuadro = cuadro_cvp(self.entradas["precio"], self.entradas["costo_variable"],
+                                 self.entradas["costo_fijo"], volumenes)
+
+    @property
+    def volumenes(self):
+        return self.entradas["volumenes"]
+
+    def _valores(self, nodo, columnas):
+        arreglo = self.entradas[nodo] if nodo in self.entradas else self.cuadro[self.filas[nodo]]
+        return arreglo if columnas is TODAS else arreglo[columnas]
+
+    def cambiar(self, nombre, valor, columnas=TODAS):
+        """Asigna una entrada (en todas las columnas o solo en `columnas`) y propaga el cambio.
+
+        Devuelve {concepto: columnas recalculadas} con solo los conceptos afectados.
+        """
+        if nombre not in ENTRADAS:
+            raise KeyError(f"Entrada desconocida: {nombre}")
+        if columnas is not TODAS:
+            columnas = np.unique(np.asarray(columnas, dtype=np.intp).ravel())
+        destino = self.entradas[nombre]
+        anterior = self._valores(nombre, columnas)
+        if np.array_equal(anterior, np.broadcast_to(valor, np.shape(anterior))):
+            return {}
+        if columnas is TODAS:
+            destino[:] = valor
+        else:
+            destino[columnas] = valor
+
+        # Marcar lo que está sucio siguiendo las aristas y recalcular en orden topológico
+        sucios = {nombre: columnas}
+        afectados = {}
+        for concepto, (dependencias, funcion) in FORMULAS.items():
+            selecciones = [sucios[d] for d in dependencias if d in sucios]
+            if not selecciones:
+                continue
+            seleccion = reduce(_unir, selecciones)
+            argumentos = [self._valores(d, seleccion) for d in dependencias]
+            fila = self.cuadro[self.filas[concepto]]
+            if seleccion is TODAS:
+                funcion(*argumentos, out=fila)
+            else:
+                fila[seleccion] = funcion(*argumentos)
+            sucios[concepto] = seleccion
+            afectados[concepto] = seleccion
+        return afectados
+
+    def cambiar_celda(self, concepto, columna, valor):
+        """Edita una celda de entrada del cuadro: 'Costos Fijos' o el volumen (concepto None)."""
+        if concepto is None:
+            return self.cambiar("volumenes", valor, [columna])
+        if concepto == "Costos Fijos":
+            return self.cambiar("costo_fijo", valor, [columna])
+        raise ValueError(f"'{concepto}' es un concepto calculado y no se puede editar")
@@ -0,0 +1,51 @@
+import numpy as np
+
+from nucleo import calcular_utilidad, muestrear_curva
+
+# Funciones de dibujo de las gráficas PNG de wef.py y edn.py. Corren en el hilo
+# de trabajo de cache_graficas con el backend Agg: solo usan la figura recibida,
+# nunca pyplot ni Tk, así también se pueden medir sin pantalla (benchmark.py).
+
+
+def dibujar_wef(figura, p, cv, cf, x):
+    """Ingresos, costos totales y utilidad hasta el doble del punto de equilibrio x."""
+    # Curvas lineales: bastan los extremos y el punto de equilibrio, sin importar su magnitud
+    unidades = muestrear_curva(0, x*2, especiales=[x], relleno=0)
+    ingresos = unidades * p
+    costos_totales = cf + (unidades * cv)
+    utilidad = ingresos - costos_totales
+
+    ax = figura.add_subplot()
+    ax.plot(unidades, ingresos, label='Ingresos')
+    ax.plot(unidades, costos_totales, label='Costos Totales')
+    ax.plot(unidades, utilidad, label='Utilidad')
+    ax.axvline(x=x, color='r', linestyle='--', label='Punto de Equilibrio')
+    ax.set_xlabel('Unidades Vendidas')
+    ax.set_ylabel('Quetzales')
+    ax.set_title('Análisis del Punto de Equilibrio')
+    ax.legend()
+    ax.grid(True)
+
+
+def dibujar_edn(figura, p, cv, cf, pe_unidades):
+    """Ingresos, costos totales y utilidad con la línea de costos fijos y el punto de equilibrio marcado."""
+    # Datos para la gráfica
+    unidades = np.linspace(0, pe_unidades * 1.5, 400)
+    ingresos = p * unidades
+    costos_totales = cf + cv * unidades
+    utilidad = calcular_utilidad(unidades, p, cv, cf)
+
+    # Crear gráfica
+    ax = figura.add_subplot()
+    ax.plot(unidades, ingresos, label='Ingresos', color='blue')
+    ax.plot(unidades, costos_totales, label='Costos Totales', color='red')
+    ax.plot(unidades, utilidad, label='Utilidad/Pérdida', color='purple')
+    ax.axvline(x=pe_unidades, color='green', linestyle='--', label='Punto de Equilibrio')
+    ax.axhline(y=cf, color='gray', linestyle='--', label='Costos Fijos')
+    ax.plot(pe_unidades, cf, 'go', label=f'PE: {pe_unidades:.2f} unidades')
+
+    ax.set_title('Análisis del Punto de Equilibrio')
+    ax.set_xlabel('Número de Unidades Vendidas')
+    ax.set_ylabel('Cantidad de Dinero (Q)')
+    ax.legend()
+    ax.grid(True)
@@ -1,18 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
 
 # Funciones para cálculos
-def margen_contribucion(p, cv):
-    return p - cv
-
-def punto_equilibrio(cf, mc):
-    return cf / mc if mc > 0 else float('inf')
-
-def calcular_utilidad(x, p, cv, cf):
-    return x * (p - cv) - cf
+from nucleo import margen_contribucion, punto_equilibrio, calcular_utilidad
+from cache_graficas import GraficasEnSegundoPlano
+from dibujos import dibujar_edn
+from metas import resolver_metas
 
 def calcular():
     try:
@@ -21,10 +15,15 @@ def calcular():
         p = float(entry_p.get())
         cv = float(entry_cv.get())
         x = int(entry_x.get())
+        # Utilidad deseada (opcional): se valida junto con los demás datos, antes de mostrar resultados
+        texto_meta = entry_meta.get().strip()
+        meta = float(texto_meta) if texto_meta else None
 
         # Validar que los valores sean positivos
         if cf < 0 or p <= 0 or cv < 0 or x < 0:
             raise ValueError("Los valores deben ser positivos y el precio mayor que los costos variables")
+        if meta is not None and not np.isfinite(meta):
+            raise ValueError("La utilidad deseada debe ser un número finito")
 
         # Calcular margen de contribución
         mc = margen_contribucion(p, cv)
@@ -39,6 +38,7 @@ def calcular():
         }
 
         # Crear un DataFrame de pandas para mostrar el cuadro financiero
+        import pandas as pd  # carga diferida: solo se usa aquí
         cuadro_financiero = pd.DataFrame(data)
         print("\nCuadro Financiero:")
         print(cuadro_financiero)
@@ -48,38 +48,44 @@ def calcular():
         label_pe_unidades.config(text=f"Punto de Equilibrio (unidades): {pe_unidades:.2f}")
         label_pe_quetzales.config(text=f"Punto de Equilibrio (quetzales): Q{pe_quetzales:.2f}")
         label_utilidad.config(text=f"Utilidad / Pérdida (para {x} unidades): Q{utilidad:.2f}")
+        mostrar_metas(meta, p, cf, cv, x)
 
         # Gráfica de costos e ingresos
-        generar_grafica(p, cv, cf, x, pe_unidades)
+        if np.isfinite(pe_unidades):
+            generar_grafica(p, cv, cf, x, pe_unidades)
 
     except ValueError as e:
         label_mc.config(text=f"Error: {e}")
     except ZeroDivisionError:
         label_mc.config(text="Error: El precio debe ser mayor que los costos variables")
 
-# Función para generar la gráfica
+# Preguntas inversas para la utilidad deseada (campo opcional)
+def mostrar_metas(meta, p, cf, cv, x):
+    if meta is None:
+        label_metas.config(text="")
+        return
+    r = resolver_metas(meta, p, cf, cv, x)
+    unidades, precio, costo = (float(v) for v in (r.unidades, r.precio_minimo, r.costo_variable_maximo))
+    label_metas.config(text="\n".join([
+        f"Unidades para Q{meta:.2f}: " + (f"{unidades:,.2f}" if np.isfinite(unidades) else "no alcanzable (margen <= 0)"),
+        f"Precio mínimo con {x} unidades: " + (f"Q{precio:.2f}" if np.isfinite(precio) else "no alcanzable"),
+        f"Costo variable máximo con {x} unidades: " + (f"Q{costo:.2f}" if np.isfinite(costo) else
+                                                       "cualquiera" if costo == np.inf else "no alcanzable"),
+    ]))
+
+# Función para generar la gráfica: se dibuja en segundo plano (o sale de la caché en disco)
 def generar_grafica(p, cv, cf, x, pe_unidades):
-    # Datos para la gráfica
-    unidades = np.linspace(0, pe_unidades * 1.5, 400)
-    ingresos = p * unidades
-    costos_totales = cf + cv * unidades
-    utilidad = calcular_utilidad(unidades, p, cv, cf)
-
-    # Crear gráfica
-    plt.figure(figsize=(10, 6))
-    plt.plot(unidades, ingresos, label='Ingresos', color='blue')
-    plt.plot(unidades, costos_totales, label='Costos Totales', color='red')
-    plt.plot(unidades, utilidad, label='Utilidad/Pérdida', color='purple')
-    plt.axvline(x=pe_unidades, color='green', linestyle='--', label='Punto de Equilibrio')
-    plt.axhline(y=cf, color='gray', linestyle='--', label='Costos Fijos')
-    plt.plot(pe_unidades, cf, 'go', label=f'PE: {pe_unidades:.2f} unidades')
-
-    plt.title('Análisis del Punto de Equilibrio')
-    plt.xlabel('Número de Unidades Vendidas')
-    plt.ylabel('Cantidad de Dinero (Q)')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    graficas.solicitar("edn", dibujar_edn, (p, cv, cf, pe_unidades), mostrar_grafica, error_grafica)
+
+def mostrar_grafica(ruta):
+    imagen = tk.PhotoImage(file=ruta)
+    label_grafica.config(image=imagen, text="")
+    label_grafica.image = imagen  # conservar la referencia
+
+def error_grafica(error):
+    # La imagen anterior ya no corresponde a los datos: se quita y se muestra el error en su lugar
+    label_grafica.config(image="", text=f"No se pudo generar la gráfica: {error}")
+    label_grafica.image = None
 
 # Crear la interfaz de usuario
 root = tk.Tk()
@@ -104,21 +110,33 @@ tk.Label(frame, text="Número de Unidades Vendidas (X)", font=("Arial", 12)).gri
 entry_x = tk.Entry(frame, font=("Arial", 12))
 entry_x.grid(row=3, column=1, padx=5, pady=5)
 
+tk.Label(frame, text="Utilidad Deseada (Q, opcional)", font=("Arial", 12)).grid(row=4, column=0, padx=5, pady=5)
+entry_meta = tk.Entry(frame, font=("Arial", 12))
+entry_meta.grid(row=4, column=1, padx=5, pady=5)
+
 # Botón para calcular
 button_calcular = tk.Button(frame, text="Calcular", font=("Arial", 12, "bold"), command=calcular)
-button_calcular.grid(row=4, column=0, columnspan=2, pady=10)
+button_calcular.grid(row=5, column=0, columnspan=2, pady=10)
 
 # Resultados
 label_mc = tk.Label(frame, text="Margen de Contribución por unidad: ", font=("Arial", 12))
-label_mc.grid(row=5, column=0, columnspan=2, pady=5)
+label_mc.grid(row=6, column=0, columnspan=2, pady=5)
 
 label_pe_unidades = tk.Label(frame, text="Punto de Equilibrio (unidades): ", font=("Arial", 12))
-label_pe_unidades.grid(row=6, column=0, columnspan=2, pady=5)
+label_pe_unidades.grid(row=7, column=0, columnspan=2, pady=5)
 
 label_pe_quetzales = tk.Label(frame, text="Punto de Equilibrio (quetzales): ", font=("Arial", 12))
-label_pe_quetzales.grid(row=7, column=0, columnspan=2, pady=5)
+label_pe_quetzales.grid(row=8, column=0, columnspan=2, pady=5)
 
 label_utilidad = tk.Label(frame, text="Utilidad / Pérdida: ", font=("Arial", 12))
-label_utilidad.grid(row=8, column=0, columnspan=2, pady=5)
+label_utilidad.grid(row=9, column=0, columnspan=2, pady=5)
+
+label_metas = tk.Label(frame, text="", font=("Arial", 12), justify="left")
+label_metas.grid(row=10, column=0, columnspan=2, pady=5)
+
+# Gráfica (imagen PNG generada en segundo plano)
+label_grafica = tk.Label(frame)
+label_grafica.grid(row=11, column=0, columnspan=2, pady=5)
+graficas = GraficasEnSegundoPlano(root)
 
 root.mainloop()
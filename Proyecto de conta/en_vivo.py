@@ -0,0 +1,104 @@
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# Recálculo en vivo mientras el usuario escribe. Las trazas de las variables
+# Tk reinician una espera (debounce); al vencer, los valores se leen en el hilo
+# principal y el cálculo pesado (resultados y datos de la gráfica) se prepara en
+# un hilo de trabajo. El resultado vuelve al hilo de Tk por una cola que se
+# revisa con root.after, y cualquier resultado de una generación anterior se
+# descarta, así nunca se pinta un cálculo viejo encima de uno nuevo. Los campos
+# ilegibles y los errores del hilo de trabajo se entregan a al_fallar.
+
+ESPERA_MS = 150
+SONDEO_MS = 16  # ~60 cuadros por segundo
+
+
+class RecalculoEnVivo:
+    def __init__(self, root, variables, preparar, publicar, espera_ms=ESPERA_MS, al_fallar=None):
+        """preparar(valores) corre en el hilo de trabajo; publicar(resultado) y al_fallar(error) en el de Tk.
+
+        al_fallar recibe el tk.TclError de un campo a medio escribir o la excepción
+        de preparar; por omisión solo la segunda se informa, con root.report_callback_exception.
+        """
+        self.root = root
+        self.variables = variables
+        self.preparar = preparar
+        self.publicar = publicar
+        self.al_fallar = al_fallar or self._informar
+        self.espera_ms = espera_ms
+
+        self.activo = False
+        self.generacion = 0
+        self.en_vuelo = 0
+        self.pendiente = None
+        self.sondeando = False
+        self.cola = queue.Queue()
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recalculo")
+
+        for variable in variables:
+            variable.trace_add("write", self._al_cambiar)
+
+    def activar(self, activo):
+        self.activo = activo
+        if activo:
+            self._al_cambiar()
+        elif self.pendiente is not None:
+            self.root.after_cancel(self.pendiente)
+            self.pendiente = None
+
+    def _al_cambiar(self, *args):
+        if not self.activo:
+            return
+        # Cada tecla reinicia la espera: una ráfaga produce un solo cálculo
+        if self.pendiente is not None:
+            self.root.after_cancel(self.pendiente)
+        self.pendiente = self.root.after(self.espera_ms, self._lanzar)
+
+    def _lanzar(self):
+        self.pendiente = None
+        self.generacion += 1
+        try:
+            valores = [variable.get() for variable in self.variables]
+        except tk.TclError as error:
+            # Campo vacío o a medio escribir ("1.", "-"); el cálculo en curso ya no vale
+            self.al_fallar(error)
+            return
+
+        generacion = self.generacion
+        self.en_vuelo += 1
+        futuro = self.ejecutor.submit(self.preparar, valores)
+        futuro.add_done_callback(lambda f: self.cola.put((generacion, f)))
+        if not self.sondeando:
+            self.sondeando = True
+            self.root.after(SONDEO_MS, self._sondear)
+
+    def _sondear(self):
+        while True:
+            try:
+                generacion, futuro = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            self.en_vuelo -= 1
+            # Los resultados obsoletos se descartan sin tocar la interfaz
+            if generacion != self.generacion or futuro.cancelled():
+                continue
+            if futuro.exception() is not None:
+                self.al_fallar(futuro.exception())
+                continue
+            resultado = futuro.result()
+            if resultado is not None:
+                self.publicar(resultado)
+
+        if self.en_vuelo > 0:
+            self.root.after(SONDEO_MS, self._sondear)
+        else:
+            self.sondeando = False
+
+    def _informar(self, error):
+        if not isinstance(error, tk.TclError):
+            self.root.report_callback_exception(type(error), error, error.__traceback__)
+
+    def cerrar(self):
+        self.activar(False)
+        self.ejecutor.shutdown(wait=False, cancel_futures=True)
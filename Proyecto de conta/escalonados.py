@@ -0,0 +1,93 @@
+import numpy as np
+from collections import namedtuple
+
+# Costos fijos escalonados: la planta agrega un turno o una máquina al pasar
+# ciertos umbrales de capacidad, así el costo fijo sube por tramos y puede
+# haber varios puntos de equilibrio (la utilidad baja de golpe al entrar a un
+# tramo nuevo y vuelve a subir con las ventas).
+#
+# El tramo k cubre los volúmenes (capacidad[k-1], capacidad[k]] con un costo
+# fijo total costo_fijo[k]. Las capacidades quedan ordenadas en un índice y
+# cada consulta es una búsqueda binaria (np.searchsorted): O(log tramos) por
+# volumen, sin recorrer los tramos. Los puntos de equilibrio no dependen del
+# volumen consultado y se calculan una sola vez al crear el modelo.
+
+PuntosEquilibrio = namedtuple("PuntosEquilibrio", ["unidades", "direccion"])
+
+ENTRA_A_UTILIDAD = 1   # la utilidad pasa de negativa a >= 0
+SALE_DE_UTILIDAD = -1  # la utilidad cae bajo cero al entrar al tramo siguiente
+
+
+class CostosEscalonados:
+    def __init__(self, capacidades, costos_fijos, precio, costo_variable):
+        """capacidades: límite superior de cada tramo (el último puede ser inf);
+        costos_fijos: costo fijo total de cada tramo. Se ordenan por capacidad.
+        """
+        capacidades = np.asarray(capacidades, dtype=np.float64).ravel()
+        costos_fijos = np.asarray(costos_fijos, dtype=np.float64).ravel()
+        if capacidades.size == 0 or capacidades.shape != costos_fijos.shape:
+            raise ValueError("Debe haber un costo fijo por cada capacidad")
+        if not np.all(np.isfinite(costos_fijos)) or np.isnan(capacidades).any() or (capacidades <= 0).any():
+            raise ValueError("Las capacidades deben ser positivas y los costos fijos finitos")
+
+        orden = np.argsort(capacidades, kind="stable")
+        self.capacidades = capacidades[orden]
+        if np.any(np.diff(self.capacidades) == 0):
+            raise ValueError("Hay capacidades repetidas")
+        self.costos_fijos = costos_fijos[orden]
+        self._costos_con_exceso = np.append(self.costos_fijos, np.nan)  # el tramo len() es "sin capacidad"
+        self.inicios = np.concatenate([[0.0], self.capacidades[:-1]])
+        self.precio = float(precio)
+        self.costo_variable = float(costo_variable)
+        self.margen = self.precio - self.costo_variable
+        self.puntos = self._calcular_puntos()
+
+    def tramo(self, unidades):
+        """Índice del tramo de cada volumen; len(capacidades) si excede la capacidad máxima."""
+        return np.searchsorted(self.capacidades, unidades, side="left")
+
+    def costo_fijo(self, unidades):
+        """Costo fijo a cada volumen (NaN más allá de la capacidad máxima)."""
+        return self._costos_con_exceso[self.tramo(unidades)]
+
+    def utilidad(self, unidades):
+        """Utilidad a cada volumen: unidades * margen - costo fijo de su tramo."""
+        unidades = np.asarray(unidades, dtype=np.float64)
+        return unidades * self.margen - self.costo_fijo(unidades)
+
+    def _calcular_puntos(self):
+        # Con margen positivo la utilidad crece dentro de cada tramo y se anula en cf / margen
+        if self.margen > 0:
+            cero = self.costos_fijos / self.margen
+            dentro = (cero > self.inicios) & (cero <= self.capacidades)
+            # Un tramo que arranca con utilidad >= 0 no cruza dentro (el 0 del primer tramo no cuenta)
+            entradas = np.where(dentro, cero, np.nan)
+        else:
+            entradas = np.full(self.capacidades.shape, np.nan)
+
+        # En los umbrales la utilidad salta: cae bajo cero si el tramo siguiente cuesta más
+        # (o sube a >= 0 si cuesta menos, p. ej. al terminar un arrendamiento)
+        tope = self.capacidades[:-1] * self.margen - self.costos_fijos[:-1]
+        siguiente = self.capacidades[:-1] * self.margen - self.costos_fijos[1:]
+        salidas = np.where((tope >= 0) & (siguiente < 0), self.capacidades[:-1], np.nan)
+        entradas_en_umbral = np.where((tope < 0) & (siguiente >= 0), self.capacidades[:-1], np.nan)
+
+        unidades = np.concatenate([entradas, entradas_en_umbral, salidas])
+        direccion = np.concatenate([np.full(entradas.shape, ENTRA_A_UTILIDAD),
+                                    np.full(entradas_en_umbral.shape, ENTRA_A_UTILIDAD),
+                                    np.full(salidas.shape, SALE_DE_UTILIDAD)])
+        validos = ~np.isnan(unidades)
+        unidades, direccion = unidades[validos], direccion[validos]
+        orden = np.lexsort((-direccion, unidades))
+        return PuntosEquilibrio(unidades[orden], direccion[orden])
+
+    def puntos_equilibrio(self, desde=0.0, hasta=np.inf):
+        """Todos los puntos de equilibrio en [desde, hasta], ordenados (búsqueda binaria en el índice)."""
+        inicio = np.searchsorted(self.puntos.unidades, desde, side="left")
+        fin = np.searchsorted(self.puntos.unidades, hasta, side="right")
+        return PuntosEquilibrio(self.puntos.unidades[inicio:fin], self.puntos.direccion[inicio:fin])
+
+    def rentable(self, unidades):
+        """True donde la utilidad a ese volumen es >= 0."""
+        with np.errstate(invalid="ignore"):
+            return self.utilidad(unidades) >= 0
@@ -0,0 +1,175 @@
+import numpy as np
+
+from nucleo import calcular_punto_equilibrio, calcular_utilidad
+
+# Representación compacta de escenarios. Un escenario suelto (el que muestra
+# la GUI) es un objeto con __slots__, sin __dict__ por instancia; una colección
+# de escenarios guardados es un arreglo estructurado de NumPy: 48 bytes por
+# escenario, así 10 millones ocupan unos 480 MB y se ordenan o filtran con
+# operaciones vectorizadas sobre una columna.
+#
+# Solo se guardan los datos y lo que se consulta a menudo (margen y punto de
+# equilibrio); ventas en el equilibrio y utilidad se derivan al pedirlas.
+
+DTYPE = np.dtype([
+    ("precio", np.float64),
+    ("costo_fijo", np.float64),
+    ("costo_variable", np.float64),
+    ("unidades", np.float64),
+    ("margen", np.float64),
+    ("unidades_equilibrio", np.float64),
+])
+CAMPOS = DTYPE.names
+CAPACIDAD_INICIAL = 1024
+
+
+class Escenario:
+    __slots__ = CAMPOS
+
+    def __init__(self, precio, costo_fijo, costo_variable, unidades=0.0):
+        """Calcula margen y punto de equilibrio al crearse (inf si no hay equilibrio)."""
+        resultado = calcular_punto_equilibrio(precio, costo_fijo, costo_variable)
+        self.precio = float(precio)
+        self.costo_fijo = float(costo_fijo)
+        self.costo_variable = float(costo_variable)
+        self.unidades = float(unidades)
+        self.margen = float(resultado.margen)
+        self.unidades_equilibrio = float(resultado.unidades)
+
+    @classmethod
+    def desde_registro(cls, registro):
+        """Escenario a partir de una fila del arreglo estructurado (sin recalcular)."""
+        escenario = cls.__new__(cls)
+        for campo in CAMPOS:
+            setattr(escenario, campo, float(registro[campo]))
+        return escenario
+
+    def como_tupla(self):
+        return tuple(getattr(self, campo) for campo in CAMPOS)
+
+    @property
+    def ventas_equilibrio(self):
+        if not np.isfinite(self.unidades_equilibrio):
+            return self.unidades_equilibrio
+        return self.unidades_equilibrio * self.precio
+
+    @property
+    def utilidad(self):
+        return float(calcular_utilidad(self.unidades, self.precio, self.costo_variable, self.costo_fijo))
+
+    def __repr__(self):
+        return "Escenario(" + ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in CAMPOS) + ")"
+
+
+class AlmacenEscenarios:
+    """Colección de escenarios en un arreglo estructurado que crece por duplicación."""
+
+    def __init__(self, capacidad=CAPACIDAD_INICIAL):
+        self._datos = np.empty(max(1, capacidad), dtype=DTYPE)
+        self._n = 0
+
+    @classmethod
+    def desde_registros(cls, registros):
+        """Envuelve un arreglo estructurado con DTYPE (sin copiarlo)."""
+        if registros.dtype != DTYPE:
+            raise ValueError("Los registros no tienen el formato de escenarios.DTYPE")
+        almacen = cls.__new__(cls)
+        almacen._datos = registros
+        almacen._n = len(registros)
+        return almacen
+
+    @classmethod
+    def desde_arreglos(cls, precio, costo_fijo, costo_variable, unidades=0.0):
+        almacen = cls(0)
+        almacen.extender(precio, costo_fijo, costo_variable, unidades)
+        return almacen
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if not -self._n <= i < self._n:
+            raise IndexError("Índice de escenario fuera de rango")
+        return Escenario.desde_registro(self._datos[i % self._n])
+
+    def __iter__(self):
+        for registro in self.registros:
+            yield Escenario.desde_registro(registro)
+
+    @property
+    def registros(self):
+        """Vista de las filas ocupadas (modificarla modifica el almacén)."""
+        return self._datos[:self._n]
+
+    def columna(self, campo):
+        """Columna calculada o almacenada como arreglo (vista, salvo las derivadas)."""
+        registros = self.registros
+        if campo == "ventas_equilibrio":
+            return calcular_punto_equilibrio(registros["precio"], registros["costo_fijo"],
+                                             registros["costo_variable"]).ventas
+        if campo == "utilidad":
+            return calcular_utilidad(registros["unidades"], registros["precio"],
+                                     registros["costo_variable"], registros["costo_fijo"])
+        return registros[campo]
+
+    def _reservar(self, cantidad):
+        necesaria = self._n + cantidad
+        if necesaria <= len(self._datos) and self._datos.flags.writeable:
+            return
+        capacidad = max(necesaria, 2 * len(self._datos), CAPACIDAD_INICIAL)
+        datos = np.empty(capacidad, dtype=DTYPE)
+        datos[:self._n] = self.registros
+        self._datos = datos
+
+    def agregar(self, escenario):
+        self._reservar(1)
+        self._datos[self._n] = escenario.como_tupla()
+        self._n += 1
+
+    def extender(self, precio, costo_fijo, costo_variable, unidades=0.0):
+        """Agrega muchos escenarios de una vez; los derivados se calculan vectorizados."""
+        resultado = calcular_punto_equilibrio(precio, costo_fijo, costo_variable)
+        columnas = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in
+                                         (precio, costo_fijo, costo_variable, unidades,
+                                          resultado.margen, resultado.unidades)))
+        cantidad = columnas[0].size
+        self._reservar(cantidad)
+        nuevos = self._datos[self._n:self._n + cantidad]
+        for campo, valores in zip(CAMPOS, columnas):
+            nuevos[campo] = valores.ravel()
+        self._n += cantidad
+
+    def ordenar(self, campo, descendente=False, estable=False):
+        """Ordena en su lugar por un campo (NaN al final); `estable` conserva el orden de los empates."""
+        clave = self.columna(campo)
+        orden = np.argsort(-clave if descendente else clave, kind="stable" if estable else None)
+        # Todos los campos son float64: reordenar filas de una matriz (n x campos) copia
+        # cada registro de un golpe y es varias veces más rápido que indexar el arreglo estructurado
+        filas = self.registros.view(np.float64).reshape(self._n, len(CAMPOS))
+        self._datos = np.take(filas, orden, axis=0).view(DTYPE).ravel()
+
+    def mascara(self, **rangos):
+        """Máscara de las filas con campo dentro de (mínimo, máximo), ambos inclusive; None = sin límite.
+
+        Ej.: almacen.mascara(margen=(10, None), unidades_equilibrio=(None, 5000))
+        """
+        seleccion = np.ones(self._n, dtype=bool)
+        for campo, (minimo, maximo) in rangos.items():
+            valores = self.columna(campo)
+            if minimo is not None:
+                seleccion &= valores >= minimo
+            if maximo is not None:
+                seleccion &= valores <= maximo
+        return seleccion
+
+    def filtrar(self, **rangos):
+        """Nuevo almacén con las filas que cumplen todos los rangos (ver `mascara`)."""
+        return AlmacenEscenarios.desde_registros(self.registros[self.mascara(**rangos)])
+
+    def guardar(self, ruta):
+        np.save(ruta, self.registros)
+
+    @classmethod
+    def cargar(cls, ruta, mapear=False):
+        """Lee un archivo .npy; con `mapear` se abre con mmap de solo lectura (se copia al agregar)."""
+        return cls.desde_registros(np.load(ruta, mmap_mode="r" if mapear else None))
@@ -51,8 +51,10 @@ def create_button(self, text, command, row, col):
 
 def validate_inputs(self):
     """Valida que los campos no estén vacíos ni sean valores no válidos."""
-    if self.price_per_unit.get() <= 0 or self.fixed_costs.get() <= 0 or self.variable_cost_per_unit.get() < 0:
-        messagebox.showerror("Error", "Por favor ingresa valores válidos y mayores que cero.")
+    # Mismas reglas que las demás ventanas y el modo por lotes (validacion.py)
+    error = mensaje(validar(self.price_per_unit.get(), self.fixed_costs.get(), self.variable_cost_per_unit.get()).codigos)
+    if error:
+        messagebox.showerror("Error", error)
         return False
     return True
 
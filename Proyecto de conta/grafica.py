@@ -0,0 +1,191 @@
+import tkinter as tk
+
+import numpy as np
+
+# Gráfica persistente del punto de equilibrio. La figura y sus líneas se crean
+# una sola vez; cada clic solo cambia los datos de las Line2D. Si los límites de
+# los ejes no cambian se redibuja con blit (solo las líneas sobre el fondo
+# guardado); si cambian se redibuja la figura completa una vez.
+# matplotlib se importa al crear la primera gráfica, no al abrir la aplicación.
+
+
+def _texto_unidades(punto_equilibrio):
+    return f"Punto de Equilibrio: {punto_equilibrio:.2f} unidades"
+
+
+class GraficaEquilibrio:
+    def __init__(self, master, series, titulo="Gráfica del Punto de Equilibrio", figsize=(8, 5),
+                 etiqueta_x="Unidades", texto_pe=_texto_unidades):
+        """texto_pe(punto_equilibrio) da la leyenda de la línea vertical (p. ej. una fecha)."""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.texto_pe_formato = texto_pe
+        self.figura = Figure(figsize=figsize)
+        self.ax = self.figura.add_subplot()
+        self.ax.set_title(titulo)
+        self.ax.set_xlabel(etiqueta_x)
+        self.ax.set_ylabel("Quetzales")
+        self.ax.grid(True)
+        self.ax.axhline(0, color="black", linewidth=1)
+
+        # Las líneas son "animated" para que no queden en el fondo guardado
+        self.lineas = []
+        for nombre, estilo in series:
+            linea, = self.ax.plot([], [], label=nombre, animated=True, **estilo)
+            self.lineas.append(linea)
+        self.linea_pe = self.ax.axvline(0, color="black", linestyle="--", label="Punto de Equilibrio", animated=True)
+        self.texto_pe = self.ax.text(0.02, 0.95, "", transform=self.ax.transAxes, va="top", animated=True)
+        self.ax.legend(loc="lower right")
+
+        self.canvas = FigureCanvasTkAgg(self.figura, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.fondo = None
+        self.canvas.mpl_connect("draw_event", self._al_dibujar)
+
+    def _artistas(self):
+        return self.lineas + [self.linea_pe, self.texto_pe]
+
+    def _al_dibujar(self, evento):
+        # Tras un redibujo completo se guarda el fondo y se pintan las líneas encima
+        self.fondo = self.canvas.copy_from_bbox(self.figura.bbox)
+        self._pintar_artistas()
+
+    def _pintar_artistas(self):
+        for artista in self._artistas():
+            self.ax.draw_artist(artista)
+
+    @staticmethod
+    def _limites(actual, minimo, maximo):
+        """Conserva los límites actuales si los datos caben y ocupan al menos la mitad del rango."""
+        if maximo <= minimo:
+            maximo = minimo + 1.0
+        margen = 0.05 * (maximo - minimo)
+        if actual is not None:
+            bajo, alto = actual
+            if bajo <= minimo and maximo <= alto and (maximo - minimo) >= 0.5 * (alto - bajo):
+                return actual
+        return (minimo - margen, maximo + margen)
+
+    def presupuesto_puntos(self):
+        """Ancho del lienzo en píxeles: no tiene sentido graficar más puntos que estos."""
+        return max(2, int(self.figura.bbox.width))
+
+    def actualizar(self, unidades, valores, punto_equilibrio, texto=None):
+        """Cambia los datos de cada serie (en el orden de creación) y redibuja.
+
+        `texto` reemplaza la leyenda del punto de equilibrio (p. ej. con varios cruces).
+        """
+        unidades = np.asarray(unidades, dtype=np.float64)
+        for linea, y in zip(self.lineas, valores):
+            linea.set_data(unidades, y)
+        self.linea_pe.set_xdata([punto_equilibrio, punto_equilibrio])
+        self.linea_pe.set_visible(True)
+        self.texto_pe.set_text(self.texto_pe_formato(punto_equilibrio) if texto is None else texto)
+
+        y_min = min(float(np.min(y)) for y in valores)
+        y_max = max(float(np.max(y)) for y in valores)
+        x_actual = self.ax.get_xlim() if self.fondo is not None else None
+        y_actual = self.ax.get_ylim() if self.fondo is not None else None
+        x_nuevo = self._limites(x_actual, float(unidades[0]), float(unidades[-1]))
+        y_nuevo = self._limites(y_actual, min(y_min, 0.0), max(y_max, 0.0))
+
+        if x_nuevo != x_actual or y_nuevo != y_actual:
+            self.ax.set_xlim(*x_nuevo)
+            self.ax.set_ylim(*y_nuevo)
+            self.canvas.draw()  # el evento draw_event guarda el fondo y pinta las líneas
+            self.canvas.blit(self.figura.bbox)
+            return
+
+        self.canvas.restore_region(self.fondo)
+        self._pintar_artistas()
+        self.canvas.blit(self.figura.bbox)
+
+    def limpiar(self):
+        """Vacía las series y la línea de equilibrio sin tocar los ejes (datos no válidos)."""
+        for linea in self.lineas:
+            linea.set_data([], [])
+        self.linea_pe.set_visible(False)
+        self.texto_pe.set_text("")
+        if self.fondo is not None:
+            self.canvas.restore_region(self.fondo)
+            self._pintar_artistas()
+            self.canvas.blit(self.figura.bbox)
+
+
+class MapaSensibilidad:
+    """Mapa de calor persistente (una sola imagen) para la malla precio x costo variable."""
+
+    def __init__(self, master, figsize=(8, 5)):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+
+        self.figura = Figure(figsize=figsize)
+        self.ax = self.figura.add_subplot()
+        self.ax.set_xlabel("Precio por Unidad (Q)")
+        self.ax.set_ylabel("Costo Variable por Unidad (Q)")
+        self.imagen = self.ax.imshow(np.zeros((2, 2)), origin="lower", aspect="auto", interpolation="nearest")
+        self.barra = self.figura.colorbar(self.imagen, ax=self.ax)
+
+        self.canvas = FigureCanvasTkAgg(self.figura, master=master)
+        self.widget = self.canvas.get_tk_widget()
+
+    def actualizar(self, valores, precios, costos_variables, titulo, divergente=False):
+        """Cambia los datos de la imagen; las celdas sin equilibrio (inf/nan) quedan en blanco."""
+        datos = np.ma.masked_invalid(valores)
+        validos = datos.compressed()
+        if divergente:
+            # Utilidad: escala simétrica alrededor de cero
+            limite = float(np.max(np.abs(validos))) if validos.size else 1.0
+            bajo, alto, mapa = -limite, limite, "RdYlGn"
+        else:
+            # Unidades: se recorta el 2 % superior para que el borde de margen cero no aplane la escala
+            bajo = float(validos.min()) if validos.size else 0.0
+            alto = float(np.percentile(validos, 98)) if validos.size else 1.0
+            mapa = "viridis"
+        if alto <= bajo:
+            alto = bajo + 1.0
+
+        self.imagen.set_data(datos)
+        self.imagen.set_extent((precios[0], precios[-1], costos_variables[0], costos_variables[-1]))
+        self.imagen.set_cmap(mapa)
+        self.imagen.set_clim(bajo, alto)
+        self.ax.set_title(titulo)
+        self.canvas.draw_idle()
+
+
+class VentanaGrafica:
+    """Ventana secundaria reutilizable que contiene una GraficaEquilibrio."""
+
+    def __init__(self, root, series, titulo="Gráfica del Punto de Equilibrio", **opciones):
+        """`opciones` se pasan a GraficaEquilibrio (etiqueta_x, texto_pe)."""
+        self.root = root
+        self.series = series
+        self.titulo = titulo
+        self.opciones = opciones
+        self.ventana = None
+        self.grafica = None
+
+    def mostrar(self, unidades, valores, punto_equilibrio):
+        if self.ventana is None:
+            self.ventana = tk.Toplevel(self.root)
+            self.ventana.title(self.titulo)
+            # Cerrar solo oculta la ventana para conservar la figura
+            self.ventana.protocol("WM_DELETE_WINDOW", self.ventana.withdraw)
+            self.grafica = GraficaEquilibrio(self.ventana, self.series, self.titulo, **self.opciones)
+            self.grafica.widget.pack(fill="both", expand=True)
+            self.ventana.update_idletasks()
+        else:
+            self.ventana.deiconify()
+            self.ventana.lift()
+        self.grafica.actualizar(unidades, valores, punto_equilibrio)
+
+    def actualizar_si_visible(self, unidades, valores, punto_equilibrio):
+        """Actualiza la gráfica solo si la ventana ya está abierta (no la abre)."""
+        if self.ventana is not None and self.ventana.winfo_viewable():
+            self.grafica.actualizar(unidades, valores, punto_equilibrio)
+
+    def limpiar_si_visible(self):
+        """Vacía la gráfica abierta para no dejar a la vista un cálculo que ya no vale."""
+        if self.ventana is not None and self.ventana.winfo_viewable():
+            self.grafica.limpiar()
@@ -1,7 +1,14 @@
 import tkinter as tk
 from tkinter import messagebox
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+from nucleo import CONCEPTOS_CVP, rango_volumenes, calcular_punto_equilibrio
+from cuadricula import CuadriculaCanvas
+from dependencias import GrafoCVP
+from numeros import convertir, convertir_texto
+from instrumentacion import instrumentar, fase
+
+# Tope de columnas del cuadro (5 filas x 1,000,000 columnas = 40 MB)
+MAXIMO_VOLUMENES = 1_000_000
 
 class CuadroPuntoEquilibrioApp:
     def __init__(self, root):
@@ -13,8 +20,9 @@ class CuadroPuntoEquilibrioApp:
         self.precio_entry = tk.Entry(root)
         self.costo_fijo_entry = tk.Entry(root)
         self.costo_variable_entry = tk.Entry(root)
-
-        self.entradas = {}
+        self.desde_entry = tk.Entry(root, width=10)
+        self.hasta_entry = tk.Entry(root, width=10)
+        self.paso_entry = tk.Entry(root, width=10)
 
         # Crear el layout del formulario
         self.create_form()
@@ -30,86 +38,132 @@ class CuadroPuntoEquilibrioApp:
         self.graficar_btn.grid(row=9, column=6, padx=10, pady=10)
 
     def create_form(self):
-        conceptos = ["Ventas", "Costos variables", "Margen de Contribución", "Costos Fijos", "Utilidad o Pérdida"]
-        unidades = ["2,000", "4,000", "6,000", "8,000", "10,000"]
-
-        # Crear cabeceras
-        tk.Label(self.root, text="Concepto").grid(row=0, column=0, padx=10, pady=10)
-        for i, unidad in enumerate(unidades):
-            tk.Label(self.root, text=unidad).grid(row=0, column=i+1)
-
-        # Crear campos para ingresar datos
-        for i, concepto in enumerate(conceptos):
-            tk.Label(self.root, text=concepto).grid(row=i+1, column=0, padx=10, pady=5)
-            self.entradas[concepto] = []
-            for j in range(5):
-                entry = tk.Entry(self.root)
-                entry.grid(row=i+1, column=j+1, padx=5)
-                self.entradas[concepto].append(entry)
-
-        # Llenar Costos Fijos con valor predefinido
-        for entry in self.entradas["Costos Fijos"]:
-            entry.insert(0, "200000")
-            entry.config(state="disabled")  # Deshabilitar las entradas de Costos Fijos
+        # Datos del producto
+        tk.Label(self.root, text="Precio por unidad").grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        self.precio_entry.grid(row=0, column=1, padx=5)
+        tk.Label(self.root, text="Costo variable por unidad").grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.costo_variable_entry.grid(row=1, column=1, padx=5)
+        tk.Label(self.root, text="Costos Fijos").grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        self.costo_fijo_entry.grid(row=2, column=1, padx=5)
+        self.costo_fijo_entry.insert(0, "200000")
+        # Enter en un dato actualiza solo las celdas que dependen de él
+        for entry in (self.precio_entry, self.costo_variable_entry, self.costo_fijo_entry):
+            entry.bind("<Return>", lambda e: self.mostrar_cuadro())
+
+        # Volúmenes: rango Desde/Hasta/Paso o una lista separada por espacios o ';'
+        tk.Label(self.root, text="Unidades desde").grid(row=3, column=0, padx=10, pady=5, sticky="w")
+        self.desde_entry.grid(row=3, column=1, padx=5, sticky="w")
+        tk.Label(self.root, text="hasta").grid(row=3, column=2)
+        self.hasta_entry.grid(row=3, column=3, padx=5)
+        tk.Label(self.root, text="paso").grid(row=3, column=4)
+        self.paso_entry.grid(row=3, column=5, padx=5)
+        for entry, valor in ((self.desde_entry, "2000"), (self.hasta_entry, "10000"), (self.paso_entry, "2000")):
+            entry.insert(0, valor)
+        tk.Label(self.root, text="Lista de unidades (opcional)").grid(row=4, column=0, padx=10, pady=5, sticky="w")
+        self.unidades_entry.grid(row=4, column=1, columnspan=5, padx=5, sticky="we")
+
+        # Cuadro costo-volumen-utilidad: un solo Canvas sin importar el número de columnas.
+        # Los volúmenes (encabezado) y los Costos Fijos se editan con doble clic.
+        self.grafo = None
+        # Datos del formulario con que se armó o actualizó el cuadro por última vez
+        self.formulario = None
+        self.volumenes_formulario = None
+        self.cuadricula = CuadriculaCanvas(self.root, CONCEPTOS_CVP,
+                                           filas_editables=(-1, CONCEPTOS_CVP.index("Costos Fijos")),
+                                           al_editar=self.editar_celda)
+        self.cuadricula.marco.grid(row=5, column=0, columnspan=6, rowspan=5, padx=10, pady=10, sticky="nwe")
+
+    def leer_datos(self):
+        # Acepta "Q200,000.00", "200.000,00", "(1,500)"...
+        precio = convertir_texto(self.precio_entry.get())
+        costo_variable = convertir_texto(self.costo_variable_entry.get())
+        costo_fijo = convertir_texto(self.costo_fijo_entry.get())
+        return precio, costo_variable, costo_fijo
+
+    def leer_volumenes(self):
+        """Volúmenes de la lista si se escribió alguno; si no, los del rango Desde/Hasta/Paso."""
+        lista = self.unidades_entry.get().replace(';', ' ').split()
+        if lista:
+            return convertir(lista)
+        return rango_volumenes(convertir_texto(self.desde_entry.get()), convertir_texto(self.hasta_entry.get()),
+                               convertir_texto(self.paso_entry.get()), MAXIMO_VOLUMENES)
 
     def calcular(self):
         # Extraer valores del formulario
         try:
-            ventas = [float(entry.get()) for entry in self.entradas["Ventas"]]
-            costos_variables = [float(entry.get()) for entry in self.entradas["Costos variables"]]
-            margen_contribucion = [float(entry.get()) for entry in self.entradas["Margen de Contribución"]]
-            costos_fijos = 200000
-
-            # Cálculos del punto de equilibrio
-            margen_contribucion_unit = ventas[0] - costos_variables[0]  # Precio de venta - Costo variable por unidad
-            punto_equilibrio_unidades = costos_fijos / margen_contribucion_unit
-            punto_equilibrio_quetzales = punto_equilibrio_unidades * ventas[0]  # Unidades * Precio de venta
-
-            # Mostrar resultado en un messagebox
-            messagebox.showinfo("Cálculos",
-                                f"Margen de contribución por unidad: Q{margen_contribucion_unit:.2f}\n"
-                                f"Unidades para cubrir costos fijos: {punto_equilibrio_unidades:.2f} unidades\n"
-                                f"Punto de equilibrio en ventas: Q{punto_equilibrio_quetzales:.2f}")
+            precio, costo_variable, costo_fijo = self.leer_datos()
         except ValueError:
             messagebox.showerror("Error", "Asegúrese de ingresar solo valores numéricos")
+            return
+
+        # Cálculos del punto de equilibrio
+        resultado = calcular_punto_equilibrio(precio, costo_fijo, costo_variable)
+        if not np.isfinite(resultado.unidades):
+            messagebox.showerror("Error", "El precio debe ser mayor que el costo variable")
+            return
+
+        # Mostrar resultado en un messagebox
+        messagebox.showinfo("Cálculos",
+                            f"Margen de contribución por unidad: Q{resultado.margen:.2f}\n"
+                            f"Unidades para cubrir costos fijos: {resultado.unidades:.2f} unidades\n"
+                            f"Punto de equilibrio en ventas: Q{resultado.ventas:.2f}")
 
     def borrar_datos(self):
         # Borrar datos del formulario
-        for concepto in self.entradas:
-            for entry in self.entradas[concepto]:
-                entry.delete(0, tk.END)
+        for entry in (self.precio_entry, self.costo_variable_entry, self.unidades_entry):
+            entry.delete(0, tk.END)
+        self.grafo = None
+        self.cuadricula.limpiar()
 
+    @instrumentar()
     def mostrar_cuadro(self):
-        # Extraer los valores de las entradas
-        datos = {}
         try:
-            for concepto in self.entradas:
-                datos[concepto] = [float(entry.get()) for entry in self.entradas[concepto]]
+            precio, costo_variable, costo_fijo = self.leer_datos()
+            volumenes = self.leer_volumenes()
+        except ValueError as error:
+            messagebox.showerror("Error", f"Asegúrese de ingresar solo valores numéricos ({error})")
+            return
+
+        formulario = {"precio": precio, "costo_variable": costo_variable, "costo_fijo": costo_fijo}
+
+        # Mismos volúmenes en el formulario: solo se aplican los datos que cambiaron desde la
+        # última vez, así no se pisan las celdas editadas a mano (Costos Fijos o volúmenes)
+        if self.grafo is not None and np.array_equal(volumenes, self.volumenes_formulario):
+            with fase("calculo"):
+                afectados = {}
+                for nombre, valor in formulario.items():
+                    if valor != self.formulario[nombre]:
+                        afectados.update(self.grafo.cambiar(nombre, valor))
+            self.formulario = formulario
+            with fase("render"):
+                self.repintar(afectados)
+            return
+
+        # Cuadro nuevo: todo en una sola pasada vectorizada
+        with fase("calculo"):
+            self.grafo = GrafoCVP(volumenes, precio, costo_variable, costo_fijo)
+        self.formulario = formulario
+        self.volumenes_formulario = volumenes
+
+        # Solo se dibujan las columnas visibles
+        with fase("render"):
+            self.cuadricula.configurar(self.grafo.volumenes, self.grafo.cuadro)
+
+    def editar_celda(self, fila, columna, texto):
+        try:
+            valor = convertir_texto(texto)
         except ValueError:
             messagebox.showerror("Error", "Asegúrese de ingresar solo valores numéricos")
             return
-
-        # Crear el DataFrame con los datos
-        data = {
-            'Concepto': ["Ventas", "Costos variables", "Margen de Contribución", "Costos Fijos", "Utilidad o Pérdida"],
-            '2,000': [datos["Ventas"][0], datos["Costos variables"][0], datos["Margen de Contribución"][0], 200000, datos["Utilidad o Pérdida"][0]],
-            '4,000': [datos["Ventas"][1], datos["Costos variables"][1], datos["Margen de Contribución"][1], 200000, datos["Utilidad o Pérdida"][1]],
-            '6,000': [datos["Ventas"][2], datos["Costos variables"][2], datos["Margen de Contribución"][2], 200000, datos["Utilidad o Pérdida"][2]],
-            '8,000': [datos["Ventas"][3], datos["Costos variables"][3], datos["Margen de Contribución"][3], 200000, datos["Utilidad o Pérdida"][3]],
-            '10,000': [datos["Ventas"][4], datos["Costos variables"][4], datos["Margen de Contribución"][4], 200000, datos["Utilidad o Pérdida"][4]],
-        }
-        
-        df = pd.DataFrame(data)
-
-        # Crear la tabla con los valores ingresados
-        fig, ax = plt.subplots(figsize=(8, 4))
-        table = ax.table(cellText=df.values, colLabels=df.columns, cellLoc='center', loc='center')
-
-        # Ajustar la tabla
-        table.scale(1.5, 1.5)
-        ax.axis('off')
-
-        plt.show()
+        concepto = None if fila == -1 else CONCEPTOS_CVP[fila]
+        self.repintar(self.grafo.cambiar_celda(concepto, columna, valor), columna if concepto is None else None)
+
+    def repintar(self, afectados, volumen_editado=None):
+        # Solo las celdas recalculadas; el encabezado si se editó un volumen
+        if volumen_editado is not None:
+            self.cuadricula.refrescar([], [volumen_editado], encabezado=True)
+        for concepto, columnas in afectados.items():
+            self.cuadricula.refrescar([self.grafo.filas[concepto]], columnas)
 
 
 # Crear la aplicación
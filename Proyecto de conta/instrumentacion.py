@@ -0,0 +1,140 @@
+import atexit
+import bisect
+import contextlib
+import functools
+import json
+import os
+import time
+import tracemalloc
+from collections import deque
+
+# Instrumentación opcional de los callbacks de la GUI. Se activa con la variable
+# de entorno CONTA_PERFIL=ruta.json; al salir de la aplicación se escribe ahí un
+# resumen por callback y por fase (cálculo, widgets, render) con histogramas de
+# latencia y el pico de memoria asignada durante la llamada (tracemalloc).
+#
+#   CONTA_PERFIL=perfil.json python conta.py
+#
+# Desactivada, `instrumentar` devuelve la función original sin envolver y
+# `fase` devuelve siempre el mismo contexto vacío, así el costo es casi nulo.
+# CONTA_PERFIL_MEMORIA=0 mide solo tiempos (tracemalloc hace más lento el código).
+
+RUTA = os.environ.get("CONTA_PERFIL")
+ACTIVO = bool(RUTA)
+MEMORIA = ACTIVO and os.environ.get("CONTA_PERFIL_MEMORIA", "1") != "0"
+VENTANA = 1000  # mediciones recientes que se conservan por clave para los percentiles
+LIMITES_MS = [2.0 ** k for k in range(-4, 15)]  # 0.0625 ms ... 16 s
+
+_NULO = contextlib.nullcontext()
+_pila = []  # mediciones abiertas, de la más externa a la más interna
+_registros = {}
+
+
+class Histograma:
+    """Conteo acumulado por cubetas logarítmicas más una ventana móvil de mediciones."""
+
+    def __init__(self):
+        self.conteos = [0] * (len(LIMITES_MS) + 1)
+        self.recientes = deque(maxlen=VENTANA)
+        self.memoria = deque(maxlen=VENTANA)
+        self.total = 0
+        self.suma_ms = 0.0
+
+    def agregar(self, ms, pico_bytes):
+        self.conteos[bisect.bisect_left(LIMITES_MS, ms)] += 1
+        self.recientes.append(ms)
+        self.memoria.append(pico_bytes)
+        self.total += 1
+        self.suma_ms += ms
+
+    def resumen(self):
+        ordenados = sorted(self.recientes)
+
+        def percentil(p):
+            return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))] if ordenados else None
+
+        return {
+            "llamadas": self.total,
+            "media_ms": self.suma_ms / self.total if self.total else None,
+            "p50_ms": percentil(50),
+            "p90_ms": percentil(90),
+            "p99_ms": percentil(99),
+            "max_ms": ordenados[-1] if ordenados else None,
+            "pico_memoria_medio_bytes": sum(self.memoria) / len(self.memoria) if self.memoria else None,
+            "pico_memoria_max_bytes": max(self.memoria) if self.memoria else None,
+            "histograma_ms": {"limites": LIMITES_MS, "conteos": self.conteos},
+        }
+
+
+class _Medicion:
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.pico = 0
+
+    def __enter__(self):
+        if MEMORIA:
+            # reset_peak borra el pico de la medición externa: se le guarda antes
+            if _pila:
+                _pila[-1].pico = max(_pila[-1].pico, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self.memoria = tracemalloc.get_traced_memory()[0]
+        _pila.append(self)
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.inicio) * 1000
+        clave = ".".join(medicion.nombre for medicion in _pila)
+        _pila.pop()
+        pico = 0
+        if MEMORIA:
+            self.pico = max(self.pico, tracemalloc.get_traced_memory()[1])
+            pico = self.pico - self.memoria
+            if _pila:
+                _pila[-1].pico = max(_pila[-1].pico, self.pico)
+        registro = _registros.get(clave)
+        if registro is None:
+            registro = _registros[clave] = Histograma()
+        registro.agregar(ms, pico)
+        return False
+
+
+def fase(nombre):
+    """Contexto que mide una fase dentro de un callback (p. ej. 'calculo', 'widgets', 'render')."""
+    if not ACTIVO:
+        return _NULO
+    return _Medicion(nombre)
+
+
+def instrumentar(nombre=None):
+    """Decorador para callbacks; sin CONTA_PERFIL devuelve la función sin cambios."""
+    def decorador(funcion):
+        if not ACTIVO:
+            return funcion
+        etiqueta = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _Medicion(etiqueta):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def resumen():
+    return {clave: registro.resumen() for clave, registro in sorted(_registros.items())}
+
+
+def volcar(ruta=None):
+    """Escribe el resumen en JSON (se llama automáticamente al salir si está activo)."""
+    ruta = ruta or RUTA
+    if not ruta or not _registros:
+        return
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(resumen(), archivo, ensure_ascii=False, indent=2)
+
+
+if ACTIVO:
+    if MEMORIA:
+        tracemalloc.start()
+    atexit.register(volcar)
@@ -0,0 +1,383 @@
+import argparse
+import csv
+import sys
+from itertools import islice
+
+import numpy as np
+
+from nucleo import calcular_punto_equilibrio
+from validacion import validar, contar, FILA_INCOMPLETA, FUERA_DE_CENTAVOS
+
+# Modo por lotes: lee escenarios por bloques de tamaño fijo, calcula cada bloque
+# de forma vectorizada y va escribiendo los resultados, así la memoria no crece
+# con el tamaño del archivo de entrada.
+
+COLUMNAS_ENTRADA = ["precio", "costo_fijo", "costo_variable"]
+COLUMNA_UNIDADES = "unidades"
+COLUMNAS_SALIDA = ["margen", "unidades_equilibrio", "ventas_equilibrio", "utilidad"]
+COLUMNA_CODIGO = "codigo_error"
+TAMANO_BLOQUE = 100_000
+
+
+def _es_parquet(ruta):
+    return str(ruta).lower().endswith((".parquet", ".pq"))
+
+
+def leer_bloques_csv(ruta, tamano_bloque=TAMANO_BLOQUE, formato=None, delimitador=",", errores="lanzar"):
+    """Lee un CSV con encabezado y devuelve bloques {columna: arreglo}.
+
+    Con `formato` (ver numeros.FORMATOS) las celdas se leen como texto y se
+    convierten por columna: montos con Q, separadores de miles, coma decimal o
+    paréntesis para negativos, tal como salen de una hoja de cálculo.
+    errores="lanzar" detiene la lectura en la primera celda ilegible o fila
+    incompleta, con su número de línea en el archivo. errores="nan" deja NaN en
+    esas celdas y, si hubo filas incompletas, agrega al bloque la columna
+    COLUMNA_CODIGO con FILA_INCOMPLETA para que vayan a los rechazos.
+    """
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        encabezado = next(csv.reader([archivo.readline()], delimiter=delimitador))
+        encabezado = [nombre.strip() for nombre in encabezado]
+        faltantes = [c for c in COLUMNAS_ENTRADA if c not in encabezado]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+
+        nombres = COLUMNAS_ENTRADA + ([COLUMNA_UNIDADES] if COLUMNA_UNIDADES in encabezado else [])
+        indices = [encabezado.index(nombre) for nombre in nombres]
+
+        linea = 2  # la línea 1 es el encabezado
+        while True:
+            lineas = list(islice(archivo, tamano_bloque))
+            if not lineas:
+                break
+            yield _leer_bloque_csv(lineas, linea, nombres, indices, formato, delimitador, errores)
+            linea += len(lineas)
+
+
+def _leer_bloque_csv(lineas, linea, nombres, indices, formato, delimitador, errores):
+    # Ruta rápida: np.loadtxt en C; si el bloque tiene algo ilegible se relee fila por fila
+    try:
+        if formato is None:
+            datos = np.loadtxt(lineas, delimiter=delimitador, usecols=indices, ndmin=2, dtype=np.float64)
+            return {nombre: datos[:, i] for i, nombre in enumerate(nombres)}
+        textos = np.loadtxt(lineas, delimiter=delimitador, quotechar='"', usecols=indices, ndmin=2, dtype=str)
+        incompletas = None
+        numeros_linea = None
+    except ValueError:
+        textos, incompletas, numeros_linea = _leer_texto(lineas, linea, indices, delimitador)
+
+    bloque = {}
+    problemas = []  # (fila del bloque, mensaje) del primer problema de cada tipo, para errores="lanzar"
+    if incompletas is not None and incompletas.any():
+        bloque[COLUMNA_CODIGO] = np.where(incompletas, FILA_INCOMPLETA, 0).astype(np.uint8)
+        j = np.flatnonzero(incompletas)[0]
+        problemas.append((j, "faltan columnas"))
+    for i, nombre in enumerate(nombres):
+        valores, ilegibles = _convertir_columna(textos[:, i], formato)
+        if incompletas is not None:
+            ilegibles &= ~incompletas  # las celdas que faltan ya cuentan como fila incompleta
+        if ilegibles.any():
+            j = np.flatnonzero(ilegibles)[0]
+            problemas.append((j, f"valor numérico inválido en la columna {nombre}: {str(textos[j, i])!r}"))
+        bloque[nombre] = valores
+
+    if errores == "lanzar" and problemas:
+        j, descripcion = min(problemas)
+        if numeros_linea is None:
+            numeros_linea = _numeros_linea(lineas, linea)
+        raise ValueError(f"Línea {numeros_linea[j]}: {descripcion}")
+    return bloque
+
+
+def _es_dato(linea):
+    # np.loadtxt se salta las líneas en blanco y los comentarios; la ruta lenta hace lo mismo
+    texto = linea.strip()
+    return bool(texto) and not texto.startswith("#")
+
+
+def _numeros_linea(lineas, linea):
+    """Número de línea en el archivo de cada fila de datos del bloque."""
+    return np.array([linea + k for k, texto in enumerate(lineas) if _es_dato(texto)], dtype=np.int64)
+
+
+def _leer_texto(lineas, linea, indices, delimitador):
+    """Ruta lenta: celdas como texto fila por fila; devuelve (textos, filas incompletas, números de línea)."""
+    ultima = max(indices)
+    filas, incompletas, numeros_linea = [], [], []
+    for k, texto in enumerate(lineas):
+        if not _es_dato(texto):
+            continue
+        campos = next(csv.reader([texto], delimiter=delimitador))
+        incompleta = len(campos) <= ultima
+        if incompleta:
+            campos = campos + [""] * (ultima + 1 - len(campos))
+        incompletas.append(incompleta)
+        filas.append([campos[i] for i in indices])
+        numeros_linea.append(linea + k)
+    textos = np.array(filas, dtype=str).reshape(-1, len(indices))
+    return textos, np.array(incompletas, dtype=bool), np.array(numeros_linea, dtype=np.int64)
+
+
+def _convertir_columna(textos, formato):
+    """(valores, ilegibles) de una columna de textos; sin `formato`, números simples como float()."""
+    from numeros import convertir_con_mascara
+
+    if formato is not None:
+        return convertir_con_mascara(textos, formato)
+    valores = np.empty(len(textos))
+    ilegibles = np.zeros(len(textos), dtype=bool)
+    for j, texto in enumerate(textos):
+        try:
+            valores[j] = float(texto)
+        except ValueError:
+            valores[j] = np.nan
+            ilegibles[j] = True
+    return valores, ilegibles
+
+
+def leer_bloques_parquet(ruta, tamano_bloque=TAMANO_BLOQUE):
+    """Lee un archivo Parquet por lotes de filas (requiere pyarrow)."""
+    import pyarrow.parquet as pq
+
+    archivo = pq.ParquetFile(ruta)
+    disponibles = archivo.schema_arrow.names
+    faltantes = [c for c in COLUMNAS_ENTRADA if c not in disponibles]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+
+    nombres = COLUMNAS_ENTRADA + ([COLUMNA_UNIDADES] if COLUMNA_UNIDADES in disponibles else [])
+    for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=nombres):
+        yield {
+            nombre: lote.column(i).to_numpy(zero_copy_only=False).astype(np.float64, copy=False)
+            for i, nombre in enumerate(nombres)
+        }
+
+
+def leer_bloques(ruta, tamano_bloque=TAMANO_BLOQUE, formato=None, delimitador=",", errores="lanzar"):
+    """Elige el lector según la extensión del archivo."""
+    if _es_parquet(ruta):
+        return leer_bloques_parquet(ruta, tamano_bloque)
+    return leer_bloques_csv(ruta, tamano_bloque, formato, delimitador, errores)
+
+
+def separar_rechazos(bloque):
+    """Divide un bloque en (válidos, rechazados, códigos de los rechazados) según validacion.py."""
+    bloque = dict(bloque)
+    lectura = bloque.pop(COLUMNA_CODIGO, None)  # filas incompletas marcadas por el lector
+    codigos = validar(bloque["precio"], bloque["costo_fijo"], bloque["costo_variable"],
+                      bloque.get(COLUMNA_UNIDADES)).codigos
+    if lectura is not None:
+        codigos |= lectura
+    validos = codigos == 0
+    if validos.all():
+        return bloque, None, codigos[:0]
+    rechazados = {nombre: valores[~validos] for nombre, valores in bloque.items()}
+    rechazados[COLUMNA_CODIGO] = codigos[~validos].astype(np.int64)
+    return {nombre: valores[validos] for nombre, valores in bloque.items()}, rechazados, codigos[~validos]
+
+
+def calcular_bloque_centavos(bloque, redondeo="arriba"):
+    """Igual que calcular_bloque pero con montos exactos en centavos int64.
+
+    Las filas cuyos montos o resultados no caben en int64 (incluidos nan e inf)
+    quedan marcadas con FUERA_DE_CENTAVOS en COLUMNA_CODIGO; `factible` vale 0
+    donde no hay punto de equilibrio (unidades y ventas de equilibrio en 0).
+    """
+    from centavos import LIMITE_CENTAVOS, centavos_representables, punto_equilibrio_centavos
+
+    forma = bloque["precio"].shape
+    representables = np.ones(forma, dtype=bool)
+    montos = []
+    for nombre in ("precio", "costo_fijo", "costo_variable"):
+        centavos, caben = centavos_representables(bloque[nombre])
+        montos.append(centavos)
+        representables &= caben
+    unidades = np.rint(np.asarray(bloque.get(COLUMNA_UNIDADES, 0.0), dtype=np.float64))
+    caben = np.abs(unidades) < LIMITE_CENTAVOS
+    representables &= caben
+    unidades = np.where(caben, unidades, 0).astype(np.int64)
+
+    resultado_c = punto_equilibrio_centavos(*montos, unidades, redondeo)
+    exacto = representables & resultado_c.exacto
+
+    resultado = dict(bloque)
+    resultado.update({
+        "margen_centavos": resultado_c.margen,
+        "factible": resultado_c.factible.astype(np.int8),
+        "unidades_equilibrio": resultado_c.unidades,
+        "ventas_equilibrio_centavos": resultado_c.ventas,
+        "utilidad_centavos": np.broadcast_to(resultado_c.utilidad, forma),
+        COLUMNA_CODIGO: np.where(exacto, 0, FUERA_DE_CENTAVOS).astype(np.int64),
+    })
+    return resultado
+
+
+def calcular_bloque(bloque):
+    """Calcula margen, punto de equilibrio y utilidad para un bloque de escenarios."""
+    precio = bloque["precio"]
+    costo_fijo = bloque["costo_fijo"]
+    costo_variable = bloque["costo_variable"]
+    unidades = bloque.get(COLUMNA_UNIDADES, 0.0)
+
+    margen, unidades_pe, ventas_pe, utilidad = calcular_punto_equilibrio(precio, costo_fijo, costo_variable, unidades)
+
+    resultado = dict(bloque)
+    resultado.update({
+        "margen": margen,
+        "unidades_equilibrio": unidades_pe,
+        "ventas_equilibrio": ventas_pe,
+        "utilidad": utilidad,
+    })
+    return resultado
+
+
+class EscritorCsv:
+    def __init__(self, ruta):
+        self.archivo = open(ruta, "w", newline="", encoding="utf-8")
+        self.columnas = None
+
+    def escribir(self, bloque):
+        if self.columnas is None:
+            self.columnas = list(bloque)
+            # Las columnas enteras (centavos) se escriben sin decimales ni notación científica;
+            # las de punto flotante con 17 cifras para que el CSV devuelva el mismo float64
+            self.formatos = ["%d" if np.issubdtype(np.asarray(bloque[c]).dtype, np.integer) else "%.17g"
+                             for c in self.columnas]
+            self.archivo.write(",".join(self.columnas) + "\n")
+        datos = np.column_stack([bloque[c] for c in self.columnas])
+        np.savetxt(self.archivo, datos, delimiter=",", fmt=self.formatos)
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class EscritorParquet:
+    def __init__(self, ruta):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._pq = pq
+        self.ruta = ruta
+        self.escritor = None
+
+    def escribir(self, bloque):
+        tabla = self._pa.table({c: np.ascontiguousarray(v) for c, v in bloque.items()})
+        if self.escritor is None:
+            self.escritor = self._pq.ParquetWriter(self.ruta, tabla.schema)
+        self.escritor.write_table(tabla)
+
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+def crear_escritor(ruta):
+    """Elige el escritor según la extensión del archivo."""
+    if _es_parquet(ruta):
+        return EscritorParquet(ruta)
+    return EscritorCsv(ruta)
+
+
+def procesar(entrada, salida, tamano_bloque=TAMANO_BLOQUE, procesos=1, redondeo=None, formato=None,
+             delimitador=",", rechazos=None):
+    """Procesa el archivo de entrada bloque por bloque.
+
+    Devuelve (filas escritas, {regla: filas rechazadas}); el diccionario queda
+    vacío si no se pidió `rechazos`.
+
+    Con `redondeo` (ver centavos.REDONDEOS) el cálculo se hace en centavos enteros.
+    `formato` y `delimitador` describen un CSV exportado de una hoja de cálculo.
+    Con `rechazos` las filas que no pasan validacion.py (y las celdas ilegibles)
+    van a ese archivo con su `codigo_error` en lugar de a la salida.
+    """
+    escritor = crear_escritor(salida)
+    escritor_rechazos = crear_escritor(rechazos) if rechazos else None
+    conteo = {}
+    ejecutor = None
+    if redondeo is not None:
+        calcular = lambda bloque: calcular_bloque_centavos(bloque, redondeo)
+    elif procesos > 1:
+        from paralelo import EjecutorParalelo
+        ejecutor = EjecutorParalelo(procesos)
+        calcular = ejecutor.calcular_bloque
+    else:
+        calcular = calcular_bloque
+
+    filas = 0
+    errores = "nan" if escritor_rechazos else "lanzar"
+    try:
+        for bloque in leer_bloques(entrada, tamano_bloque, formato, delimitador, errores):
+            if escritor_rechazos:
+                bloque, rechazados, codigos = separar_rechazos(bloque)
+                if rechazados is not None:
+                    escritor_rechazos.escribir(rechazados)
+                    for regla, cantidad in contar(codigos).items():
+                        conteo[regla] = conteo.get(regla, 0) + cantidad
+                if not len(bloque["precio"]):
+                    continue
+            resultado = calcular(bloque)
+            # Solo el modo en centavos marca filas que no pudo calcular
+            codigos = resultado.pop(COLUMNA_CODIGO, None)
+            if codigos is not None and codigos.any():
+                fallidas = codigos != 0
+                if not escritor_rechazos:
+                    raise ValueError(f"{int(fallidas.sum())} filas tienen montos que no caben en centavos int64")
+                rechazados = {nombre: valores[fallidas] for nombre, valores in bloque.items()}
+                rechazados[COLUMNA_CODIGO] = codigos[fallidas]
+                escritor_rechazos.escribir(rechazados)
+                for regla, cantidad in contar(codigos[fallidas]).items():
+                    conteo[regla] = conteo.get(regla, 0) + cantidad
+                resultado = {nombre: valores[~fallidas] for nombre, valores in resultado.items()}
+            escritor.escribir(resultado)
+            filas += len(resultado["precio"])
+    finally:
+        escritor.cerrar()
+        if escritor_rechazos:
+            escritor_rechazos.cerrar()
+        if ejecutor:
+            ejecutor.cerrar()
+    return filas, conteo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cálculo del punto de equilibrio por lotes (CSV o Parquet).")
+    parser.add_argument("entrada", help="Archivo con columnas precio, costo_fijo, costo_variable y opcionalmente unidades")
+    parser.add_argument("salida", help="Archivo de resultados (.csv o .parquet)")
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE, help="Filas por bloque (memoria acotada)")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos de cálculo; el orden de salida no cambia")
+    parser.add_argument("--centavos", choices=["arriba", "abajo", "mitad_arriba", "mitad_par"], metavar="REDONDEO",
+                        help="Montos exactos en centavos int64; REDONDEO para las unidades de equilibrio "
+                             "(arriba, abajo, mitad_arriba, mitad_par)")
+    parser.add_argument("--formato-numeros", choices=["gt", "es", "auto"],
+                        help="Leer montos como texto: gt = 1,234.50; es = 1.234,50; auto = por celda. "
+                             "Acepta el prefijo Q y paréntesis para negativos")
+    parser.add_argument("--delimitador", default=",", help="Separador de campos del CSV (p. ej. ';')")
+    parser.add_argument("--rechazos", metavar="RUTA",
+                        help="Validar cada fila y escribir las inválidas en RUTA con su codigo_error "
+                             "(bits de validacion.py) en lugar de detener el proceso")
+    args = parser.parse_args(argv)
+
+    if args.tamano_bloque <= 0:
+        parser.error("--tamano-bloque debe ser mayor que cero")
+    if args.procesos <= 0:
+        parser.error("--procesos debe ser mayor que cero")
+    if args.centavos and args.procesos > 1:
+        parser.error("--centavos se calcula en un solo proceso")
+
+    if len(args.delimitador) != 1:
+        parser.error("--delimitador debe ser un solo carácter")
+
+    try:
+        filas, conteo = procesar(args.entrada, args.salida, args.tamano_bloque, args.procesos, args.centavos,
+                                 args.formato_numeros, args.delimitador, args.rechazos)
+    except ValueError as error:
+        parser.error(f"{error} (use --rechazos para separar las filas inválidas)")
+    print(f"{filas} escenarios procesados -> {args.salida}", file=sys.stderr)
+    if args.rechazos:
+        reglas = ", ".join(f"{regla}: {cantidad}" for regla, cantidad in conteo.items() if cantidad)
+        print(f"Rechazos -> {args.rechazos}" + (f" ({reglas})" if reglas else " (ninguno)"), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+import numpy as np
+from collections import namedtuple
+
+# Búsqueda de objetivos: las preguntas inversas de calcular_utilidad para
+# carteras completas en un solo llamado.
+#
+#   unidades necesarias    x  = (cf + meta) / (p - cv)
+#   precio mínimo          p  = cv + (cf + meta) / x
+#   costo variable máximo  cv = p - (cf + meta) / x
+#
+# Con el modelo lineal las tres tienen forma cerrada. Para otra función de
+# utilidad (p. ej. costos escalonados o no lineales) se usa una bisección
+# vectorizada: todas las filas avanzan a la vez y cada iteración es una sola
+# evaluación de la función sobre el arreglo completo.
+#
+# Las filas sin solución no lanzan excepción: quedan en NaN y con su bit en
+# `infactibles`.
+
+UNIDADES_INFACTIBLES = 1        # el margen no alcanza para la meta (precio <= costo variable)
+PRECIO_INFACTIBLE = 2           # sin unidades no hay precio que cubra la meta
+COSTO_VARIABLE_INFACTIBLE = 4   # ni con costo variable 0 se llega a la meta
+
+ResultadoMetas = namedtuple("ResultadoMetas", ["unidades", "precio_minimo", "costo_variable_maximo", "infactibles"])
+
+ITERACIONES_MAXIMAS = 200
+TOLERANCIA = 1e-9
+COTA_UNIDADES = 1e12
+COTA_PRECIO = 1e12
+
+
+def biseccion_vectorizada(funcion, bajo, alto, tolerancia=TOLERANCIA, iteraciones=ITERACIONES_MAXIMAS):
+    """Raíz de `funcion` en [bajo, alto] para cada fila; devuelve (raíces, factibles).
+
+    `funcion` recibe un arreglo y devuelve otro de la misma forma. Las filas
+    donde la función no cambia de signo entre los extremos no tienen raíz
+    garantizada: quedan en NaN y con factible=False. La tolerancia es relativa
+    al tamaño de la raíz (absoluta cerca de cero).
+    """
+    bajo, alto = np.broadcast_arrays(np.asarray(bajo, dtype=np.float64), np.asarray(alto, dtype=np.float64))
+    f_bajo = np.asarray(funcion(bajo), dtype=np.float64)
+    f_alto = np.asarray(funcion(alto), dtype=np.float64)
+    # Extremos escalares con una función por filas (p. ej. una meta distinta por fila): una copia por fila
+    bajo, alto, f_bajo, f_alto = (np.array(v) for v in np.broadcast_arrays(bajo, alto, f_bajo, f_alto))
+
+    # Raíz exacta en un extremo: se guarda antes de que la bisección mueva los extremos
+    exacta_bajo = f_bajo == 0
+    exactas = exacta_bajo | (f_alto == 0)
+    extremo_exacto = np.where(exacta_bajo, bajo, alto)
+    factibles = (np.sign(f_bajo) * np.sign(f_alto) <= 0) & np.isfinite(f_bajo) & np.isfinite(f_alto)
+    negativo_abajo = f_bajo < 0
+    # Las filas sin raíz igual se parten a la mitad; solo se excluyen del criterio de paro
+    # las que tienen extremos no finitos
+    vigiladas = np.isfinite(bajo) & np.isfinite(alto)
+
+    medio = np.empty_like(bajo)
+    negativo = np.empty(bajo.shape, dtype=bool)
+    mover_bajo = np.empty(bajo.shape, dtype=bool)
+    for iteracion in range(iteraciones):
+        # El intervalo se reduce a la mitad en cada paso: basta revisar el paro cada pocas iteraciones
+        if iteracion % 4 == 0:
+            ancho = np.abs(alto - bajo)
+            if np.all((ancho <= tolerancia * np.maximum(1.0, np.abs(bajo))) | ~vigiladas):
+                break
+        np.add(bajo, alto, out=medio)
+        medio *= 0.5
+        f_medio = np.asarray(funcion(medio), dtype=np.float64)
+        # El extremo que tiene el mismo signo que f(medio) se mueve al centro
+        np.less(f_medio, 0, out=negativo)
+        np.equal(negativo, negativo_abajo, out=mover_bajo)
+        np.copyto(bajo, medio, where=mover_bajo)
+        np.logical_not(mover_bajo, out=mover_bajo)
+        np.copyto(alto, medio, where=mover_bajo)
+
+    raices = np.array(0.5 * (bajo + alto))
+    np.copyto(raices, extremo_exacto, where=exactas)
+    raices[~factibles] = np.nan
+    return raices, factibles
+
+
+def buscar_objetivo(funcion, meta, bajo, alto, **opciones):
+    """Valor en [bajo, alto] donde funcion(valor) == meta, fila por fila (ver biseccion_vectorizada)."""
+    meta = np.asarray(meta, dtype=np.float64)
+    return biseccion_vectorizada(lambda x: np.asarray(funcion(x)) - meta, bajo, alto, **opciones)
+
+
+def _preparar(*valores):
+    return np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in valores))
+
+
+def unidades_para_utilidad(utilidad_meta, precio, costo_variable, costo_fijo):
+    """Unidades que dan la utilidad meta; NaN donde el margen no es positivo (y la meta exige ventas)."""
+    utilidad_meta, precio, costo_variable, costo_fijo = _preparar(utilidad_meta, precio, costo_variable, costo_fijo)
+    necesario = costo_fijo + utilidad_meta
+    margen = precio - costo_variable
+    unidades = np.full(necesario.shape, np.nan)
+    np.divide(necesario, margen, out=unidades, where=margen > 0)
+    # Si los costos fijos ya cubren la meta (meta <= -cf) no hace falta vender
+    unidades[necesario <= 0] = 0.0
+    return unidades
+
+
+def precio_minimo(unidades, utilidad_meta, costo_variable, costo_fijo):
+    """Precio mínimo que da la meta con ese volumen; 0 si cualquier precio sirve, NaN si ninguno."""
+    unidades, utilidad_meta, costo_variable, costo_fijo = _preparar(unidades, utilidad_meta, costo_variable, costo_fijo)
+    necesario = costo_fijo + utilidad_meta
+    precio = np.full(necesario.shape, np.nan)
+    np.divide(necesario, unidades, out=precio, where=unidades > 0)
+    precio += costo_variable
+    precio[(unidades <= 0) & (necesario <= 0)] = 0.0
+    return np.maximum(precio, 0.0)
+
+
+def costo_variable_maximo(unidades, utilidad_meta, precio, costo_fijo):
+    """Costo variable máximo tolerable; inf si cualquiera sirve, NaN si ni con costo 0 se llega."""
+    unidades, utilidad_meta, precio, costo_fijo = _preparar(unidades, utilidad_meta, precio, costo_fijo)
+    necesario = costo_fijo + utilidad_meta
+    costo = np.full(necesario.shape, np.nan)
+    np.divide(necesario, unidades, out=costo, where=unidades > 0)
+    np.subtract(precio, costo, out=costo)
+    costo[(unidades <= 0) & (necesario <= 0)] = np.inf
+    costo[costo < 0] = np.nan
+    return costo
+
+
+def _metas_con_funcion(funcion, utilidad_meta, precio, costo_fijo, costo_variable, unidades):
+    """Las tres búsquedas por bisección para una función de utilidad cualquiera."""
+    cero = np.zeros_like(precio)
+    por_unidades = lambda u: funcion(u, precio, costo_variable, costo_fijo)
+    por_precio = lambda q: funcion(unidades, q, costo_variable, costo_fijo)
+    por_costo = lambda c: funcion(unidades, precio, c, costo_fijo)
+
+    x, _ = buscar_objetivo(por_unidades, utilidad_meta, cero, COTA_UNIDADES)
+    p, _ = buscar_objetivo(por_precio, utilidad_meta, cero, COTA_PRECIO)
+    cv, _ = buscar_objetivo(por_costo, utilidad_meta, cero, COTA_PRECIO)
+
+    # Metas que ya se cumplen en el extremo favorable, igual que en la forma cerrada
+    x[por_unidades(cero) >= utilidad_meta] = 0.0
+    p[por_precio(cero) >= utilidad_meta] = 0.0
+    cv[por_costo(np.full_like(precio, COTA_PRECIO)) >= utilidad_meta] = np.inf
+    return x, p, cv
+
+
+def resolver_metas(utilidad_meta, precio, costo_fijo, costo_variable, unidades, funcion=None):
+    """Responde las tres preguntas inversas para cada fila en un solo llamado.
+
+    `unidades` es el volumen planeado con el que se buscan el precio mínimo y el
+    costo variable máximo. Sin `funcion` se usa la forma cerrada del modelo
+    lineal; con funcion(unidades, precio, costo_variable, costo_fijo) -> utilidad
+    (creciente en unidades y precio, decreciente en costo variable; p. ej.
+    nucleo.calcular_utilidad) se resuelve por bisección.
+    """
+    utilidad_meta, precio, costo_fijo, costo_variable, unidades = _preparar(
+        utilidad_meta, precio, costo_fijo, costo_variable, unidades)
+
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        if funcion is None:
+            x = unidades_para_utilidad(utilidad_meta, precio, costo_variable, costo_fijo)
+            p = precio_minimo(unidades, utilidad_meta, costo_variable, costo_fijo)
+            cv = costo_variable_maximo(unidades, utilidad_meta, precio, costo_fijo)
+        else:
+            x, p, cv = _metas_con_funcion(funcion, utilidad_meta, precio, costo_fijo, costo_variable, unidades)
+
+    infactibles = np.zeros(x.shape, dtype=np.uint8)
+    infactibles[np.isnan(x)] |= UNIDADES_INFACTIBLES
+    infactibles[np.isnan(p)] |= PRECIO_INFACTIBLE
+    infactibles[np.isnan(cv)] |= COSTO_VARIABLE_INFACTIBLE
+    return ResultadoMetas(x, p, cv, infactibles)
@@ -0,0 +1,93 @@
+import numpy as np
+
+# Punto de equilibrio con mezcla de ventas: muchos productos (SKU) comparten los
+# mismos costos fijos. Con pesos w_i (proporción de unidades de cada SKU):
+#
+#   margen ponderado  = sum(w_i * (p_i - cv_i)) / sum(w_i)
+#   equilibrio total  = costos fijos / margen ponderado
+#   unidades del SKU  = equilibrio total * w_i / sum(w_i)
+#
+# Las sumas se guardan, así cambiar un solo SKU cuesta O(1) y no obliga a
+# recorrer todos los productos.
+
+RECALCULO_CADA = 100_000  # cambios O(1) antes de volver a sumar todo (evita deriva de redondeo)
+CANCELACION = 1e-9  # si la suma de pesos queda por debajo de esta fracción del peso quitado, se vuelve a sumar
+
+
+class MezclaVentas:
+    def __init__(self, precios, costos_variables, pesos, costos_fijos):
+        self.precios = np.array(precios, dtype=np.float64)
+        self.costos_variables = np.array(costos_variables, dtype=np.float64)
+        self.pesos = np.array(pesos, dtype=np.float64)
+        if not (self.precios.shape == self.costos_variables.shape == self.pesos.shape) or self.precios.ndim != 1:
+            raise ValueError("Precios, costos variables y pesos deben ser vectores de la misma longitud")
+        if np.any(self.pesos < 0):
+            raise ValueError("Los pesos de la mezcla no pueden ser negativos")
+        self.costos_fijos = float(costos_fijos)
+        self.recalcular()
+
+    def recalcular(self):
+        """Vuelve a calcular las sumas desde cero (O(N))."""
+        self.suma_pesos = float(self.pesos.sum())
+        self.suma_margen = float(np.dot(self.pesos, self.precios - self.costos_variables))
+        self.suma_ventas = float(np.dot(self.pesos, self.precios))
+        self._cambios = 0
+
+    def actualizar(self, indice, precio=None, costo_variable=None, peso=None):
+        """Cambia los datos de un SKU ajustando las sumas en O(1)."""
+        precio_anterior = self.precios[indice]
+        costo_anterior = self.costos_variables[indice]
+        peso_anterior = self.pesos[indice]
+
+        precio_nuevo = precio_anterior if precio is None else float(precio)
+        costo_nuevo = costo_anterior if costo_variable is None else float(costo_variable)
+        peso_nuevo = peso_anterior if peso is None else float(peso)
+        if peso_nuevo < 0:
+            raise ValueError("Los pesos de la mezcla no pueden ser negativos")
+
+        self.suma_pesos += peso_nuevo - peso_anterior
+        self.suma_margen += peso_nuevo * (precio_nuevo - costo_nuevo) - peso_anterior * (precio_anterior - costo_anterior)
+        self.suma_ventas += peso_nuevo * precio_nuevo - peso_anterior * precio_anterior
+
+        self.precios[indice] = precio_nuevo
+        self.costos_variables[indice] = costo_nuevo
+        self.pesos[indice] = peso_nuevo
+
+        self._cambios += 1
+        # Al quitar casi todo el peso la suma acumulada es solo error de redondeo (p. ej. 1e-17 en vez de 0).
+        # Si no se quitó peso (p. ej. se edita un SKU sin peso de una mezcla vacía) no hay cancelación:
+        # las sumas de una mezcla vacía ya son 0 exactos y se actualizan sin recorrer los productos
+        cancelacion = peso_anterior > 0 and self.suma_pesos <= CANCELACION * peso_anterior
+        if self._cambios >= RECALCULO_CADA or cancelacion:
+            self.recalcular()
+
+    def margen_ponderado(self):
+        """Margen de contribución promedio ponderado por unidad."""
+        return self.suma_margen / self.suma_pesos if self.suma_pesos > 0 else float('nan')
+
+    def precio_ponderado(self):
+        return self.suma_ventas / self.suma_pesos if self.suma_pesos > 0 else float('nan')
+
+    def punto_equilibrio(self):
+        """Unidades totales (todos los SKU) para cubrir los costos fijos; inf si el margen ponderado es <= 0."""
+        margen = self.margen_ponderado()
+        return self.costos_fijos / margen if margen > 0 else float('inf')
+
+    def ventas_equilibrio(self):
+        """Punto de equilibrio en quetzales."""
+        return self.punto_equilibrio() * self.precio_ponderado()
+
+    def unidades_producto(self, indice):
+        """Unidades de equilibrio asignadas a un SKU (O(1)); NaN si la mezcla no tiene pesos."""
+        if self.suma_pesos <= 0:
+            return float('nan')
+        return self.punto_equilibrio() * self.pesos[indice] / self.suma_pesos
+
+    def unidades_por_producto(self):
+        """Unidades de equilibrio de todos los SKU en una sola operación vectorizada; NaN si no hay pesos."""
+        if self.suma_pesos <= 0:
+            return np.full(self.pesos.shape, np.nan)
+        return self.punto_equilibrio() * self.pesos / self.suma_pesos
+
+    def ventas_por_producto(self):
+        return self.unidades_por_producto() * self.precios
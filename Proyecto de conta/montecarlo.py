@@ -0,0 +1,273 @@
+import argparse
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from nucleo import margen_contribucion, punto_equilibrio, calcular_utilidad
+
+# Simulación Monte Carlo del punto de equilibrio. Precio, costo variable y
+# costo fijo se muestrean de distribuciones dadas por el usuario; los sorteos se
+# procesan en bloques de tamaño fijo (memoria acotada) y cada bloque solo
+# devuelve conteos de histograma y sumas. Cada bloque tiene su propia semilla
+# derivada de la semilla principal, así el resultado es el mismo con 1 o N procesos.
+# La varianza se acumula con (n, media, M2) por bloque y se combina con la
+# fórmula de Chan, sin restar sumas de cuadrados grandes y casi iguales.
+
+DISTRIBUCIONES = {
+    "fijo": 1,        # fijo:valor
+    "uniforme": 2,    # uniforme:minimo,maximo
+    "normal": 2,      # normal:media,desviacion
+    "triangular": 3,  # triangular:minimo,moda,maximo
+    "lognormal": 2,   # lognormal:mu,sigma (de log X)
+}
+PERCENTILES = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+TAMANO_BLOQUE = 1_000_000
+CUBETAS = 2000
+
+
+def _parametro(texto, original):
+    try:
+        valor = float(texto)
+    except ValueError:
+        raise ValueError(f"Parámetro no numérico en '{original}': '{texto.strip()}'") from None
+    if not np.isfinite(valor):
+        raise ValueError(f"Parámetro no finito en '{original}'")
+    return valor
+
+
+def validar_distribucion(distribucion):
+    """Lanza ValueError si los parámetros no definen una distribución válida."""
+    nombre, p = distribucion
+    if nombre == "uniforme" and p[0] > p[1]:
+        raise ValueError(f"uniforme: el mínimo ({p[0]:g}) no puede ser mayor que el máximo ({p[1]:g})")
+    if nombre == "normal" and p[1] < 0:
+        raise ValueError(f"normal: la desviación ({p[1]:g}) no puede ser negativa")
+    if nombre == "lognormal" and p[1] < 0:
+        raise ValueError(f"lognormal: sigma ({p[1]:g}) no puede ser negativa")
+    if nombre == "triangular":
+        minimo, moda, maximo = p
+        if not minimo <= moda <= maximo:
+            raise ValueError("triangular: se requiere mínimo <= moda <= máximo")
+        if minimo == maximo:
+            raise ValueError("triangular: el mínimo y el máximo deben ser distintos (use fijo:valor)")
+    return distribucion
+
+
+def leer_distribucion(texto):
+    """Convierte 'normal:50,5' en ('normal', (50.0, 5.0)); un número solo equivale a 'fijo'."""
+    nombre, _, parametros = texto.partition(":")
+    if not parametros:
+        return ("fijo", (_parametro(nombre, texto),))
+    nombre = nombre.strip().lower()
+    if nombre not in DISTRIBUCIONES:
+        raise ValueError(f"Distribución desconocida: {nombre}")
+    valores = tuple(_parametro(v, texto) for v in parametros.split(","))
+    if len(valores) != DISTRIBUCIONES[nombre]:
+        raise ValueError(f"{nombre} necesita {DISTRIBUCIONES[nombre]} parámetros")
+    return validar_distribucion((nombre, valores))
+
+
+def muestrear(generador, distribucion, n):
+    """Muestra n valores de una distribución ('nombre', parámetros)."""
+    nombre, p = distribucion
+    if nombre == "fijo":
+        return np.full(n, p[0])
+    if nombre == "uniforme":
+        return generador.uniform(p[0], p[1], n)
+    if nombre == "normal":
+        return generador.normal(p[0], p[1], n)
+    if nombre == "triangular":
+        return generador.triangular(p[0], p[1], p[2], n)
+    return generador.lognormal(p[0], p[1], n)
+
+
+def _histograma(valores, limites):
+    # Cubetas uniformes: el índice se calcula directamente. Hay una cubeta extra
+    # a cada lado (debajo / encima del rango) para no deformar las de los extremos
+    inicio, fin = limites
+    escala = CUBETAS / (fin - inicio)
+    indices = np.clip(np.floor((valores - inicio) * escala), -1, CUBETAS).astype(np.int64) + 1
+    return np.bincount(indices, minlength=CUBETAS + 2)
+
+
+def _muestrear_bloque(distribuciones, semilla, n):
+    generador = np.random.default_rng(semilla)
+    precio = muestrear(generador, distribuciones[0], n)
+    costo_variable = muestrear(generador, distribuciones[1], n)
+    costo_fijo = muestrear(generador, distribuciones[2], n)
+    return precio, costo_variable, costo_fijo
+
+
+def simular_bloque(distribuciones, unidades, semilla, n, limites_utilidad, limites_equilibrio):
+    """Procesa un bloque de n sorteos y devuelve solo estadísticas acumulables."""
+    precio, costo_variable, costo_fijo = _muestrear_bloque(distribuciones, semilla, n)
+    margen = margen_contribucion(precio, costo_variable)
+    equilibrio = punto_equilibrio(costo_fijo, margen)
+    utilidad = calcular_utilidad(unidades, precio, costo_variable, costo_fijo)
+
+    factible = np.isfinite(equilibrio)
+    media = float(utilidad.mean())
+    desvio = utilidad - media
+    return {
+        "n": n,
+        "perdidas": int(np.count_nonzero(utilidad < 0)),
+        "sin_equilibrio": int(n - np.count_nonzero(factible)),
+        "media": media,
+        "m2": float(np.dot(desvio, desvio)),
+        "minimo": float(utilidad.min()),
+        "maximo": float(utilidad.max()),
+        "hist_utilidad": _histograma(utilidad, limites_utilidad),
+        "hist_equilibrio": _histograma(equilibrio[factible], limites_equilibrio),
+    }
+
+
+def combinar_momentos(a, b):
+    """Combina (n, media, M2) de dos grupos de datos (Chan et al.); M2 es la suma de cuadrados de los desvíos."""
+    n_a, media_a, m2_a = a
+    n_b, media_b, m2_b = b
+    n = n_a + n_b
+    if n == 0:
+        return (0, 0.0, 0.0)
+    delta = media_b - media_a
+    return (n, media_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n)
+
+
+def _limites(valores):
+    # Rango del histograma a partir de un bloque piloto, ampliado para cubrir colas
+    valores = valores[np.isfinite(valores)]
+    if valores.size == 0:
+        return (0.0, 1.0)
+    bajo, alto = np.percentile(valores, [0.01, 99.99])
+    holgura = 0.25 * (alto - bajo) or max(abs(bajo), 1.0)
+    return (float(bajo - holgura), float(alto + holgura))
+
+
+def _percentiles(conteos, limites):
+    """Percentiles interpolados sobre la distribución acumulada del histograma.
+
+    `conteos` incluye las cubetas de debajo y encima del rango; un percentil que
+    cae en ellas no se puede ubicar y queda en None.
+    """
+    total = conteos.sum()
+    if total == 0:
+        return {str(p): None for p in PERCENTILES}
+    bordes = np.linspace(limites[0], limites[1], CUBETAS + 1)
+    acumulado = np.cumsum(conteos[:-1]) / total
+    cuantiles = np.array(PERCENTILES) / 100
+    valores = np.interp(cuantiles, acumulado, bordes)
+    dentro = (cuantiles >= acumulado[0]) & (cuantiles <= acumulado[-1])
+    return {str(p): float(v) if d else None for p, v, d in zip(PERCENTILES, valores, dentro)}
+
+
+def _resumen_histograma(conteos, limites):
+    return {"limites": limites, "conteos": conteos[1:-1].tolist(),
+            "debajo": int(conteos[0]), "encima": int(conteos[-1])}
+
+
+def simular(precio, costo_variable, costo_fijo, unidades, sorteos=10_000_000, semilla=None,
+            tamano_bloque=TAMANO_BLOQUE, procesos=1):
+    """Simula `sorteos` escenarios y devuelve probabilidad de pérdida, percentiles e histogramas."""
+    distribuciones = [validar_distribucion(d) if isinstance(d, tuple) else leer_distribucion(str(d))
+                      for d in (precio, costo_variable, costo_fijo)]
+    bloques = [tamano_bloque] * (sorteos // tamano_bloque)
+    if sorteos % tamano_bloque:
+        bloques.append(sorteos % tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(len(bloques))
+
+    # Bloque piloto (con la semilla del primer bloque) para fijar el rango de los histogramas
+    p, cv, cf = _muestrear_bloque(distribuciones, semillas[0], min(bloques[0], 100_000))
+    limites_utilidad = _limites(np.asarray(calcular_utilidad(unidades, p, cv, cf)))
+    limites_equilibrio = _limites(np.asarray(punto_equilibrio(cf, margen_contribucion(p, cv))))
+    del p, cv, cf
+
+    argumentos = [(distribuciones, unidades, s, n, limites_utilidad, limites_equilibrio)
+                  for s, n in zip(semillas, bloques)]
+    if procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            parciales = list(pool.map(simular_bloque, *zip(*argumentos)))
+    else:
+        parciales = [simular_bloque(*a) for a in argumentos]
+
+    # Se acumula en el orden de los bloques para que las sumas sean deterministas
+    hist_utilidad = np.zeros(CUBETAS + 2, dtype=np.int64)
+    hist_equilibrio = np.zeros(CUBETAS + 2, dtype=np.int64)
+    perdidas = sin_equilibrio = 0
+    momentos = (0, 0.0, 0.0)
+    for parcial in parciales:
+        hist_utilidad += parcial["hist_utilidad"]
+        hist_equilibrio += parcial["hist_equilibrio"]
+        perdidas += parcial["perdidas"]
+        sin_equilibrio += parcial["sin_equilibrio"]
+        momentos = combinar_momentos(momentos, (parcial["n"], parcial["media"], parcial["m2"]))
+
+    _, media, m2 = momentos
+    return {
+        "sorteos": sorteos,
+        "unidades": unidades,
+        "probabilidad_perdida": perdidas / sorteos,
+        "probabilidad_sin_equilibrio": sin_equilibrio / sorteos,
+        "utilidad_media": media,
+        "utilidad_desviacion": float(np.sqrt(m2 / sorteos)),
+        "utilidad_minima": min(p["minimo"] for p in parciales),
+        "utilidad_maxima": max(p["maximo"] for p in parciales),
+        "percentiles_utilidad": _percentiles(hist_utilidad, limites_utilidad),
+        "percentiles_equilibrio": _percentiles(hist_equilibrio, limites_equilibrio),
+        "histograma_utilidad": _resumen_histograma(hist_utilidad, limites_utilidad),
+        "histograma_equilibrio": _resumen_histograma(hist_equilibrio, limites_equilibrio),
+    }
+
+
+def guardar_histograma(resultado, ruta):
+    """Guarda el histograma de utilidad como imagen (matplotlib se carga solo aquí)."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    histograma = resultado["histograma_utilidad"]
+    bordes = np.linspace(*histograma["limites"], CUBETAS + 1)
+    figura = Figure(figsize=(10, 6))
+    FigureCanvasAgg(figura)
+    ax = figura.add_subplot()
+    ax.stairs(histograma["conteos"], bordes, fill=True, color="purple", alpha=0.6)
+    ax.axvline(0, color="black", linestyle="--", label=f"Pérdida: {resultado['probabilidad_perdida']:.1%}")
+    ax.set_title(f"Utilidad/Pérdida con {resultado['unidades']:,.0f} unidades ({resultado['sorteos']:,} sorteos)")
+    ax.set_xlabel("Quetzales")
+    ax.set_ylabel("Frecuencia")
+    ax.legend()
+    ax.grid(True)
+    figura.savefig(ruta)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo del punto de equilibrio.")
+    parser.add_argument("--precio", required=True, help="Distribución del precio, p. ej. normal:50,5")
+    parser.add_argument("--costo-variable", required=True, help="Distribución del costo variable, p. ej. uniforme:25,35")
+    parser.add_argument("--costo-fijo", required=True, help="Distribución del costo fijo, p. ej. fijo:200000")
+    parser.add_argument("--unidades", type=float, required=True, help="Volumen objetivo para la utilidad")
+    parser.add_argument("--sorteos", type=int, default=10_000_000)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--histogramas", action="store_true", help="Incluir los conteos de los histogramas en la salida")
+    parser.add_argument("--grafica", help="Ruta PNG para el histograma de utilidad")
+    args = parser.parse_args(argv)
+
+    if args.sorteos <= 0 or args.tamano_bloque <= 0 or args.procesos <= 0:
+        parser.error("--sorteos, --tamano-bloque y --procesos deben ser mayores que cero")
+    try:
+        distribuciones = [leer_distribucion(t) for t in (args.precio, args.costo_variable, args.costo_fijo)]
+    except ValueError as e:
+        parser.error(str(e))
+
+    resultado = simular(*distribuciones, args.unidades, args.sorteos, args.semilla, args.tamano_bloque, args.procesos)
+    if args.grafica:
+        guardar_histograma(resultado, args.grafica)
+    if not args.histogramas:
+        del resultado["histograma_utilidad"], resultado["histograma_equilibrio"]
+    print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+import numpy as np
+from collections import namedtuple
+
+from metas import biseccion_vectorizada
+from nucleo import muestrear_curva, PUNTOS_MAXIMOS
+
+# Curvas de ingreso y costo no lineales, vectorizadas sobre productos:
+#
+#   precio(q)          = p * (q / q0) ** (-1 / elasticidad)      demanda con elasticidad constante
+#   costo unitario(q)  = cv * (1 - d * q / (q + q0))             descuento por volumen (hasta d)
+#                           * (1 + q / q0) ** log2(aprendizaje)  curva de aprendizaje
+#
+# q0 es el volumen de referencia: a ese volumen se cotiza el precio `p`, el
+# descuento llega a la mitad de `d` y la curva de aprendizaje cuenta las
+# duplicaciones desde ahí. Con elasticidad=inf, descuento=0 y aprendizaje=1
+# el modelo es el lineal de siempre.
+#
+# Con curvas así puede haber varios puntos de equilibrio. Se barre una malla
+# de volúmenes (productos x muestras) para encontrar cada cambio de signo de la
+# utilidad y luego se refinan todos los cruces a la vez con bisección
+# vectorizada; el máximo se toma de la malla y se afina con sección áurea.
+
+Cruces = namedtuple("Cruces", ["producto", "unidades", "direccion"])
+Optimo = namedtuple("Optimo", ["unidades", "utilidad"])
+
+MUESTRAS = 256
+CELDAS_POR_BLOQUE = 4_000_000  # productos x muestras evaluados a la vez
+RAZON_AUREA = (np.sqrt(5.0) - 1.0) / 2.0
+TOLERANCIA = 1e-9
+ITERACIONES_MAXIMAS = 200
+
+_PARAMETROS = ("precio", "costo_variable", "costo_fijo", "elasticidad", "volumen_referencia",
+               "descuento", "aprendizaje")
+
+
+def maximo_seccion_aurea(funcion, bajo, alto, tolerancia=TOLERANCIA, iteraciones=ITERACIONES_MAXIMAS):
+    """Máximo de una función unimodal en [bajo, alto] para cada fila; devuelve (x, f(x)).
+
+    Todas las filas avanzan a la vez: cada iteración es una sola evaluación de
+    `funcion` sobre el arreglo completo.
+    """
+    bajo, alto = np.broadcast_arrays(np.asarray(bajo, dtype=np.float64), np.asarray(alto, dtype=np.float64))
+    x1 = alto - RAZON_AUREA * (alto - bajo)
+    x2 = bajo + RAZON_AUREA * (alto - bajo)
+    f1 = np.asarray(funcion(x1), dtype=np.float64)
+    f2 = np.asarray(funcion(x2), dtype=np.float64)
+    # Extremos escalares con una función por filas: una copia por fila
+    bajo, alto, x1, x2, f1, f2 = (np.array(v) for v in np.broadcast_arrays(bajo, alto, x1, x2, f1, f2))
+
+    for iteracion in range(iteraciones):
+        if iteracion % 4 == 0 and np.all(alto - bajo <= tolerancia * np.maximum(1.0, np.abs(bajo))):
+            break
+        # Si f1 < f2 el máximo queda en [x1, alto]; si no, en [bajo, x2]
+        derecha = f1 < f2
+        izquierda = ~derecha
+        np.copyto(bajo, x1, where=derecha)
+        np.copyto(alto, x2, where=izquierda)
+        nuevo_x1 = np.where(derecha, x2, alto - RAZON_AUREA * (alto - bajo))
+        nuevo_x2 = np.where(derecha, bajo + RAZON_AUREA * (alto - bajo), x1)
+        nuevo = np.where(derecha, nuevo_x2, nuevo_x1)
+        f_nuevo = np.asarray(funcion(nuevo), dtype=np.float64)
+        f1, f2 = np.where(derecha, f2, f_nuevo), np.where(derecha, f_nuevo, f1)
+        x1, x2 = nuevo_x1, nuevo_x2
+
+    x = 0.5 * (bajo + alto)
+    return x, np.asarray(funcion(x), dtype=np.float64)
+
+
+class CurvasNoLineales:
+    def __init__(self, precio, costo_variable, costo_fijo, elasticidad=np.inf, volumen_referencia=1.0,
+                 descuento=0.0, aprendizaje=1.0):
+        """Un producto por elemento; escalares y arreglos se expanden a la misma forma.
+
+        descuento: fracción máxima de rebaja del costo variable (0 a 1).
+        aprendizaje: costo relativo tras duplicar el volumen (0.9 = curva del 90 %).
+        """
+        valores = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in
+                                        (precio, costo_variable, costo_fijo, elasticidad, volumen_referencia,
+                                         descuento, aprendizaje)))
+        if np.any(valores[4] <= 0):
+            raise ValueError("El volumen de referencia debe ser mayor que cero")
+        if np.any(valores[3] <= 1):
+            # Con demanda inelástica el ingreso crecería sin límite al vender menos
+            raise ValueError("La elasticidad debe ser mayor que 1 (inf = precio fijo)")
+        if np.any((valores[5] < 0) | (valores[5] >= 1)) or np.any(valores[6] <= 0):
+            raise ValueError("El descuento va de 0 a 1 y el aprendizaje debe ser mayor que cero")
+        self.parametros = dict(zip(_PARAMETROS, (v.ravel() for v in valores)))
+        self.forma = valores[0].shape
+
+    def __len__(self):
+        return len(self.parametros["precio"])
+
+    def _columnas(self, filas, q):
+        """Parámetros de `filas` (una por elemento del primer eje de q) alineados con q."""
+        ejes = (1,) * (q.ndim - 1)
+        return [v[filas].reshape(-1, *ejes) if ejes else v[filas] for v in self.parametros.values()]
+
+    def _evaluar(self, q, filas=slice(None)):
+        """(ingresos, costos totales, utilidad) a los volúmenes q (filas x muestras o un volumen por fila)."""
+        q = np.asarray(q, dtype=np.float64)
+        p, cv, cf, elasticidad, q0, descuento, aprendizaje = self._columnas(filas, q)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            relativo = q / q0
+            # Ingreso q * precio(q) como potencia de q para que q = 0 dé 0 y no 0 * inf
+            ingresos = p * q0 * relativo ** (1.0 - 1.0 / elasticidad)
+            unitario = cv * (1.0 - descuento * q / (q + q0)) * (1.0 + relativo) ** np.log2(aprendizaje)
+            costos = cf + unitario * q
+            return ingresos, costos, ingresos - costos
+
+    def utilidad(self, q, filas=slice(None)):
+        return self._evaluar(q, filas)[2]
+
+    def _bloques(self, volumen_maximo, muestras):
+        volumen_maximo = np.broadcast_to(np.asarray(volumen_maximo, dtype=np.float64), (len(self),))
+        fracciones = np.linspace(0.0, 1.0, muestras)
+        tamano = max(1, CELDAS_POR_BLOQUE // muestras)
+        for inicio in range(0, len(self), tamano):
+            filas = np.arange(inicio, min(inicio + tamano, len(self)))
+            malla = volumen_maximo[filas, np.newaxis] * fracciones
+            yield filas, malla, self.utilidad(malla, filas)
+
+    def puntos_equilibrio(self, volumen_maximo, muestras=MUESTRAS):
+        """Todos los cruces de la utilidad por cero en [0, volumen_maximo], de todos los productos.
+
+        Devuelve arreglos planos (producto, unidades, direccion) ordenados por
+        producto y volumen; direccion = 1 si la utilidad pasa a >= 0 y -1 si
+        cae bajo cero. Dos cruces más cercanos que el paso de la malla
+        (volumen_maximo / (muestras - 1)) pueden no distinguirse.
+        """
+        productos, bajos, altos, direcciones = [], [], [], []
+        for filas, malla, utilidad in self._bloques(volumen_maximo, muestras):
+            positiva = utilidad >= 0
+            fila, columna = np.nonzero(positiva[:, 1:] != positiva[:, :-1])
+            productos.append(filas[fila])
+            bajos.append(malla[fila, columna])
+            altos.append(malla[fila, columna + 1])
+            direcciones.append(np.where(positiva[fila, columna + 1], 1, -1))
+        producto = np.concatenate(productos)
+        bajo, alto = np.concatenate(bajos), np.concatenate(altos)
+
+        # Todos los cruces de todos los productos se refinan en una sola bisección
+        unidades, _ = biseccion_vectorizada(lambda q: self.utilidad(q, producto), bajo, alto)
+        return Cruces(producto, unidades, np.concatenate(direcciones))
+
+    def maximo(self, volumen_maximo, muestras=MUESTRAS):
+        """Volumen que maximiza la utilidad en [0, volumen_maximo] y la utilidad ahí, por producto.
+
+        La malla elige el mejor pico (aunque haya varios máximos locales) y la
+        sección áurea lo afina entre las muestras vecinas.
+        """
+        unidades = np.empty(len(self))
+        for filas, malla, utilidad in self._bloques(volumen_maximo, muestras):
+            mejor = np.argmax(np.where(np.isnan(utilidad), -np.inf, utilidad), axis=1)
+            bajo = malla[np.arange(len(filas)), np.maximum(mejor - 1, 0)]
+            alto = malla[np.arange(len(filas)), np.minimum(mejor + 1, muestras - 1)]
+            unidades[filas], _ = maximo_seccion_aurea(lambda q: self.utilidad(q, filas), bajo, alto)
+        return Optimo(unidades, self.utilidad(unidades))
+
+    def series_grafica(self, producto, volumen_maximo, presupuesto=PUNTOS_MAXIMOS):
+        """Volúmenes y (ingresos, costos totales, utilidad) de un producto para graficar.
+
+        Usa el mismo presupuesto de puntos que las gráficas lineales, pero todo
+        en relleno uniforme (las curvas no son rectas) más los cruces y el máximo.
+        """
+        modelo = CurvasNoLineales(*(v[producto] for v in self.parametros.values()))
+        cruces = modelo.puntos_equilibrio(volumen_maximo)
+        optimo = modelo.maximo(volumen_maximo)
+        especiales = np.concatenate([cruces.unidades, optimo.unidades])
+        unidades = muestrear_curva(0.0, volumen_maximo, especiales, presupuesto=presupuesto)
+        ingresos, costos, utilidad = modelo._evaluar(unidades[np.newaxis, :], [0])
+        return unidades, (ingresos[0], costos[0], utilidad[0]), cruces.unidades, optimo
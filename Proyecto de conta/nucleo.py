@@ -0,0 +1,138 @@
+import numpy as np
+from collections import namedtuple
+
+# Núcleo numérico del punto de equilibrio, sin dependencias de Tk.
+# Todas las funciones aceptan escalares o arreglos de NumPy y operan
+# elemento a elemento, de modo que un solo llamado cubre millones de productos.
+
+ResultadoEquilibrio = namedtuple("ResultadoEquilibrio", ["margen", "unidades", "ventas", "utilidad"])
+
+# Filas del cuadro costo-volumen-utilidad, en el orden en que las devuelve cuadro_cvp
+CONCEPTOS_CVP = ["Ventas", "Costos variables", "Margen de Contribución", "Costos Fijos", "Utilidad o Pérdida"]
+
+# Puntos máximos por serie en una gráfica (aprox. el ancho en píxeles del lienzo)
+PUNTOS_MAXIMOS = 1000
+
+
+def _como_arreglo(valor):
+    return np.asarray(valor, dtype=np.float64)
+
+
+def _escalar_si_0d(arreglo):
+    # Los arreglos 0-d se devuelven como escalares para que las GUI puedan formatearlos
+    return arreglo[()] if arreglo.ndim == 0 else arreglo
+
+
+def margen_contribucion(p, cv):
+    """Margen de contribución por unidad (precio - costo variable)."""
+    return _escalar_si_0d(np.subtract(_como_arreglo(p), _como_arreglo(cv)))
+
+
+def punto_equilibrio(cf, mc):
+    """Punto de equilibrio en unidades; inf donde el margen es <= 0 y nan si algún dato no es finito."""
+    cf = _como_arreglo(cf)
+    mc = _como_arreglo(mc)
+    forma = np.broadcast_shapes(cf.shape, mc.shape)
+    pe = np.full(forma, np.inf)
+    np.divide(cf, mc, out=pe, where=mc > 0)
+    pe[~(np.isfinite(cf) & np.isfinite(mc))] = np.nan
+    return _escalar_si_0d(pe)
+
+
+def calcular_utilidad(x, p, cv, cf):
+    """Utilidad o pérdida al vender x unidades."""
+    return _escalar_si_0d(_como_arreglo(x) * (_como_arreglo(p) - _como_arreglo(cv)) - _como_arreglo(cf))
+
+
+def sensibilidad(precios, costos_variables, costo_fijo, unidades=0):
+    """Malla precio x costo variable en una sola pasada (filas = costo variable, columnas = precio)."""
+    precios = _como_arreglo(precios).ravel()
+    costos_variables = _como_arreglo(costos_variables).ravel()
+    return calcular_punto_equilibrio(precios[np.newaxis, :], costo_fijo, costos_variables[:, np.newaxis], unidades)
+
+
+def contar_volumenes(inicio, fin, paso):
+    """Cantidad de volúmenes inicio, inicio + paso, ... hasta fin; ValueError si el rango no es válido."""
+    if not np.all(np.isfinite([inicio, fin, paso])):
+        raise ValueError("El rango debe tener valores finitos")
+    if paso <= 0:
+        raise ValueError("El paso debe ser mayor que cero")
+    if fin < inicio:
+        raise ValueError("El final del rango debe ser mayor o igual que el inicio")
+    return int(np.floor((fin - inicio) / paso + 1e-9)) + 1
+
+
+def rango_volumenes(inicio, fin, paso, maximo=None):
+    """Volúmenes inicio, inicio + paso, ... hasta fin (inclusive)."""
+    cantidad = contar_volumenes(inicio, fin, paso)
+    if maximo is not None and cantidad > maximo:
+        raise ValueError(f"El rango tiene {cantidad:,} volúmenes; el máximo es {maximo:,}")
+    return inicio + paso * np.arange(cantidad, dtype=np.float64)
+
+
+def cuadro_cvp(precio, costo_variable, costo_fijo, volumenes):
+    """Cuadro costo-volumen-utilidad: una fila por concepto (CONCEPTOS_CVP) y una columna por volumen."""
+    volumenes = _como_arreglo(volumenes).ravel()
+    cuadro = np.empty((len(CONCEPTOS_CVP), len(volumenes)))
+    np.multiply(volumenes, precio, out=cuadro[0])
+    np.multiply(volumenes, costo_variable, out=cuadro[1])
+    np.subtract(cuadro[0], cuadro[1], out=cuadro[2])
+    cuadro[3] = costo_fijo
+    np.subtract(cuadro[2], cuadro[3], out=cuadro[4])
+    return cuadro
+
+
+def muestrear_curva(inicio, fin, especiales=(), relleno=None, presupuesto=PUNTOS_MAXIMOS):
+    """Puntos en x para graficar: extremos, puntos especiales (equilibrio, quiebres) y relleno uniforme acotado.
+
+    Sin `relleno` se usan todos los puntos del presupuesto que dejan libres los
+    extremos y los especiales; relleno=0 deja solo extremos y especiales.
+    """
+    especiales = np.asarray(especiales, dtype=np.float64).ravel()
+    especiales = especiales[np.isfinite(especiales) & (especiales >= inicio) & (especiales <= fin)]
+    if relleno is None:
+        relleno = presupuesto - 2 - len(especiales)
+    relleno = int(max(0, min(relleno, presupuesto - 2)))
+    base = np.linspace(inicio, fin, relleno + 2)
+    # Las curvas lineales por tramos quedan exactas con solo estos puntos
+    return np.unique(np.concatenate([base, especiales]))
+
+
+def equilibrio_en_sitio(precio, costo_fijo, costo_variable, unidades, salida):
+    """Escribe margen, equilibrio (unidades y quetzales) y utilidad en los cuatro arreglos de salida.
+
+    Es el cálculo común de calcular_punto_equilibrio, lotes y paralelo; las
+    entradas deben poder difundirse a la forma de las salidas.
+    """
+    margen, unidades_pe, ventas_pe, utilidad = salida
+    np.subtract(precio, costo_variable, out=margen)
+
+    unidades_pe.fill(np.inf)
+    np.divide(costo_fijo, margen, out=unidades_pe, where=margen > 0)
+    np.copyto(unidades_pe, np.nan, where=~(np.isfinite(costo_fijo) & np.isfinite(margen)))
+
+    # Ventas en el punto de equilibrio; donde no hay equilibrio se conserva inf/nan
+    np.copyto(ventas_pe, unidades_pe)
+    np.multiply(unidades_pe, precio, out=ventas_pe, where=np.isfinite(unidades_pe))
+
+    np.multiply(unidades, margen, out=utilidad)
+    np.subtract(utilidad, costo_fijo, out=utilidad)
+
+
+def calcular_punto_equilibrio(precio, costo_fijo, costo_variable, unidades=0):
+    """Calcula margen, punto de equilibrio (unidades y quetzales) y utilidad en una sola pasada vectorizada."""
+    precio = _como_arreglo(precio)
+    costo_fijo = _como_arreglo(costo_fijo)
+    costo_variable = _como_arreglo(costo_variable)
+    unidades = _como_arreglo(unidades)
+
+    forma = np.broadcast_shapes(precio.shape, costo_fijo.shape, costo_variable.shape, unidades.shape)
+    margen, unidades_pe, ventas_pe, utilidad = (np.empty(forma) for _ in ResultadoEquilibrio._fields)
+    equilibrio_en_sitio(precio, costo_fijo, costo_variable, unidades, (margen, unidades_pe, ventas_pe, utilidad))
+
+    return ResultadoEquilibrio(
+        _escalar_si_0d(margen),
+        _escalar_si_0d(unidades_pe),
+        _escalar_si_0d(ventas_pe),
+        _escalar_si_0d(utilidad),
+    )
@@ -0,0 +1,185 @@
+import numpy as np
+
+# Lectura de montos escritos a mano o exportados de hojas de cálculo:
+# "Q1,234.50", "(2,000.00)", "1.234,50", " -Q 300 ". Se procesa una columna
+# completa a la vez sin un float() de Python por celda.
+#
+#   gt   -> 1,234.50 (coma de miles, punto decimal; uso en Guatemala)
+#   es   -> 1.234,50 (punto de miles, coma decimal)
+#   auto -> se decide celda por celda: si aparecen ambos separadores el último
+#           es el decimal; una sola coma seguida de exactamente 3 dígitos se
+#           toma como separador de miles ("200,000"), si no como decimal ("2,5");
+#           varios puntos sin coma ("1.234.567") son separadores de miles.
+#
+# El símbolo Q y los espacios se ignoran; un signo "-" (antes del número) o
+# paréntesis contables hacen negativo el monto. Una celda con signo y paréntesis
+# a la vez ("(-5)") es ambigua y se considera ilegible, igual que un paréntesis
+# sin pareja ("5)") o un signo después del separador (".-36").
+#
+# Ruta rápida: el arreglo de textos (UCS-4) se ve como una matriz de códigos
+# de carácter y el valor se arma con aritmética entera: la mantisa exacta en
+# int64 y una sola división entre 10**decimales, que da el mismo float64
+# correctamente redondeado que float() mientras la mantisa quepa en 53 bits.
+# Las celdas que no encajan (notación científica, inf, mantisas de más de 53 bits,
+# texto inválido) se resuelven una por una.
+
+FORMATOS = ("gt", "es", "auto")
+
+# Clases de carácter para la ruta rápida (códigos >= 255 cuentan como "otro")
+_IGNORADO, _DIGITO, _COMA, _PUNTO, _MENOS, _PARENTESIS, _OTRO = range(7)
+_CLASES = np.full(256, _OTRO, dtype=np.uint8)
+_CLASES[[0, ord("Q"), ord("q"), ord(" "), ord("\t"), 0xA0]] = _IGNORADO
+_CLASES[ord("0"):ord("9") + 1] = _DIGITO
+_CLASES[ord(",")] = _COMA
+_CLASES[ord(".")] = _PUNTO
+_CLASES[ord("-")] = _MENOS
+_CLASES[[ord("("), ord(")")]] = _PARENTESIS
+_DIVISORES = 10.0 ** np.arange(19)
+_MANTISA_EXACTA = 2 ** 53
+_DIGITOS_MAXIMOS = 18
+
+
+def _separadores_texto(texto, formato):
+    """(decimal, miles) para una celda ya sin Q, espacios ni paréntesis."""
+    if formato == "gt":
+        return ".", ","
+    if formato == "es":
+        return ",", "."
+    coma, punto = texto.rfind(","), texto.rfind(".")
+    digitos_tras_coma = sum(c in "0123456789" for c in texto[coma + 1:])
+    if coma > punto and (punto >= 0 or (texto.count(",") == 1 and digitos_tras_coma != 3)):
+        return ",", "."
+    if coma < 0 and texto.count(".") > 1:
+        return "", "."
+    return ".", ","
+
+
+def _convertir_uno(texto, formato):
+    abre, cierra = texto.count("("), texto.count(")")
+    if abre != cierra or abre > 1 or texto.find("(") > texto.find(")"):
+        raise ValueError("Paréntesis contables sin pareja")
+    negativo = abre == 1
+    if negativo and ("-" in texto or "+" in texto):
+        raise ValueError("Signo y paréntesis contables en la misma celda")
+    for simbolo in ("Q", "q", " ", "\t", "\u00a0", "(", ")"):
+        texto = texto.replace(simbolo, "")
+    decimal, miles = _separadores_texto(texto, formato)
+    texto = texto.replace(miles, "")
+    if decimal and decimal != ".":
+        texto = texto.replace(decimal, ".")
+    valor = float(texto)
+    return -valor if negativo else valor
+
+
+def _convertir_rapido(textos, formato):
+    """Devuelve (valores, resueltos); `resueltos` marca las celdas que la ruta rápida pudo leer."""
+    n = len(textos)
+    ancho = textos.dtype.itemsize // 4
+    ancho_util = max(1, int(np.char.str_len(textos).max()))
+    codigos = np.ascontiguousarray(textos).view(np.uint32).reshape(n, ancho)[:, :ancho_util]
+
+    # Matrices (posición x celda) en uint8: cada fila es una posición de carácter de todas las celdas
+    caracteres = np.minimum(codigos, 255).astype(np.uint8).T.copy()
+    clases = _CLASES[caracteres]
+    es_digito = clases == _DIGITO
+    es_coma = clases == _COMA
+    es_punto = clases == _PUNTO
+    es_menos = clases == _MENOS
+    es_separador = es_coma | es_punto
+
+    # Un paso por posición de carácter (no por celda): la mantisa con todos los dígitos
+    # seguidos (los separadores de miles no cambian el valor), la posición de la última
+    # coma y del último punto, y cuántos dígitos había al pasar por ellos
+    valores_digito = (caracteres - ord("0")) * es_digito
+    factores = 1 + 9 * es_digito.view(np.uint8)
+    mantisa = np.zeros(n, dtype=np.int64)
+    digitos = np.zeros(n, dtype=np.int16)
+    ultima_coma = np.full(n, -1, dtype=np.int16)
+    ultimo_punto = np.full(n, -1, dtype=np.int16)
+    digitos_en_coma = np.zeros(n, dtype=np.int16)
+    digitos_en_punto = np.zeros(n, dtype=np.int16)
+    menos_tarde = np.zeros(n, dtype=bool)  # signo después del primer dígito o separador
+    separador_visto = np.zeros(n, dtype=bool)
+    for posicion in range(ancho_util):
+        mantisa *= factores[posicion]
+        mantisa += valores_digito[posicion]
+        digitos += es_digito[posicion]
+        np.copyto(ultima_coma, posicion, where=es_coma[posicion])
+        np.copyto(ultimo_punto, posicion, where=es_punto[posicion])
+        np.copyto(digitos_en_coma, digitos, where=es_coma[posicion])
+        np.copyto(digitos_en_punto, digitos, where=es_punto[posicion])
+        separador_visto |= es_separador[posicion]
+        menos_tarde |= es_menos[posicion] & ((digitos > 0) | separador_visto)
+
+    comas = es_coma.sum(axis=0)
+    puntos = es_punto.sum(axis=0)
+    tras_coma = digitos - digitos_en_coma  # dígitos después de la última coma
+    tras_punto = digitos - digitos_en_punto
+
+    if formato == "gt":
+        separadores, decimales = puntos, np.where(puntos > 0, tras_punto, 0)
+    elif formato == "es":
+        separadores, decimales = comas, np.where(comas > 0, tras_coma, 0)
+    else:
+        # La coma es decimal si va después del último punto y no parece de miles
+        coma_decimal = (ultima_coma > ultimo_punto) & ((puntos > 0) | ((comas == 1) & (tras_coma != 3)))
+        puntos_de_miles = (comas == 0) & (puntos > 1)
+        separadores = np.where(coma_decimal, comas, np.where(puntos_de_miles, 0, puntos))
+        decimales = np.where(coma_decimal, tras_coma, np.where(puntos_de_miles | (puntos == 0), 0, tras_punto))
+
+    menos = es_menos.sum(axis=0)
+    abre = caracteres == ord("(")
+    cierra = caracteres == ord(")")
+    parentesis = abre.any(axis=0)
+    # Solo "(" ... ")" en ese orden; sin pareja, repetidos o con signo pasan a la ruta lenta, que los rechaza
+    pareja = (abre.sum(axis=0) == cierra.sum(axis=0)) & (abre.sum(axis=0) <= 1) & (abre.argmax(axis=0) <= cierra.argmax(axis=0))
+    resueltos = (~(clases == _OTRO).any(axis=0) & (digitos > 0) & (digitos <= _DIGITOS_MAXIMOS)
+                 & (separadores <= 1) & (menos <= 1) & ~menos_tarde & (mantisa <= _MANTISA_EXACTA)
+                 & pareja & ~(parentesis & (menos > 0)))
+    valores = mantisa / _DIVISORES[np.clip(decimales, 0, _DIGITOS_MAXIMOS)]
+    negativo = (menos == 1) | parentesis
+    np.negative(valores, out=valores, where=negativo)
+    return valores, resueltos
+
+
+def convertir(textos, formato="auto", errores="lanzar", fila_inicial=1):
+    """Convierte una columna de textos a float64.
+
+    errores="lanzar" produce ValueError con la primera celda inválida (numerada
+    desde `fila_inicial`); errores="nan" deja NaN en las celdas que no se pudieron leer.
+    """
+    if errores not in ("lanzar", "nan"):
+        raise ValueError(f"Modo de errores desconocido: {errores}")
+    textos = np.asarray(textos, dtype=str).ravel()
+    valores, ilegibles = convertir_con_mascara(textos, formato)
+    if errores == "lanzar" and ilegibles.any():
+        i = np.flatnonzero(ilegibles)[0]
+        raise ValueError(f"Valor numérico inválido en la fila {i + fila_inicial}: {str(textos[i])!r}")
+    return valores
+
+
+def convertir_con_mascara(textos, formato="auto"):
+    """Como convertir(errores="nan"), pero devuelve también la máscara de celdas ilegibles.
+
+    Sirve para distinguir un "nan" escrito en la celda de un texto que no es número.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de números desconocido: {formato}")
+    textos = np.asarray(textos, dtype=str).ravel()
+    ilegibles = np.zeros(textos.shape, dtype=bool)
+    if textos.size == 0:
+        return np.empty(0, dtype=np.float64), ilegibles
+
+    valores, resueltos = _convertir_rapido(textos, formato)
+    for i in np.flatnonzero(~resueltos):
+        try:
+            valores[i] = _convertir_uno(str(textos[i]), formato)
+        except ValueError:
+            valores[i] = np.nan
+            ilegibles[i] = True
+    return valores, ilegibles
+
+
+def convertir_texto(texto, formato="auto"):
+    """Un solo valor (p. ej. un Entry de la GUI); ValueError si no es un número."""
+    return float(convertir([texto], formato)[0])
@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from nucleo import equilibrio_en_sitio
+
+# Ejecución por fragmentos en varios procesos. Los datos viajan en memoria
+# compartida (no se serializan los arreglos): cada proceso lee su rango de
+# filas del bloque de entrada y escribe en el mismo rango del bloque de salida,
+# por lo que el orden de los resultados es siempre el de la entrada.
+
+ENTRADAS = ["precio", "costo_fijo", "costo_variable", "unidades"]
+SALIDAS = ["margen", "unidades_equilibrio", "ventas_equilibrio", "utilidad"]
+
+
+def _abrir(nombre, filas, columnas):
+    memoria = shared_memory.SharedMemory(name=nombre)
+    return memoria, np.ndarray((columnas, filas), dtype=np.float64, buffer=memoria.buf)
+
+
+def _calcular_fragmento(nombre_entrada, nombre_salida, capacidad, inicio, fin):
+    """Calcula las filas [inicio, fin) directamente sobre la memoria compartida."""
+    memoria_entrada, entrada = _abrir(nombre_entrada, capacidad, len(ENTRADAS))
+    memoria_salida, salida = _abrir(nombre_salida, capacidad, len(SALIDAS))
+    try:
+        equilibrio_en_sitio(*entrada[:, inicio:fin], salida[:, inicio:fin])
+    finally:
+        # Las vistas deben soltarse antes de cerrar los segmentos
+        del entrada, salida
+        memoria_entrada.close()
+        memoria_salida.close()
+    return fin - inicio
+
+
+def dividir_en_fragmentos(filas, procesos):
+    """Devuelve los rangos (inicio, fin) contiguos y ordenados en que se reparte un bloque."""
+    limites = np.linspace(0, filas, min(procesos, max(filas, 1)) + 1).astype(np.int64)
+    return [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+class EjecutorParalelo:
+    """Reparte bloques de escenarios entre procesos usando memoria compartida."""
+
+    def __init__(self, procesos=None):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.procesos)
+        self.capacidad = 0
+        self.memoria_entrada = None
+        self.memoria_salida = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _reservar(self, filas):
+        # Los segmentos se reutilizan entre bloques y solo crecen si hace falta
+        if filas <= self.capacidad:
+            return
+        self._liberar()
+        self.capacidad = filas
+        self.memoria_entrada = shared_memory.SharedMemory(create=True, size=len(ENTRADAS) * filas * 8)
+        self.memoria_salida = shared_memory.SharedMemory(create=True, size=len(SALIDAS) * filas * 8)
+
+    def _liberar(self):
+        for memoria in (self.memoria_entrada, self.memoria_salida):
+            if memoria is not None:
+                memoria.close()
+                memoria.unlink()
+        self.memoria_entrada = self.memoria_salida = None
+        self.capacidad = 0
+
+    def calcular_bloque(self, bloque):
+        """Equivalente en paralelo de lotes.calcular_bloque."""
+        filas = len(bloque["precio"])
+        if filas == 0:
+            return dict(bloque, **{nombre: np.empty(0) for nombre in SALIDAS})
+        self._reservar(filas)
+
+        entrada = np.ndarray((len(ENTRADAS), self.capacidad), dtype=np.float64, buffer=self.memoria_entrada.buf)
+        salida = np.ndarray((len(SALIDAS), self.capacidad), dtype=np.float64, buffer=self.memoria_salida.buf)
+        for i, nombre in enumerate(ENTRADAS):
+            entrada[i, :filas] = bloque.get(nombre, 0.0)
+
+        futuros = [
+            self.pool.submit(_calcular_fragmento, self.memoria_entrada.name, self.memoria_salida.name,
+                             self.capacidad, inicio, fin)
+            for inicio, fin in dividir_en_fragmentos(filas, self.procesos)
+        ]
+        # Se esperan en el orden de envío; cualquier error de un proceso se propaga aquí
+        for futuro in futuros:
+            futuro.result()
+
+        resultado = dict(bloque)
+        for i, nombre in enumerate(SALIDAS):
+            resultado[nombre] = salida[i, :filas].copy()
+        del entrada, salida
+        return resultado
+
+    def cerrar(self):
+        self.pool.shutdown()
+        self._liberar()
@@ -0,0 +1,180 @@
+import argparse
+import csv
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+# Punto de equilibrio en el tiempo: ¿en qué mes una línea de productos
+# recupera sus costos fijos acumulados? Los datos son matrices
+# (productos x periodos) —volumen pronosticado, precio, costo variable y costo
+# fijo de cada periodo— o escalares/vectores que se expanden por broadcasting,
+# así los cambios de precio y los programas de costos fijos entran como una
+# fila más.
+#
+# El resultado acumulado es cumsum(volumen * (precio - costo variable) - costo fijo)
+# sobre el eje de periodos; el primer cruce por cero de cada producto se busca
+# con argmax sobre la máscara "acumulado >= 0". Miles de productos x 120 meses
+# son una sola operación de arreglos.
+
+ResultadoPeriodos = namedtuple("ResultadoPeriodos", ["contribucion", "costo_fijo", "resultado", "periodo", "momento"])
+
+SIN_EQUILIBRIO = -1
+
+
+def programa(base, cambios, periodos):
+    """Valor por periodo que arranca en `base` y cambia en los periodos de `cambios` ({periodo: valor}).
+
+    `base` y los valores pueden ser escalares o vectores por producto; el
+    resultado tiene los periodos en el último eje.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    valores = np.empty(base.shape + (periodos,))
+    valores[...] = base[..., np.newaxis]
+    for periodo, valor in sorted(cambios.items()):
+        valores[..., periodo:] = np.asarray(valor, dtype=np.float64)[..., np.newaxis]
+    return valores
+
+
+def equilibrio_por_periodo(volumenes, precios, costos_variables, costos_fijos):
+    """Acumulados por periodo y primer periodo con resultado acumulado >= 0.
+
+    `periodo` es el índice (0 = primer periodo) o SIN_EQUILIBRIO; `momento` es el
+    tiempo del cruce en periodos suponiendo flujo uniforme dentro de cada
+    periodo (13.5 = a mitad del mes 14) o NaN si no se llega.
+    """
+    volumenes, precios, costos_variables, costos_fijos = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (volumenes, precios, costos_variables, costos_fijos)))
+
+    contribucion = np.cumsum(volumenes * (precios - costos_variables), axis=-1)
+    costo_fijo = np.cumsum(costos_fijos, axis=-1)
+    resultado = contribucion - costo_fijo
+
+    cubre = resultado >= 0
+    periodo = np.argmax(cubre, axis=-1)
+    alcanzado = np.take_along_axis(cubre, periodo[..., np.newaxis], axis=-1)[..., 0]
+    periodo = np.where(alcanzado, periodo, SIN_EQUILIBRIO)
+
+    # Interpolación dentro del periodo del cruce: de lo acumulado al inicio (0 antes del primero) a lo del cierre
+    indice = np.maximum(periodo, 0)[..., np.newaxis]
+    cierre = np.take_along_axis(resultado, indice, axis=-1)[..., 0]
+    inicio = np.where(indice[..., 0] > 0, np.take_along_axis(resultado, np.maximum(indice - 1, 0), axis=-1)[..., 0], 0.0)
+    cambio = cierre - inicio
+    with np.errstate(invalid="ignore", divide="ignore"):
+        fraccion = np.where(cambio > 0, -inicio / cambio, 0.0)
+    momento = np.where(alcanzado, periodo + np.clip(fraccion, 0.0, 1.0), np.nan)
+
+    return ResultadoPeriodos(contribucion, costo_fijo, resultado, periodo, momento)
+
+
+def fechas(periodo, inicio):
+    """Mes de cada periodo contando desde `inicio` ('AAAA-MM'); NaT donde no hay equilibrio."""
+    periodo = np.asarray(periodo)
+    meses = np.datetime64(inicio, "M") + np.maximum(periodo, 0).astype("timedelta64[M]")
+    return np.where(periodo == SIN_EQUILIBRIO, np.datetime64("NaT", "M"), meses)
+
+
+def leer_pronostico(ruta, delimitador=","):
+    """Lee un CSV largo (producto, periodo, volumen, precio, costo_variable, costo_fijo).
+
+    Devuelve (productos, volumenes, precios, costos_variables, costos_fijos) con
+    una fila por producto y una columna por periodo; los periodos sin dato
+    quedan en 0.
+    """
+    columnas = ["producto", "periodo", "volumen", "precio", "costo_variable", "costo_fijo"]
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.reader(archivo, delimiter=delimitador)
+        encabezado = [nombre.strip() for nombre in next(lector)]
+        faltantes = [c for c in columnas if c not in encabezado]
+        if faltantes:
+            raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+        indices = [encabezado.index(c) for c in columnas]
+        filas = [[fila[i] for i in indices] for fila in lector if fila]
+
+    datos = np.array(filas, dtype=str).reshape(-1, len(columnas))
+    productos, producto = np.unique(datos[:, 0], return_inverse=True)
+    periodo = datos[:, 1].astype(np.int64)
+    if periodo.size and periodo.min() < 0:
+        raise ValueError("Los periodos deben ser enteros >= 0")
+    forma = (len(productos), int(periodo.max()) + 1 if periodo.size else 0)
+    matrices = []
+    for j in range(2, len(columnas)):
+        matriz = np.zeros(forma)
+        matriz[producto, periodo] = datos[:, j].astype(np.float64)
+        matrices.append(matriz)
+    return (productos, *matrices)
+
+
+def graficar(root, producto, resultado, fila, inicio=None):
+    """Curvas acumuladas de un producto en la ventana de gráfica de siempre (grafica.VentanaGrafica)."""
+    from grafica import VentanaGrafica
+
+    # La fecha sale del periodo del cruce, igual que en el CSV: momento = 2.00 es el cierre del periodo 1
+    periodo = resultado.periodo[fila]
+
+    def texto(momento):
+        if not np.isfinite(momento):
+            return "Sin punto de equilibrio en el horizonte"
+        if inicio is None:
+            return f"Punto de Equilibrio: periodo {momento:.2f}"
+        return f"Punto de Equilibrio: {fechas(periodo, inicio)}"
+
+    ventana = VentanaGrafica(root, [
+        ("Contribución acumulada", dict(color='green')),
+        ("Costos fijos acumulados", dict(color='red')),
+        ("Resultado acumulado", dict(color='purple')),
+    ], f"Punto de Equilibrio en el tiempo: {producto}",
+        etiqueta_x="Periodo" if inicio is None else f"Mes (desde {inicio})", texto_pe=texto)
+
+    # El acumulado arranca en 0 antes del primer periodo
+    tiempo = np.arange(resultado.resultado.shape[-1] + 1)
+    curvas = [np.concatenate([[0.0], serie[fila]])
+              for serie in (resultado.contribucion, resultado.costo_fijo, resultado.resultado)]
+    ventana.mostrar(tiempo, curvas, resultado.momento[fila])
+    return ventana
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mes en que cada producto alcanza el punto de equilibrio.")
+    parser.add_argument("pronostico", help="CSV con producto, periodo, volumen, precio, costo_variable, costo_fijo")
+    parser.add_argument("--inicio", metavar="AAAA-MM", help="Mes del periodo 0, para dar fechas")
+    parser.add_argument("--delimitador", default=",", help="Separador de campos del CSV (p. ej. ';')")
+    parser.add_argument("--grafica", metavar="PRODUCTO", help="Mostrar las curvas acumuladas de un producto")
+    args = parser.parse_args(argv)
+
+    if len(args.delimitador) != 1:
+        parser.error("--delimitador debe ser un solo carácter")
+    if args.inicio:
+        try:
+            np.datetime64(args.inicio, "M")
+        except ValueError:
+            parser.error("--inicio debe tener la forma AAAA-MM")
+
+    productos, volumenes, precios, costos_variables, costos_fijos = leer_pronostico(args.pronostico, args.delimitador)
+    resultado = equilibrio_por_periodo(volumenes, precios, costos_variables, costos_fijos)
+
+    escritor = csv.writer(sys.stdout, lineterminator="\n")
+    escritor.writerow(["producto", "periodo_equilibrio", "momento"] + (["fecha"] if args.inicio else []))
+    meses = fechas(resultado.periodo, args.inicio) if args.inicio else None
+    for i, producto in enumerate(productos):
+        alcanzado = resultado.periodo[i] != SIN_EQUILIBRIO
+        fila = [producto, int(resultado.periodo[i]) if alcanzado else "", f"{resultado.momento[i]:.2f}" if alcanzado else ""]
+        if meses is not None:
+            fila.append(str(meses[i]) if alcanzado else "")
+        escritor.writerow(fila)
+
+    if args.grafica:
+        encontrados = np.flatnonzero(productos == args.grafica)
+        if not encontrados.size:
+            parser.error(f"Producto desconocido: {args.grafica}")
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        ventana = graficar(root, args.grafica, resultado, encontrados[0], args.inicio)
+        ventana.ventana.protocol("WM_DELETE_WINDOW", root.destroy)
+        root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+import argparse
+import csv
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from no_lineal import maximo_seccion_aurea
+from nucleo import punto_equilibrio
+from numeros import convertir_con_mascara
+
+# Precio que maximiza la utilidad (ventas - costos variables - costos fijos)
+# para miles de productos a la vez, según la curva de demanda de cada uno:
+#
+#   lineal        q = a - b p          p* = (a / b + cv) / 2
+#   elasticidad   q = q0 (p / p0)^-e   p* = cv e / (e - 1)        (e > 1)
+#   tabla         precios y volúmenes observados, demanda interpolada
+#                 linealmente entre ellos: en cada tramo la utilidad es una
+#                 parábola, así el óptimo de cada tramo tiene forma cerrada y
+#                 el de cada producto es el mejor de sus tramos.
+#   curva         cualquier demanda vectorizada: malla + sección áurea.
+#
+# Todo se calcula con arreglos (productos x tramos), sin un optimizador por
+# producto. Con el precio óptimo se informa además el punto de equilibrio y el
+# margen de seguridad (qué fracción del volumen esperado se puede perder antes
+# de caer en pérdida).
+
+ResultadoPrecio = namedtuple("ResultadoPrecio", ["precio", "volumen", "utilidad", "unidades_equilibrio",
+                                                 "margen_seguridad", "factible"])
+
+MUESTRAS = 64
+MODELOS = ("lineal", "elasticidad", "tabla")
+
+
+def _resultado(precio, volumen, costo_variable, costo_fijo, factible):
+    """Utilidad, punto de equilibrio y margen de seguridad al precio elegido; NaN donde no es factible."""
+    precio = np.where(factible, precio, np.nan)
+    volumen = np.where(factible, volumen, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        utilidad = volumen * (precio - costo_variable) - costo_fijo
+        unidades_equilibrio = np.asarray(punto_equilibrio(costo_fijo, precio - costo_variable), dtype=np.float64)
+        margen_seguridad = np.where(volumen > 0, (volumen - unidades_equilibrio) / volumen, np.nan)
+    unidades_equilibrio = np.where(factible, unidades_equilibrio, np.nan)
+    return ResultadoPrecio(precio, volumen, utilidad, unidades_equilibrio, margen_seguridad, factible)
+
+
+def optimizar_lineal(intercepto, pendiente, costo_variable, costo_fijo):
+    """Demanda q = intercepto - pendiente * precio (pendiente > 0).
+
+    No es factible si ni al costo variable hay demanda (intercepto / pendiente <= cv).
+    """
+    intercepto, pendiente, costo_variable, costo_fijo = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (intercepto, pendiente, costo_variable, costo_fijo)))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precio_maximo = intercepto / pendiente  # precio al que la demanda llega a cero
+        precio = 0.5 * (precio_maximo + costo_variable)
+        volumen = intercepto - pendiente * precio
+    factible = (pendiente > 0) & (precio_maximo > costo_variable) & np.isfinite(precio) & np.isfinite(costo_fijo)
+    return _resultado(precio, volumen, costo_variable, costo_fijo, factible)
+
+
+def optimizar_elasticidad(precio_referencia, volumen_referencia, elasticidad, costo_variable, costo_fijo):
+    """Demanda con elasticidad constante que pasa por (precio_referencia, volumen_referencia).
+
+    El óptimo es el margen de Lerner p* = cv * e / (e - 1); con e <= 1 o cv <= 0
+    la utilidad no tiene máximo finito y la fila no es factible.
+    """
+    p0, q0, elasticidad, costo_variable, costo_fijo = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (precio_referencia, volumen_referencia, elasticidad,
+                                                   costo_variable, costo_fijo)))
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        precio = costo_variable * elasticidad / (elasticidad - 1.0)
+        volumen = q0 * (precio / p0) ** -elasticidad
+    factible = ((elasticidad > 1) & (costo_variable > 0) & (p0 > 0) & (q0 > 0)
+                & np.isfinite(volumen) & np.isfinite(costo_fijo))
+    return _resultado(precio, volumen, costo_variable, costo_fijo, factible)
+
+
+def _ordenar_tabla(precios, volumenes):
+    """Ordena cada fila por precio; los NaN de relleno (filas de distinto largo) quedan al final."""
+    precios = np.atleast_2d(np.asarray(precios, dtype=np.float64))
+    volumenes = np.atleast_2d(np.asarray(volumenes, dtype=np.float64))
+    if precios.shape != volumenes.shape:
+        raise ValueError("Cada precio de la tabla necesita su volumen")
+    orden = np.argsort(precios, axis=1)
+    return np.take_along_axis(precios, orden, axis=1), np.take_along_axis(volumenes, orden, axis=1)
+
+
+def optimizar_tabla(precios, volumenes, costo_variable, costo_fijo):
+    """Demanda tabulada: una fila de precios y volúmenes observados por producto (relleno con NaN).
+
+    Entre dos observaciones la demanda es lineal y la utilidad una parábola
+    (p - cv) * (v0 + s (p - p0)), con su máximo en p = (s (p0 + cv) - v0) / (2 s).
+    Se evalúa ese vértice (recortado al tramo) y los extremos de cada tramo, y
+    se elige el mejor por producto. Solo se consideran precios dentro de lo
+    observado; hacen falta al menos dos observaciones.
+    """
+    precios, volumenes = _ordenar_tabla(precios, volumenes)
+    costo_variable = np.broadcast_to(np.asarray(costo_variable, dtype=np.float64), precios.shape[:1])
+    costo_fijo = np.broadcast_to(np.asarray(costo_fijo, dtype=np.float64), precios.shape[:1])
+    cv = costo_variable[:, np.newaxis]
+
+    p0, p1 = precios[:, :-1], precios[:, 1:]
+    v0, v1 = volumenes[:, :-1], volumenes[:, 1:]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pendiente = (v1 - v0) / (p1 - p0)
+        vertice = np.where(pendiente != 0, (pendiente * (p0 + cv) - v0) / (2 * pendiente), p0)
+        candidato = np.clip(vertice, p0, p1)
+        tramo_valido = np.isfinite(pendiente)  # NaN de relleno o precios repetidos
+
+        # Candidatos por tramo: vértice y extremos; volumen y contribución en cada uno
+        candidatos = np.stack([p0, candidato, p1])
+        demanda = np.stack([v0, v0 + pendiente * (candidato - p0), v1])
+        contribucion = (candidatos - cv) * demanda
+    contribucion = np.where(tramo_valido & (demanda >= 0), contribucion, -np.inf)
+
+    # El mejor candidato de todos los tramos de cada producto
+    plano = contribucion.transpose(1, 0, 2).reshape(len(precios), -1)
+    mejor = np.argmax(plano, axis=1)
+    filas = np.arange(len(precios))
+    precio = candidatos.transpose(1, 0, 2).reshape(len(precios), -1)[filas, mejor]
+    volumen = demanda.transpose(1, 0, 2).reshape(len(precios), -1)[filas, mejor]
+    factible = np.isfinite(plano[filas, mejor]) & (precio > costo_variable) & np.isfinite(costo_fijo)
+    return _resultado(precio, volumen, costo_variable, costo_fijo, factible)
+
+
+def optimizar_curva(demanda, precio_minimo, precio_maximo, costo_variable, costo_fijo, muestras=MUESTRAS):
+    """Demanda arbitraria demanda(precios) -> volúmenes, vectorizada por producto.
+
+    `demanda` recibe precios con forma (productos,) o (productos, muestras). Una
+    malla elige el mejor intervalo de cada producto y la sección áurea lo afina.
+    """
+    precio_minimo, precio_maximo, costo_variable, costo_fijo = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in (precio_minimo, precio_maximo, costo_variable,
+                                                                   costo_fijo)))
+    malla = precio_minimo[:, np.newaxis] + (precio_maximo - precio_minimo)[:, np.newaxis] * np.linspace(0, 1, muestras)
+    contribucion = (malla - costo_variable[:, np.newaxis]) * demanda(malla)
+    mejor = np.argmax(np.where(np.isnan(contribucion), -np.inf, contribucion), axis=1)
+    filas = np.arange(len(malla))
+    bajo = malla[filas, np.maximum(mejor - 1, 0)]
+    alto = malla[filas, np.minimum(mejor + 1, muestras - 1)]
+    precio, _ = maximo_seccion_aurea(lambda p: (p - costo_variable) * demanda(p), bajo, alto)
+    volumen = np.asarray(demanda(precio), dtype=np.float64)
+    factible = np.isfinite(volumen) & (volumen > 0) & (precio > costo_variable) & np.isfinite(costo_fijo)
+    return _resultado(precio, volumen, costo_variable, costo_fijo, factible)
+
+
+def _leer_csv(ruta, delimitador):
+    """(encabezado, filas no vacías, número de línea de cada fila en el archivo)."""
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        lector = csv.reader(archivo, delimiter=delimitador)
+        encabezado = [nombre.strip() for nombre in next(lector, [])]
+        filas, lineas = [], []
+        for fila in lector:
+            if fila:
+                filas.append(fila)
+                lineas.append(lector.line_num)
+        return encabezado, filas, lineas
+
+
+def _columnas(encabezado, filas, nombres, ruta):
+    faltantes = [c for c in nombres if c not in encabezado]
+    if faltantes:
+        raise ValueError(f"Faltan columnas en {ruta}: {', '.join(faltantes)}")
+    indices = [encabezado.index(c) for c in nombres]
+    # Las filas cortas se completan con celdas vacías y se informan junto con las celdas ilegibles
+    cortas = np.array([len(fila) <= max(indices) for fila in filas], dtype=bool)
+    datos = np.array([[fila[i] if i < len(fila) else "" for i in indices] for fila in filas], dtype=str)
+    return datos.reshape(-1, len(nombres)), cortas
+
+
+def _numeros(datos, cortas, nombres, lineas, ruta, formato):
+    """Columnas de texto a float64 con numeros.py; ValueError con la línea del primer problema."""
+    valores = np.empty(datos.shape, dtype=np.float64)
+    primera = (int(np.flatnonzero(cortas)[0]), None) if cortas.any() else None
+    for j in range(datos.shape[1]):
+        valores[:, j], ilegibles = convertir_con_mascara(datos[:, j], formato)
+        if ilegibles.any():
+            i = int(np.flatnonzero(ilegibles)[0])
+            if primera is None or i < primera[0]:
+                primera = (i, j)
+    if primera is None:
+        return valores
+    i, j = primera
+    if j is None:
+        raise ValueError(f"{ruta}, línea {lineas[i]}: faltan columnas")
+    raise ValueError(f"{ruta}, línea {lineas[i]}: valor numérico inválido en la columna {nombres[j]}: "
+                     f"{str(datos[i, j])!r}")
+
+
+def leer_demanda(ruta, modelo, delimitador=",", formato="gt"):
+    """Lee el CSV de un modelo de demanda; devuelve (productos, ResultadoPrecio).
+
+    Los montos se leen con numeros.py según `formato` (ver numeros.FORMATOS).
+    Lanza ValueError si faltan columnas o una celda no es un número.
+    """
+    encabezado, filas, lineas = _leer_csv(ruta, delimitador)
+    if modelo == "lineal":
+        nombres = ["producto", "intercepto", "pendiente", "costo_variable", "costo_fijo"]
+    elif modelo == "elasticidad":
+        nombres = ["producto", "precio", "volumen", "elasticidad", "costo_variable", "costo_fijo"]
+    else:
+        nombres = ["producto", "precio", "volumen", "costo_variable", "costo_fijo"]
+    datos, cortas = _columnas(encabezado, filas, nombres, ruta)
+    valores = _numeros(datos[:, 1:], cortas, nombres[1:], lineas, ruta, formato)
+    if modelo == "lineal":
+        return datos[:, 0], optimizar_lineal(*valores.T)
+    if modelo == "elasticidad":
+        return datos[:, 0], optimizar_elasticidad(*valores.T)
+
+    # Tabla en formato largo: una fila por observación; los costos se toman de la primera de cada producto
+    productos, indice, producto = np.unique(datos[:, 0], return_index=True, return_inverse=True)
+    posicion = np.zeros(len(producto), dtype=np.intp)
+    orden = np.argsort(producto, kind="stable")
+    conteo = np.bincount(producto, minlength=len(productos))
+    posicion[orden] = np.arange(len(producto)) - np.repeat(np.cumsum(conteo) - conteo, conteo)
+    precios = np.full((len(productos), max(conteo.max(initial=0), 2)), np.nan)
+    volumenes = np.full_like(precios, np.nan)
+    precios[producto, posicion] = valores[:, 0]
+    volumenes[producto, posicion] = valores[:, 1]
+    return productos, optimizar_tabla(precios, volumenes, valores[indice, 2], valores[indice, 3])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precio que maximiza la utilidad por producto.")
+    parser.add_argument("demanda", help="CSV con la curva de demanda y los costos de cada producto")
+    parser.add_argument("--modelo", choices=MODELOS, default="lineal",
+                        help="lineal: producto, intercepto, pendiente, costo_variable, costo_fijo; "
+                             "elasticidad: producto, precio, volumen, elasticidad, costo_variable, costo_fijo; "
+                             "tabla: una fila por observación con producto, precio, volumen, costo_variable, costo_fijo")
+    parser.add_argument("--delimitador", default=",", help="Separador de campos del CSV (p. ej. ';')")
+    parser.add_argument("--formato-numeros", choices=["gt", "es", "auto"], default="gt",
+                        help="gt = 1,234.50; es = 1.234,50; auto = por celda. Acepta el prefijo Q y paréntesis "
+                             "para negativos")
+    args = parser.parse_args(argv)
+
+    if len(args.delimitador) != 1:
+        parser.error("--delimitador debe ser un solo carácter")
+
+    try:
+        productos, resultado = leer_demanda(args.demanda, args.modelo, args.delimitador, args.formato_numeros)
+    except ValueError as e:
+        parser.error(str(e))
+    escritor = csv.writer(sys.stdout, lineterminator="\n")
+    escritor.writerow(["producto", "precio_optimo", "volumen", "utilidad", "unidades_equilibrio", "margen_seguridad"])
+    for i, producto in enumerate(productos):
+        if resultado.factible[i]:
+            escritor.writerow([producto] + [f"{columna[i]:.10g}" for columna in resultado[:5]])
+        else:
+            escritor.writerow([producto, "", "", "", "", ""])
+    infactibles = int(np.count_nonzero(~resultado.factible))
+    if infactibles:
+        print(f"{infactibles} productos sin precio óptimo finito (demanda o costos no válidos)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
-import matplotlib.pyplot as plt
+from grafica import VentanaGrafica
+from centavos import formatear_quetzales
+from validacion import validar, mensaje
 
 class BreakEvenApp:
     def __init__(self, root):
@@ -18,6 +20,14 @@ class BreakEvenApp:
         # Crear tabla resumen
         self.create_summary_table()
 
+        # Gráfica persistente (se crea al primer clic en "Gráfica")
+        self.ventana_grafica = VentanaGrafica(self.root, [
+            ("Ingresos Totales", dict(color='green')),
+            ("Costos Variables", dict(color='orange')),
+            ("Costos Fijos", dict(color='blue', linestyle='--')),
+            ("Utilidad o Pérdida", dict(color='red')),
+        ])
+
     def create_input_fields(self):
         ttk.Label(self.root, text="Costos Fijos (Q):").grid(column=0, row=0, padx=10, pady=5)
         self.fixed_costs = tk.DoubleVar()
@@ -36,6 +46,10 @@ class BreakEvenApp:
         ttk.Button(self.root, text="Gráfica", command=self.plot_breakeven).grid(column=1, row=3, pady=10)
         ttk.Button(self.root, text="Borrar Datos", command=self.clear_data).grid(column=2, row=3, pady=10)
 
+        # Errores de validación junto al formulario, sin ventanas modales
+        self.status = tk.StringVar()
+        ttk.Label(self.root, textvariable=self.status, foreground="red").grid(column=0, row=5, columnspan=3)
+
     def create_summary_table(self):
         # Crear tabla tipo Excel (6x6)
         self.table_frame = ttk.Frame(self.root)
@@ -59,14 +73,23 @@ class BreakEvenApp:
 
         self.tree.pack()
 
-    def calculate_breakeven(self):
-        fixed_costs = self.fixed_costs.get()
-        sale_price = self.sale_price.get()
-        variable_cost = self.variable_cost.get()
+    def read_inputs(self):
+        """(costos fijos, precio, costo variable) si cumplen las reglas de validacion.py; si no, None"""
+        try:
+            valores = (self.fixed_costs.get(), self.sale_price.get(), self.variable_cost.get())
+        except tk.TclError:
+            self.status.set("Por favor, ingresa valores numéricos.")
+            return None
+        fixed_costs, sale_price, variable_cost = valores
+        self.status.set(mensaje(validar(sale_price, fixed_costs, variable_cost).codigos))
+        return None if self.status.get() else valores
 
-        if sale_price <= variable_cost:
+    def calculate_breakeven(self):
+        valores = self.read_inputs()
+        if valores is None:
             self.update_summary_table(0, 0, 0, 0, 0, 0)
             return
+        fixed_costs, sale_price, variable_cost = valores
 
         # Cálculo del margen de contribución
         margin_per_unit = sale_price - variable_cost
@@ -87,21 +110,16 @@ class BreakEvenApp:
         self.update_summary_table(total_revenue, total_variable_costs, margin_per_unit, fixed_costs, breakeven_units, utility_loss)
 
     def update_summary_table(self, ventas, costos_variables, margen_contribucion, costos_fijos, punto_equilibrio, utilidad_perdida):
-        # Actualizar los valores en la tabla
-        self.tree.set(self.tree.get_children()[0], column='Valor', value=f"{ventas:.2f}")
-        self.tree.set(self.tree.get_children()[1], column='Valor', value=f"{costos_variables:.2f}")
-        self.tree.set(self.tree.get_children()[2], column='Valor', value=f"{margen_contribucion:.2f}")
-        self.tree.set(self.tree.get_children()[3], column='Valor', value=f"{costos_fijos:.2f}")
-        self.tree.set(self.tree.get_children()[4], column='Valor', value=f"{punto_equilibrio:.2f}")
-        self.tree.set(self.tree.get_children()[5], column='Valor', value=f"{utilidad_perdida:.2f}")
+        # Actualizar los valores en la tabla (redondeo al centavo entero: nunca "-0.00")
+        valores = formatear_quetzales([ventas, costos_variables, margen_contribucion, costos_fijos, punto_equilibrio, utilidad_perdida])
+        for item, valor in zip(self.tree.get_children(), valores):
+            self.tree.set(item, column='Valor', value=valor)
 
     def plot_breakeven(self):
-        fixed_costs = self.fixed_costs.get()
-        sale_price = self.sale_price.get()
-        variable_cost = self.variable_cost.get()
-
-        if sale_price <= variable_cost:
+        valores = self.read_inputs()
+        if valores is None:
             return
+        fixed_costs, sale_price, variable_cost = valores
 
         # Cálculo del margen de contribución
         margin_per_unit = sale_price - variable_cost
@@ -125,24 +143,14 @@ class BreakEvenApp:
         profit_loss = revenue - (variable_costs + fixed_costs)
 
         # Gráfica del punto de equilibrio
-        plt.figure(figsize=(10, 6))
-        plt.plot(units, revenue, label='Ingresos Totales', color='green')
-        plt.plot(units, variable_costs, label='Costos Variables', color='orange')
-        plt.plot(units, fixed_costs_line, label='Costos Fijos', color='blue', linestyle='--')
-        plt.plot(units, profit_loss, label='Utilidad o Pérdida', color='red')
-        plt.axvline(x=breakeven_units, color='black', linestyle='--', label='Punto de Equilibrio')
-        plt.title('Gráfica del Punto de Equilibrio')
-        plt.xlabel('Unidades')
-        plt.ylabel('Quetzales')
-        plt.legend()
-        plt.grid()
-        plt.show()
+        self.ventana_grafica.mostrar(units, (revenue, variable_costs, fixed_costs_line, profit_loss), breakeven_units)
 
     def clear_data(self):
         # Borrar entradas y restablecer tabla
         self.fixed_costs.set(0)
         self.sale_price.set(0)
         self.variable_cost.set(0)
+        self.status.set("")
         self.update_summary_table(0, 0, 0, 0, 0, 0)
 
 if __name__ == "__main__":
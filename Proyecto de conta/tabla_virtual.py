@@ -0,0 +1,96 @@
+from tkinter import ttk
+
+import numpy as np
+
+from nucleo import contar_volumenes
+
+# Tabla virtual para programaciones largas (p. ej. 0 a 10,000,000 unidades).
+# El Treeview tiene siempre el mismo número de filas: al desplazarse solo se
+# calculan las unidades de la ventana visible y se cambian los valores de las
+# filas existentes, sin destruir ni volver a crear widgets.
+
+
+class TablaProgramacion:
+    def __init__(self, master, columnas, filas_visibles=10):
+        """columnas: lista de (identificador, encabezado, ancho)."""
+        self.filas_visibles = filas_visibles
+        ids = [c[0] for c in columnas]
+
+        self.tree = ttk.Treeview(master, columns=ids, show='headings', height=filas_visibles)
+        for identificador, encabezado, ancho in columnas:
+            self.tree.heading(identificador, text=encabezado)
+            self.tree.column(identificador, width=ancho)
+
+        self.scrollbar = ttk.Scrollbar(master, orient="vertical", command=self._desplazar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        # Filas fijas que se reutilizan en cada desplazamiento
+        self.iids = [self.tree.insert('', 'end', values=()) for _ in range(filas_visibles)]
+        self.valores = [None] * filas_visibles
+
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(evento, self._rueda)
+
+        self.inicio = 0.0
+        self.paso = 1.0
+        self.total = 0
+        self.primera = 0
+        self.generar_filas = None
+
+    def configurar(self, inicio, fin, paso, generar_filas):
+        """Define el rango de unidades y la función que convierte un arreglo de unidades en filas.
+
+        Las reglas del rango son las de nucleo.contar_volumenes (ValueError si no es válido).
+        """
+        self.total = contar_volumenes(inicio, fin, paso)
+        self.inicio = inicio
+        self.paso = paso
+        self.generar_filas = generar_filas
+        self.mostrar(self.primera if self.primera < self.total else 0)
+
+    def refrescar(self):
+        """Vuelve a calcular la ventana visible (por ejemplo, tras cambiar los datos)."""
+        if self.generar_filas is not None:
+            self.mostrar(self.primera)
+
+    def limpiar(self):
+        self.total = 0
+        self.primera = 0
+        self.generar_filas = None
+        self._pintar([])
+        self.scrollbar.set(0, 1)
+
+    def mostrar(self, primera):
+        """Muestra las filas a partir del índice `primera`."""
+        maxima = max(0, self.total - self.filas_visibles)
+        self.primera = int(min(max(primera, 0), maxima))
+        ultima = min(self.primera + self.filas_visibles, self.total)
+
+        unidades = self.inicio + self.paso * np.arange(self.primera, ultima, dtype=np.float64)
+        self._pintar(self.generar_filas(unidades) if len(unidades) else [])
+
+        if self.total:
+            self.scrollbar.set(self.primera / self.total, ultima / self.total)
+
+    def _pintar(self, filas):
+        # Solo se tocan las celdas cuyo contenido cambió
+        for i, iid in enumerate(self.iids):
+            fila = tuple(filas[i]) if i < len(filas) else ()
+            if fila != self.valores[i]:
+                self.tree.item(iid, values=fila)
+                self.valores[i] = fila
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        if accion == "moveto":
+            self.mostrar(int(float(cantidad) * self.total))
+        elif accion == "scroll":
+            salto = self.filas_visibles if unidad == "pages" else 1
+            self.mostrar(self.primera + int(cantidad) * salto)
+
+    def _rueda(self, evento):
+        if evento.num == 4 or getattr(evento, "delta", 0) > 0:
+            self.mostrar(self.primera - 3)
+        else:
+            self.mostrar(self.primera + 3)
+        return "break"
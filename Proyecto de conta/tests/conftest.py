@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Los módulos del proyecto están sueltos en la carpeta superior (no es un paquete)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,25 @@
+import json
+
+import calculadora
+
+
+def test_arranque_rapido_y_sin_modulos_pesados():
+    # Misma verificación que `python calculadora.py --verificar-arranque`, en un proceso nuevo
+    segundos, errores = calculadora.verificar_arranque()
+    assert errores == [], f"{errores} ({segundos:.3f} s)"
+
+
+def test_calcular_escenario():
+    resultado = calculadora.calcular({"precio": 50, "costo_fijo": 200000, "costo_variable": 30, "unidades": 12000})
+    assert resultado == {"margen": 20.0, "unidades_equilibrio": 10000.0, "ventas_equilibrio": 500000.0,
+                         "utilidad": 40000.0}
+
+
+def test_sin_equilibrio_es_null(capsys):
+    assert calculadora.main(['{"precio": 30, "costo_fijo": 1000, "costo_variable": 30}']) == 0
+    assert json.loads(capsys.readouterr().out)["unidades_equilibrio"] is None
+
+
+def test_campo_faltante(capsys):
+    assert calculadora.main(['{"precio": 30}']) == 2
+    assert "costo_fijo" in json.loads(capsys.readouterr().out)["error"]
@@ -0,0 +1,86 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from centavos import (SIN_MONTO, a_centavos, centavos_representables, dividir, formatear_centavos,
+                      formatear_quetzales, punto_equilibrio_centavos)
+
+MAXIMO = np.iinfo(np.int64).max
+MINIMO = np.iinfo(np.int64).min
+
+
+def redondear(fraccion, redondeo):
+    """Redondeo de referencia con enteros de Python (sin límite)."""
+    piso = fraccion.numerator // fraccion.denominator
+    resto = fraccion - piso
+    if redondeo == "abajo":
+        return piso
+    if redondeo == "arriba":
+        return piso + (resto > 0)
+    if redondeo == "mitad_arriba":
+        return piso + (resto >= Fraction(1, 2))
+    return piso + (resto > Fraction(1, 2) or (resto == Fraction(1, 2) and piso % 2 == 1))
+
+
+@pytest.mark.parametrize("redondeo", ["arriba", "abajo", "mitad_arriba", "mitad_par"])
+def test_dividir_contra_fracciones(redondeo):
+    rng = np.random.default_rng(0)
+    numeradores = np.concatenate([rng.integers(-1000, 1000, 500), [5, 15, -5, -15, 7, MAXIMO, MINIMO]])
+    denominadores = np.concatenate([rng.integers(1, 50, 500), [2, 10, 2, 10, 7, 3, 3]])
+    cocientes = dividir(numeradores, denominadores, redondeo)
+    esperados = [redondear(Fraction(int(n), int(d)), redondeo) for n, d in zip(numeradores, denominadores)]
+    assert cocientes.tolist() == esperados
+
+
+def test_redondeo_desconocido():
+    with pytest.raises(ValueError):
+        dividir(1, 2, "cercano")
+
+
+def test_equilibrio_exacto():
+    # 1000 / 20.30 = 49.26...: "arriba" pide 50 unidades para no perder
+    r = punto_equilibrio_centavos(a_centavos(50.30), a_centavos(1000.0), a_centavos(30.0), 80)
+    assert r.margen == 2030 and r.unidades == 50 and r.factible and r.exacto
+    assert r.ventas == redondear(Fraction(100000 * 5030, 2030), "mitad_par")
+    assert r.utilidad == 80 * 2030 - 100000
+
+
+def test_sin_margen():
+    r = punto_equilibrio_centavos([3000, 2000], 100000, 3000, 10)
+    assert r.factible.tolist() == [False, False]
+    assert r.unidades.tolist() == [0, 0] and r.ventas.tolist() == [0, 0]
+    assert r.exacto.all()
+
+
+@pytest.mark.parametrize("precio, costo_fijo, costo_variable, unidades", [
+    (MAXIMO, 100, MINIMO + 1, 0),        # el margen desborda
+    (MAXIMO // 2, MAXIMO // 3, 1, 0),    # costo_fijo * precio desborda en las ventas
+    (100, 0, 1, MAXIMO // 2),            # unidades * margen desborda
+    (100, MINIMO + 1, 1, 1),             # la utilidad desborda al restar
+])
+def test_desbordes_marcados(precio, costo_fijo, costo_variable, unidades):
+    r = punto_equilibrio_centavos([precio, 200], [costo_fijo, 100], [costo_variable, 100], [unidades, 1])
+    assert r.exacto.tolist() == [False, True]
+
+
+def test_ventas_grandes_sin_desborde_intermedio():
+    # costo_fijo * precio no cabe en int64, pero el resultado sí
+    precio, costo_fijo, costo_variable = 10**12, 10**12, 10**12 - 10**6
+    r = punto_equilibrio_centavos(precio, costo_fijo, costo_variable)
+    assert r.exacto
+    assert r.ventas == redondear(Fraction(costo_fijo * precio, precio - costo_variable), "mitad_par")
+
+
+def test_centavos_representables():
+    centavos, caben = centavos_representables([1.005, -2.5, np.nan, np.inf, 1e17, 9e16])
+    assert caben.tolist() == [True, True, False, False, False, True]
+    assert centavos[:3].tolist() == [100, -250, 0]
+    with pytest.raises(ValueError):
+        a_centavos([1.0, np.inf])
+
+
+def test_formatear():
+    assert formatear_centavos([-1, 0, 5, 123456, -100]).tolist() == ["-0.01", "0.00", "0.05", "1234.56", "-1.00"]
+    # -0.001 redondea a 0 centavos: nunca "-0.00"
+    assert formatear_quetzales([-0.001, 12.5, np.nan, np.inf, 1e18]).tolist() == ["0.00", "12.50"] + [SIN_MONTO] * 3
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from escalonados import ENTRA_A_UTILIDAD, SALE_DE_UTILIDAD, CostosEscalonados
+
+
+def modelo():
+    # Tramos (0, 1000], (1000, 2000], (2000, inf) con margen 10: cero en 800, 1500 y 2500
+    return CostosEscalonados([2000, np.inf, 1000], [15000, 25000, 8000], precio=25.0, costo_variable=15.0)
+
+
+def test_tramos_ordenados_y_costo_fijo():
+    m = modelo()
+    assert m.capacidades.tolist() == [1000, 2000, np.inf]
+    assert m.tramo([0, 1000, 1000.5, 2000, 1e9]).tolist() == [0, 0, 1, 1, 2]
+    np.testing.assert_array_equal(m.utilidad([800, 1000, 1001, 2500]), [0.0, 2000.0, -4990.0, 0.0])
+
+
+def test_puntos_equilibrio():
+    m = modelo()
+    np.testing.assert_array_equal(m.puntos.unidades, [800, 1000, 1500, 2000, 2500])
+    assert m.puntos.direccion.tolist() == [ENTRA_A_UTILIDAD, SALE_DE_UTILIDAD, ENTRA_A_UTILIDAD,
+                                           SALE_DE_UTILIDAD, ENTRA_A_UTILIDAD]
+    dentro = m.puntos_equilibrio(900, 2000)
+    np.testing.assert_array_equal(dentro.unidades, [1000, 1500, 2000])
+
+
+def test_puntos_coinciden_con_fuerza_bruta():
+    generador = np.random.default_rng(3)
+    for _ in range(20):
+        capacidades = np.cumsum(generador.integers(50, 500, 8)).astype(np.float64)
+        m = CostosEscalonados(capacidades, generador.integers(0, 5000, 8), 12.0, 7.0)
+        # Malla en medias unidades: umbrales y ceros (cf / 5) nunca caen sobre ella
+        malla = np.arange(0.5, capacidades[-1], 1.0)
+        rentable = m.rentable(malla)
+        cambios = np.flatnonzero(rentable[1:] != rentable[:-1])
+        encontrados = m.puntos_equilibrio(malla[0], malla[-1])
+        assert len(encontrados.unidades) == len(cambios)
+        assert np.all((malla[cambios] < encontrados.unidades) & (encontrados.unidades <= malla[cambios + 1]))
+        np.testing.assert_array_equal(encontrados.direccion, np.where(rentable[cambios + 1], 1, -1))
+
+
+def test_datos_invalidos():
+    with pytest.raises(ValueError):
+        CostosEscalonados([1000, 1000], [1, 2], 10.0, 5.0)
+    with pytest.raises(ValueError):
+        CostosEscalonados([1000], [1, 2], 10.0, 5.0)
+    with pytest.raises(ValueError):
+        CostosEscalonados([-5], [1], 10.0, 5.0)
@@ -0,0 +1,110 @@
+import csv
+
+import numpy as np
+import pytest
+
+import lotes
+from validacion import FILA_INCOMPLETA, FUERA_DE_CENTAVOS, NO_FINITO, PRECIO_NO_POSITIVO
+
+
+def escribir_csv(ruta, filas, encabezado="precio,costo_fijo,costo_variable,unidades"):
+    ruta.write_text("\n".join([encabezado] + filas) + "\n", encoding="utf-8")
+    return ruta
+
+
+def leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return list(csv.DictReader(archivo))
+
+
+@pytest.mark.parametrize("tamano_bloque", [1, 2, 100])
+def test_rechazos_por_regla(tmp_path, tamano_bloque):
+    entrada = escribir_csv(tmp_path / "entrada.csv", [
+        "50,1000,30,80",
+        "50,1000",          # fila incompleta
+        "nan,1000,30,80",
+        "abc,1000,30,80",   # celda ilegible: cuenta como no finito
+        "-5,1000,30,80",
+        "60,500,20,10",
+    ])
+    filas, conteo = lotes.procesar(entrada, tmp_path / "salida.csv", tamano_bloque,
+                                   rechazos=tmp_path / "rechazos.csv")
+    assert filas == 2
+    assert conteo["fila_incompleta"] == 1
+    assert conteo["no_finito"] == 3  # la fila incompleta también tiene celdas vacías
+    assert conteo["precio_no_positivo"] == 1
+    rechazos = leer_csv(tmp_path / "rechazos.csv")
+    codigos = [int(fila[lotes.COLUMNA_CODIGO]) for fila in rechazos]
+    assert codigos[0] == FILA_INCOMPLETA | NO_FINITO
+    assert codigos[1:3] == [NO_FINITO, NO_FINITO]
+    assert codigos[3] & PRECIO_NO_POSITIVO
+    salida = leer_csv(tmp_path / "salida.csv")
+    assert [float(fila["unidades_equilibrio"]) for fila in salida] == [50.0, 12.5]
+
+
+@pytest.mark.parametrize("filas, linea, texto", [
+    (["50,1000,30,80", "", "50,1000"], 4, "faltan columnas"),
+    (["50,1000,30,80", "# comentario", "50,x,30,80"], 4, "costo_fijo"),
+    (["50,1000", "50,x,30,80"], 2, "faltan columnas"),
+])
+def test_errores_con_numero_de_linea(tmp_path, filas, linea, texto):
+    entrada = escribir_csv(tmp_path / "entrada.csv", filas)
+    with pytest.raises(ValueError, match=f"Línea {linea}: .*{texto}"):
+        lotes.procesar(entrada, tmp_path / "salida.csv", tamano_bloque=2)
+
+
+def test_formato_de_hoja_de_calculo(tmp_path):
+    entrada = escribir_csv(tmp_path / "entrada.csv", ['"Q 1.250,50";"Q 10.000";"(2,5)";100'],
+                           encabezado="precio;costo_fijo;costo_variable;unidades")
+    lotes.procesar(entrada, tmp_path / "salida.csv", formato="es", delimitador=";")
+    fila = leer_csv(tmp_path / "salida.csv")[0]
+    assert float(fila["precio"]) == 1250.5
+    assert float(fila["costo_variable"]) == -2.5
+
+
+def test_centavos_factible_y_fuera_de_rango(tmp_path):
+    entrada = escribir_csv(tmp_path / "entrada.csv", [
+        "50,1000,30,80",
+        "30,1000,30,80",   # margen cero: sin equilibrio
+        "1e20,1000,30,1",  # no cabe en centavos int64
+    ])
+    with pytest.raises(ValueError, match="centavos"):
+        lotes.procesar(entrada, tmp_path / "salida.csv", redondeo="arriba")
+
+    filas, conteo = lotes.procesar(entrada, tmp_path / "salida.csv", redondeo="arriba",
+                                   rechazos=tmp_path / "rechazos.csv")
+    assert filas == 1 and conteo["precio_no_mayor_que_costo"] == 1
+    # Sin --rechazos la fila sin margen se calcula y queda como no factible
+    entrada = escribir_csv(tmp_path / "entrada.csv", ["50,1000,30,80", "30,1000,30,80"])
+    lotes.procesar(entrada, tmp_path / "salida.csv", redondeo="arriba")
+    salida = leer_csv(tmp_path / "salida.csv")
+    assert [fila["factible"] for fila in salida] == ["1", "0"]
+    assert salida[0]["unidades_equilibrio"] == "50" and salida[0]["ventas_equilibrio_centavos"] == "250000"
+    assert salida[1]["unidades_equilibrio"] == "0"
+
+
+def test_centavos_rechaza_montos_enormes(tmp_path):
+    entrada = escribir_csv(tmp_path / "entrada.csv", ["50,1000,30,80", "1e20,1000,30,1"])
+    filas, conteo = lotes.procesar(entrada, tmp_path / "salida.csv", redondeo="arriba",
+                                   rechazos=tmp_path / "rechazos.csv")
+    assert filas == 1 and conteo["fuera_de_centavos"] == 1
+    rechazo = leer_csv(tmp_path / "rechazos.csv")[0]
+    assert int(rechazo[lotes.COLUMNA_CODIGO]) == FUERA_DE_CENTAVOS
+
+
+def test_main_informa_la_linea(tmp_path, capsys):
+    entrada = escribir_csv(tmp_path / "entrada.csv", ["50,1000,30,80", "50,1000,30"])
+    with pytest.raises(SystemExit) as salida:
+        lotes.main([str(entrada), str(tmp_path / "salida.csv")])
+    assert salida.value.code == 2
+    assert "Línea 3" in capsys.readouterr().err
+
+
+def test_bloques_no_cambian_la_salida(tmp_path):
+    rng = np.random.default_rng(5)
+    filas = [f"{p:.17g},{cf:.17g},{cv:.17g},{u}" for p, cf, cv, u in
+             zip(rng.uniform(1, 90, 500), rng.uniform(0, 1e4, 500), rng.uniform(0, 60, 500), rng.integers(0, 500, 500))]
+    entrada = escribir_csv(tmp_path / "entrada.csv", filas)
+    lotes.procesar(entrada, tmp_path / "a.csv", tamano_bloque=500)
+    lotes.procesar(entrada, tmp_path / "b.csv", tamano_bloque=37)
+    assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
@@ -0,0 +1,45 @@
+import numpy as np
+
+from metas import (COSTO_VARIABLE_INFACTIBLE, UNIDADES_INFACTIBLES, biseccion_vectorizada, buscar_objetivo,
+                   resolver_metas)
+from nucleo import calcular_utilidad
+
+PRECIOS = np.array([50.0, 30.0, 50.0, 80.0])
+COSTOS_FIJOS = np.array([200000.0, 1000.0, 0.0, 5000.0])
+COSTOS_VARIABLES = np.array([30.0, 30.0, 30.0, 20.0])
+
+
+def test_forma_cerrada():
+    r = resolver_metas(10000.0, PRECIOS, COSTOS_FIJOS, COSTOS_VARIABLES, 1000.0)
+    np.testing.assert_allclose(r.unidades, [10500.0, np.nan, 500.0, 250.0])
+    np.testing.assert_allclose(r.precio_minimo, [240.0, 41.0, 40.0, 35.0])
+    np.testing.assert_allclose(r.costo_variable_maximo, [np.nan, 19.0, 40.0, 65.0])
+    assert r.infactibles.tolist() == [COSTO_VARIABLE_INFACTIBLE, UNIDADES_INFACTIBLES, 0, 0]
+
+
+def test_biseccion_coincide_con_forma_cerrada():
+    cerrada = resolver_metas(10000.0, PRECIOS, COSTOS_FIJOS, COSTOS_VARIABLES, 1000.0)
+    biseccion = resolver_metas(10000.0, PRECIOS, COSTOS_FIJOS, COSTOS_VARIABLES, 1000.0, funcion=calcular_utilidad)
+    for campo in ("unidades", "precio_minimo", "costo_variable_maximo"):
+        np.testing.assert_allclose(getattr(biseccion, campo), getattr(cerrada, campo), rtol=1e-8)
+    assert biseccion.infactibles.tolist() == cerrada.infactibles.tolist()
+
+
+def test_meta_ya_cumplida():
+    # Con meta <= -costo fijo no hace falta vender, y cualquier precio o costo variable sirve
+    r = resolver_metas(-2000.0, 50.0, 1000.0, 30.0, 0.0)
+    assert r.unidades == 0.0 and r.precio_minimo == 0.0 and r.costo_variable_maximo == np.inf
+    r = resolver_metas(-2000.0, 50.0, 1000.0, 30.0, 0.0, funcion=calcular_utilidad)
+    assert r.unidades == 0.0 and r.precio_minimo == 0.0 and r.costo_variable_maximo == np.inf
+
+
+def test_biseccion_vectorizada():
+    objetivos = np.array([2.0, 9.0, 50.0])
+    raices, factibles = biseccion_vectorizada(lambda x: x * x - objetivos, 0.0, 5.0)
+    np.testing.assert_allclose(raices[:2], np.sqrt(objetivos[:2]), rtol=1e-9)
+    assert factibles.tolist() == [True, True, False] and np.isnan(raices[2])
+
+
+def test_buscar_objetivo_raiz_en_extremo():
+    valores, factibles = buscar_objetivo(lambda x: 2 * x, np.array([0.0, 10.0]), 0.0, 5.0)
+    assert valores.tolist() == [0.0, 5.0] and factibles.all()
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import mezcla
+from mezcla import MezclaVentas
+
+
+def sumas(m):
+    return m.suma_pesos, m.suma_margen, m.suma_ventas
+
+
+def contar_recalculos(monkeypatch):
+    """Envuelve MezclaVentas.recalcular y devuelve la lista donde se anota cada llamada."""
+    llamadas = []
+    original = MezclaVentas.recalcular
+
+    def recalcular(self):
+        llamadas.append(self)
+        original(self)
+
+    monkeypatch.setattr(MezclaVentas, "recalcular", recalcular)
+    return llamadas
+
+
+def test_actualizar_coincide_con_recalcular():
+    rng = np.random.default_rng(0)
+    n = 200
+    m = MezclaVentas(rng.uniform(10, 90, n), rng.uniform(5, 40, n), rng.uniform(0, 3, n), 50_000.0)
+    for _ in range(2_000):
+        m.actualizar(int(rng.integers(n)), precio=rng.uniform(10, 90), costo_variable=rng.uniform(5, 40),
+                     peso=rng.uniform(0, 3))
+    incremental = sumas(m)
+    m.recalcular()
+    np.testing.assert_allclose(incremental, sumas(m), rtol=1e-10)
+    np.testing.assert_allclose(m.unidades_por_producto().sum(), m.punto_equilibrio(), rtol=1e-12)
+
+
+def test_ejemplo_dos_productos():
+    m = MezclaVentas([50.0, 30.0], [30.0, 20.0], [3, 1], 1000.0)
+    assert m.margen_ponderado() == pytest.approx(17.5)
+    m.actualizar(1, peso=3)
+    assert m.margen_ponderado() == pytest.approx(15.0)
+    np.testing.assert_allclose(m.unidades_por_producto(), [1000 / 15 / 2] * 2)
+    m.actualizar(0, precio=20.0)
+    m.actualizar(1, precio=10.0)
+    assert m.punto_equilibrio() == float("inf")
+
+
+def test_quitar_todo_el_peso_recalcula(monkeypatch):
+    m = MezclaVentas([50.0, 30.0], [30.0, 20.0], [0.1, 0.2], 1000.0)
+    llamadas = contar_recalculos(monkeypatch)
+    m.actualizar(0, peso=0.0)
+    m.actualizar(1, peso=0.0)
+    assert llamadas  # 0.1 + 0.2 - 0.1 - 0.2 no da 0 exacto sin recalcular
+    assert sumas(m) == (0.0, 0.0, 0.0)
+    assert np.isnan(m.margen_ponderado()) and np.isnan(m.unidades_producto(0))
+
+
+def test_mezcla_vacia_no_recalcula(monkeypatch):
+    m = MezclaVentas(np.full(1_000, 50.0), np.full(1_000, 30.0), np.zeros(1_000), 1000.0)
+    llamadas = contar_recalculos(monkeypatch)
+    for i in range(1_000):
+        m.actualizar(i, precio=60.0, costo_variable=25.0)
+    assert llamadas == []
+    m.actualizar(0, peso=2.0)
+    assert llamadas == [] and m.margen_ponderado() == 35.0
+
+
+def test_recalculo_periodico(monkeypatch):
+    monkeypatch.setattr(mezcla, "RECALCULO_CADA", 10)
+    m = MezclaVentas([50.0, 30.0], [30.0, 20.0], [1.0, 1.0], 1000.0)
+    llamadas = contar_recalculos(monkeypatch)
+    for i in range(25):
+        m.actualizar(i % 2, precio=40.0 + i)
+    assert len(llamadas) == 2
+
+
+@pytest.mark.parametrize("pesos", [[1.0, -1.0], [[1.0, 1.0]]])
+def test_datos_invalidos(pesos):
+    with pytest.raises(ValueError):
+        MezclaVentas([50.0, 30.0], [30.0, 20.0], pesos, 1000.0)
+
+
+def test_peso_negativo_en_actualizar():
+    m = MezclaVentas([50.0], [30.0], [1.0], 1000.0)
+    with pytest.raises(ValueError):
+        m.actualizar(0, peso=-1.0)
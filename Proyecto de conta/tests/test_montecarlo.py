@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import montecarlo
+from montecarlo import CUBETAS, combinar_momentos, leer_distribucion, simular
+
+
+def sorteos_completos(distribuciones, unidades, sorteos, semilla, tamano_bloque):
+    """Reproduce todos los sorteos de simular con las mismas semillas por bloque."""
+    bloques = [tamano_bloque] * (sorteos // tamano_bloque) + ([sorteos % tamano_bloque] if sorteos % tamano_bloque else [])
+    semillas = np.random.SeedSequence(semilla).spawn(len(bloques))
+    utilidades = []
+    for s, n in zip(semillas, bloques):
+        p, cv, cf = montecarlo._muestrear_bloque(distribuciones, s, n)
+        utilidades.append(unidades * (p - cv) - cf)
+    return np.concatenate(utilidades)
+
+
+def test_momentos_contra_numpy_con_desplazamiento_grande():
+    # Con la media lejos de cero, suma_cuadrados / n - media² pierde todos los dígitos de la varianza
+    distribuciones = [("normal", (50.0, 0.001)), ("fijo", (30.0,)), ("fijo", (1e9,))]
+    r = simular(*distribuciones, 1e6, sorteos=30_000, semilla=4, tamano_bloque=7_000)
+    utilidad = sorteos_completos(distribuciones, 1e6, 30_000, 4, 7_000)
+    np.testing.assert_allclose(r["utilidad_media"], utilidad.mean(), rtol=1e-12)
+    np.testing.assert_allclose(r["utilidad_desviacion"], utilidad.std(), rtol=1e-9)
+
+
+def test_combinar_momentos():
+    datos = np.random.default_rng(1).normal(1e6, 3.0, 1001)
+    partes = [datos[:1], datos[1:400], datos[400:]]
+    momentos = (0, 0.0, 0.0)
+    for parte in partes:
+        momentos = combinar_momentos(momentos, (len(parte), parte.mean(), ((parte - parte.mean()) ** 2).sum()))
+    n, media, m2 = momentos
+    assert n == len(datos)
+    np.testing.assert_allclose([media, m2 / n], [datos.mean(), datos.var()], rtol=1e-10)
+
+
+def test_histograma_cuenta_fuera_de_rango():
+    # El rango sale de un piloto pequeño (el primer bloque); las colas de los demás bloques quedan fuera
+    r = simular("normal:50,5", "fijo:30", "fijo:1000", 100.0, sorteos=20_000, semilla=2, tamano_bloque=100)
+    histograma = r["histograma_utilidad"]
+    assert len(histograma["conteos"]) == CUBETAS
+    assert histograma["debajo"] + histograma["encima"] > 0
+    assert sum(histograma["conteos"]) + histograma["debajo"] + histograma["encima"] == 20_000
+
+
+def test_mismo_resultado_con_varios_procesos():
+    argumentos = ("uniforme:40,60", "triangular:20,30,35", "normal:5000,500", 300.0)
+    uno = simular(*argumentos, sorteos=50_000, semilla=9, tamano_bloque=10_000)
+    varios = simular(*argumentos, sorteos=50_000, semilla=9, tamano_bloque=10_000, procesos=2)
+    assert uno == varios
+
+
+@pytest.mark.parametrize("texto", ["triangular:5,5,5", "triangular:1,9,5", "normal:50,-1",
+                                   "lognormal:1,-0.5", "uniforme:9,1", "normal:50,abc", "nan", "fijo:inf"])
+def test_parametros_invalidos(texto):
+    with pytest.raises(ValueError):
+        leer_distribucion(texto)
+
+
+def test_main_informa_parametros_invalidos(capsys):
+    with pytest.raises(SystemExit) as salida:
+        montecarlo.main(["--precio", "normal:50,-5", "--costo-variable", "30", "--costo-fijo", "1000", "--unidades", "10"])
+    assert salida.value.code == 2
+    assert "desviación" in capsys.readouterr().err
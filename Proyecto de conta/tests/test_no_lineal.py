@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from no_lineal import CurvasNoLineales, maximo_seccion_aurea
+
+
+def test_caso_lineal():
+    # elasticidad inf, sin descuento ni aprendizaje: el punto de equilibrio de siempre
+    curvas = CurvasNoLineales([50.0, 40.0], [30.0, 35.0], [200000.0, 1000.0])
+    cruces = curvas.puntos_equilibrio(50000.0)
+    assert cruces.producto.tolist() == [0, 1]
+    np.testing.assert_allclose(cruces.unidades, [10000.0, 200.0], rtol=1e-9)
+    assert cruces.direccion.tolist() == [1, 1]
+
+
+def test_cruces_y_maximo_contra_fuerza_bruta():
+    curvas = CurvasNoLineales([40.0, 25.0, 60.0], [20.0, 18.0, 30.0], [20000.0, 5000.0, 90000.0], elasticidad=3.0,
+                              volumen_referencia=10000.0, descuento=0.2, aprendizaje=0.9)
+    volumen_maximo = 200000.0
+    cruces = curvas.puntos_equilibrio(volumen_maximo)
+    optimo = curvas.maximo(volumen_maximo)
+
+    malla = np.linspace(0.0, volumen_maximo, 400001)
+    for producto in range(len(curvas)):
+        utilidad = curvas.utilidad(np.tile(malla, (len(curvas), 1)))[producto]
+        cambios = np.flatnonzero((utilidad[1:] >= 0) != (utilidad[:-1] >= 0))
+        propios = cruces.unidades[cruces.producto == producto]
+        assert len(propios) == len(cambios)
+        assert np.all((malla[cambios] <= propios) & (propios <= malla[cambios + 1]))
+
+        mejor = np.argmax(utilidad)
+        assert abs(optimo.unidades[producto] - malla[mejor]) <= malla[1]
+        assert optimo.utilidad[producto] >= utilidad[mejor] - 1e-6 * abs(utilidad[mejor])
+
+
+def test_seccion_aurea():
+    centros = np.array([1.0, 2.5, -3.0])
+    x, f = maximo_seccion_aurea(lambda x: -(x - centros) ** 2, -10.0, 10.0)
+    np.testing.assert_allclose(x, centros, atol=1e-6)
+    np.testing.assert_allclose(f, 0.0, atol=1e-12)
+
+
+def test_parametros_invalidos():
+    with pytest.raises(ValueError):
+        CurvasNoLineales(10.0, 5.0, 100.0, elasticidad=0.8)
+    with pytest.raises(ValueError):
+        CurvasNoLineales(10.0, 5.0, 100.0, descuento=1.0)
+    with pytest.raises(ValueError):
+        CurvasNoLineales(10.0, 5.0, 100.0, volumen_referencia=0.0)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from nucleo import (calcular_punto_equilibrio, contar_volumenes, equilibrio_en_sitio, muestrear_curva,
+                    punto_equilibrio, rango_volumenes, sensibilidad)
+
+
+def test_equilibrio_escalar():
+    r = calcular_punto_equilibrio(50.0, 1000.0, 30.0, 80)
+    assert (r.margen, r.unidades, r.ventas, r.utilidad) == (20.0, 50.0, 2500.0, 600.0)
+    assert isinstance(r.unidades, float)
+
+
+def test_sin_margen_y_datos_no_finitos():
+    # Margen cero o negativo: no hay equilibrio (inf); nan en cualquier dato: nan
+    r = calcular_punto_equilibrio([30.0, 20.0, np.nan, 50.0], [1000.0, 1000.0, 1000.0, np.inf], 30.0, 10)
+    np.testing.assert_array_equal(r.margen, [0.0, -10.0, np.nan, 20.0])
+    np.testing.assert_array_equal(r.unidades, [np.inf, np.inf, np.nan, np.nan])
+    np.testing.assert_array_equal(r.ventas, [np.inf, np.inf, np.nan, np.nan])
+    np.testing.assert_array_equal(punto_equilibrio([1000.0, 1000.0, np.nan], [0.0, -1.0, 5.0]), [np.inf, np.inf, np.nan])
+
+
+def test_nucleo_en_sitio_sobre_vistas():
+    # paralelo escribe en vistas de columnas de un arreglo compartido
+    rng = np.random.default_rng(0)
+    entrada = np.vstack([rng.uniform(10, 60, 50), rng.uniform(0, 5000, 50), rng.uniform(10, 60, 50), rng.uniform(0, 300, 50)])
+    salida = np.full((4, 50), -1.0)
+    equilibrio_en_sitio(*entrada[:, 10:30], salida[:, 10:30])
+    esperado = calcular_punto_equilibrio(*entrada[:, 10:30])
+    for fila, valores in zip(salida, esperado):
+        np.testing.assert_array_equal(fila[10:30], valores)
+    assert (salida[:, :10] == -1.0).all() and (salida[:, 30:] == -1.0).all()
+
+
+def test_sensibilidad_forma():
+    malla = sensibilidad([40.0, 50.0, 60.0], [30.0, 35.0], 1000.0)
+    assert malla.unidades.shape == (2, 3)
+    np.testing.assert_allclose(malla.unidades[0], [100.0, 50.0, 1000.0 / 30.0])
+
+
+@pytest.mark.parametrize("relleno, presupuesto, cantidad", [(None, 10, 10), (None, 1000, 1000), (0, 1000, 4), (3, 1000, 7)])
+def test_muestrear_curva_relleno(relleno, presupuesto, cantidad):
+    # Dos especiales dentro del rango y uno fuera, que no cuenta
+    x = muestrear_curva(0.0, 100.0, [33.3, 66.6, 500.0], relleno=relleno, presupuesto=presupuesto)
+    assert len(x) == cantidad
+    assert x[0] == 0.0 and x[-1] == 100.0
+    assert {33.3, 66.6} <= set(x.tolist())
+    assert np.all(np.diff(x) > 0)
+
+
+@pytest.mark.parametrize("inicio, fin, paso, cantidad", [(0, 10, 1, 11), (0, 1, 0.1, 11), (5, 5, 1, 1), (0, 9.99, 1, 10)])
+def test_contar_volumenes(inicio, fin, paso, cantidad):
+    assert contar_volumenes(inicio, fin, paso) == cantidad
+    assert len(rango_volumenes(inicio, fin, paso)) == cantidad
+
+
+@pytest.mark.parametrize("inicio, fin, paso", [(0, 10, 0), (0, 10, -1), (10, 0, 1), (0, np.inf, 1), (np.nan, 1, 1)])
+def test_contar_volumenes_invalidos(inicio, fin, paso):
+    with pytest.raises(ValueError):
+        contar_volumenes(inicio, fin, paso)
+
+
+def test_rango_volumenes_maximo():
+    with pytest.raises(ValueError, match="máximo"):
+        rango_volumenes(0, 1000, 1, maximo=100)
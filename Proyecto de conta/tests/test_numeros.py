@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from numeros import _convertir_rapido, _convertir_uno, convertir, convertir_con_mascara, convertir_texto
+
+
+def ruta_lenta(textos, formato):
+    """Convierte celda por celda con _convertir_uno; NaN en las ilegibles."""
+    valores = []
+    for texto in textos:
+        try:
+            valores.append(_convertir_uno(texto, formato))
+        except ValueError:
+            valores.append(np.nan)
+    return np.array(valores)
+
+
+@pytest.mark.parametrize("formato", ["gt", "es", "auto"])
+def test_ruta_rapida_coincide_con_lenta(formato):
+    # Textos al azar con dígitos, separadores, signos, paréntesis, Q y espacios
+    rng = np.random.default_rng(3)
+    alfabeto = list("0123456789.,-()Q ")
+    textos = ["".join(rng.choice(alfabeto, rng.integers(1, 9))) for _ in range(20_000)]
+    rapidos, resueltos = _convertir_rapido(np.array(textos), formato)
+    lentos = ruta_lenta([t for t, r in zip(textos, resueltos) if r], formato)
+    np.testing.assert_array_equal(rapidos[resueltos], lentos)
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("Q 1,234.50", 1234.5), ("(5)", -5.0), ("-.36", -0.36), ("- 5", -5.0), ("Q(12.5)", -12.5),
+    (")", np.nan), ("5)", np.nan), ("(5", np.nan), (")5(", np.nan), ("((5))", np.nan),
+    (".-36", np.nan), ("5-", np.nan), ("(-5)", np.nan), ("1.2.3", np.nan), ("abc", np.nan),
+])
+def test_casos_limite(texto, esperado):
+    valores, ilegibles = convertir_con_mascara([texto], "gt")
+    np.testing.assert_array_equal(valores, [esperado])
+    assert ilegibles[0] == np.isnan(esperado)
+    np.testing.assert_array_equal(ruta_lenta([texto], "gt"), [esperado])
+
+
+@pytest.mark.parametrize("texto, formato, esperado", [
+    ("1.234,5", "es", 1234.5), ("1,234.5", "gt", 1234.5),
+    ("1.234,5", "auto", 1234.5), ("1,234.5", "auto", 1234.5), ("12,5", "auto", 12.5),
+])
+def test_formatos(texto, formato, esperado):
+    assert convertir_texto(texto, formato) == esperado
+
+
+def test_nan_escrito_no_es_ilegible():
+    valores, ilegibles = convertir_con_mascara(["nan", "x"])
+    assert np.isnan(valores).all()
+    assert ilegibles.tolist() == [False, True]
+
+
+def test_errores_numerados():
+    with pytest.raises(ValueError, match="fila 12"):
+        convertir(["1", "2", "5)"], fila_inicial=10)
+    np.testing.assert_array_equal(convertir(["1", "5)"], errores="nan"), [1.0, np.nan])
+    with pytest.raises(ValueError):
+        convertir(["1"], formato="us")
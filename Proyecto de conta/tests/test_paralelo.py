@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+import lotes
+from paralelo import EjecutorParalelo, dividir_en_fragmentos
+
+
+def escenarios(filas, semilla=0):
+    """Bloque de escenarios con precios negativos, márgenes nulos, nan e inf mezclados."""
+    rng = np.random.default_rng(semilla)
+    bloque = {
+        "precio": rng.uniform(-20, 90, filas),
+        "costo_fijo": rng.uniform(0, 1e4, filas),
+        "costo_variable": rng.uniform(0, 60, filas),
+        "unidades": rng.integers(0, 500, filas).astype(np.float64),
+    }
+    bloque["precio"][::7] = bloque["costo_variable"][::7]
+    bloque["precio"][3::11] = np.nan
+    bloque["costo_fijo"][5::13] = np.inf
+    return bloque
+
+
+@pytest.mark.parametrize("filas, procesos", [(10, 3), (2, 3), (1, 4), (0, 2), (100, 1)])
+def test_fragmentos_contiguos(filas, procesos):
+    fragmentos = dividir_en_fragmentos(filas, procesos)
+    assert len(fragmentos) <= procesos
+    assert [i for inicio, fin in fragmentos for i in range(inicio, fin)] == list(range(filas))
+
+
+def test_bloque_igual_al_serial():
+    bloque = escenarios(1001)
+    esperado = lotes.calcular_bloque(bloque)
+    with EjecutorParalelo(3) as ejecutor:
+        # Un bloque menor después de uno mayor reutiliza la memoria compartida
+        for filas in (1001, 17, 0):
+            parte = {nombre: valores[:filas] for nombre, valores in bloque.items()}
+            resultado = ejecutor.calcular_bloque(parte)
+            for nombre, valores in esperado.items():
+                np.testing.assert_array_equal(resultado[nombre], valores[:filas])
+
+
+@pytest.mark.parametrize("tamano_bloque", [64, 1000])
+def test_archivo_igual_con_varios_procesos(tmp_path, tamano_bloque):
+    bloque = escenarios(777, semilla=1)
+    entrada = tmp_path / "entrada.csv"
+    escritor = lotes.EscritorCsv(entrada)
+    escritor.escribir(bloque)
+    escritor.cerrar()
+
+    lotes.procesar(entrada, tmp_path / "serial.csv", tamano_bloque, procesos=1)
+    lotes.procesar(entrada, tmp_path / "paralelo.csv", tamano_bloque, procesos=3)
+    assert (tmp_path / "serial.csv").read_bytes() == (tmp_path / "paralelo.csv").read_bytes()
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+import precios
+from precios import optimizar_curva, optimizar_elasticidad, optimizar_lineal, optimizar_tabla
+
+
+def mejor_en_malla(demanda, precios, costo_variable):
+    """Precio y contribución máximos de cada producto evaluando una malla densa de precios."""
+    contribucion = (precios - costo_variable[:, np.newaxis]) * demanda(precios)
+    mejor = np.argmax(contribucion, axis=1)
+    filas = np.arange(len(precios))
+    return precios[filas, mejor], contribucion[filas, mejor]
+
+
+def test_lineal():
+    r = optimizar_lineal([1000.0, 500.0, 100.0], [10.0, 5.0, 10.0], [30.0, 40.0, 20.0], 2000.0)
+    # p* = (a / b + cv) / 2; el tercero no tiene demanda ni al costo variable (a / b = 10 < 20)
+    np.testing.assert_allclose(r.precio, [65.0, 70.0, np.nan])
+    np.testing.assert_allclose(r.volumen, [350.0, 150.0, np.nan])
+    np.testing.assert_allclose(r.utilidad, [350.0 * 35 - 2000, 150.0 * 30 - 2000, np.nan])
+    np.testing.assert_allclose(r.unidades_equilibrio, [2000 / 35, 2000 / 30, np.nan])
+    assert r.factible.tolist() == [True, True, False]
+
+
+def test_elasticidad():
+    r = optimizar_elasticidad(100.0, 1000.0, [2.0, 3.0, 1.0], 40.0, 0.0)
+    np.testing.assert_allclose(r.precio, [80.0, 60.0, np.nan])
+    np.testing.assert_allclose(r.volumen[:2], [1000.0 * 0.8 ** -2, 1000.0 * 0.6 ** -3])
+    assert r.factible.tolist() == [True, True, False]
+
+
+def test_tabla_contra_fuerza_bruta():
+    generador = np.random.default_rng(7)
+    n = 200
+    precios = np.sort(generador.uniform(10, 150, (n, 12)), axis=1)
+    volumenes = np.sort(generador.uniform(0, 1e4, (n, 12)), axis=1)[:, ::-1]
+    costo_variable = generador.uniform(5, 60, n)
+    r = optimizar_tabla(precios, volumenes, costo_variable, 1000.0)
+
+    malla = precios[:, :1] + (precios[:, -1:] - precios[:, :1]) * np.linspace(0, 1, 20001)
+    demanda = lambda p: np.array([np.interp(fila, x, y) for fila, x, y in zip(p, precios, volumenes)])
+    _, contribucion = mejor_en_malla(demanda, malla, costo_variable)
+    obtenida = (r.precio - costo_variable) * r.volumen
+    factibles = contribucion > 0
+    assert r.factible.tolist() == factibles.tolist()
+    assert np.all(obtenida[factibles] >= contribucion[factibles] - 1e-9 * contribucion[factibles])
+
+
+def test_tabla_con_relleno():
+    # Filas de distinto largo: NaN al final; una sola observación no basta
+    precios = [[10.0, 20.0, np.nan], [15.0, np.nan, np.nan]]
+    volumenes = [[100.0, 0.0, np.nan], [50.0, np.nan, np.nan]]
+    r = optimizar_tabla(precios, volumenes, [2.0, 2.0], 0.0)
+    np.testing.assert_allclose(r.precio[0], 11.0)  # (p - 2) (200 - 10 p) tiene su máximo en p = 11
+    assert r.factible.tolist() == [True, False]
+
+
+def test_curva_coincide_con_lineal():
+    intercepto = np.array([1000.0, 500.0])
+    pendiente = np.array([10.0, 5.0])
+    costo_variable = np.array([30.0, 40.0])
+    demanda = lambda p: (intercepto - pendiente * p.T).T
+    r = optimizar_curva(demanda, costo_variable, intercepto / pendiente, costo_variable, 2000.0)
+    esperado = optimizar_lineal(intercepto, pendiente, costo_variable, 2000.0)
+    np.testing.assert_allclose(r.precio, esperado.precio, rtol=1e-7)
+    np.testing.assert_allclose(r.utilidad, esperado.utilidad, rtol=1e-9)
+
+
+def test_curva_escalar():
+    r = optimizar_curva(lambda p: 1000.0 - 10.0 * p, 0.0, 100.0, 30.0, 0.0)
+    np.testing.assert_allclose(r.precio, [65.0], rtol=1e-7)
+
+
+def test_leer_demanda_montos_con_formato(tmp_path):
+    ruta = tmp_path / "demanda.csv"
+    ruta.write_text('producto,intercepto,pendiente,costo_variable,costo_fijo\nA,"Q1,000.00",10,30,2000\n', encoding="utf-8")
+    productos, r = precios.leer_demanda(ruta, "lineal")
+    assert productos.tolist() == ["A"]
+    np.testing.assert_allclose(r.precio, [65.0])
+
+
+@pytest.mark.parametrize("filas, error", [
+    ("A,1000,10,30,2000\nB,500,abc,40,2000\nC,5\n", "línea 3: valor numérico inválido en la columna pendiente"),
+    ("A,1000,10,30,2000\nC,5\nB,500,abc,40,2000\n", "línea 3: faltan columnas"),
+])
+def test_main_informa_la_linea_del_error(tmp_path, capsys, filas, error):
+    ruta = tmp_path / "demanda.csv"
+    ruta.write_text("producto,intercepto,pendiente,costo_variable,costo_fijo\n" + filas, encoding="utf-8")
+    with pytest.raises(SystemExit) as salida:
+        precios.main([str(ruta)])
+    assert salida.value.code == 2
+    assert error in capsys.readouterr().err
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from validacion import (COSTO_FIJO_NEGATIVO, COSTO_VARIABLE_NEGATIVO, FILA_INCOMPLETA, FUERA_DE_CENTAVOS, MENSAJES,
+                        NO_FINITO, NOMBRES, PRECIO_NO_MAYOR_QUE_COSTO, PRECIO_NO_POSITIVO, UNIDADES_NEGATIVAS, contar, mensaje, validar)
+
+
+def test_bits_distintos():
+    bits = list(MENSAJES)
+    assert bits == list(NOMBRES)
+    assert all(bit & (bit - 1) == 0 for bit in bits)
+    assert sum(bits) < 256  # caben en uint8
+
+
+@pytest.mark.parametrize("datos, codigo", [
+    ((50.0, 1000.0, 30.0, 10.0), 0),
+    ((50.0, 0.0, 30.0, None), 0),  # costo fijo cero es válido
+    ((np.nan, 1000.0, 30.0, 10.0), NO_FINITO),
+    ((50.0, 1000.0, 30.0, np.inf), NO_FINITO),
+    ((0.0, 1000.0, 30.0, 10.0), PRECIO_NO_POSITIVO | PRECIO_NO_MAYOR_QUE_COSTO),
+    ((50.0, -1.0, 30.0, 10.0), COSTO_FIJO_NEGATIVO),
+    ((50.0, 1000.0, -1.0, 10.0), COSTO_VARIABLE_NEGATIVO),
+    ((30.0, 1000.0, 30.0, 10.0), PRECIO_NO_MAYOR_QUE_COSTO),
+    ((50.0, 1000.0, 30.0, -1.0), UNIDADES_NEGATIVAS),
+    ((-5.0, -1.0, -1.0, -1.0), PRECIO_NO_POSITIVO | COSTO_FIJO_NEGATIVO | COSTO_VARIABLE_NEGATIVO
+     | PRECIO_NO_MAYOR_QUE_COSTO | UNIDADES_NEGATIVAS),
+])
+def test_codigos(datos, codigo):
+    r = validar(*datos)
+    assert int(r.codigos) == codigo
+    assert bool(r.validos) == (codigo == 0)
+
+
+def test_difusion():
+    # Un solo costo fijo para varios precios
+    r = validar([50.0, 20.0, np.nan], 1000.0, 30.0)
+    assert r.codigos.dtype == np.uint8
+    assert r.codigos.tolist() == [0, PRECIO_NO_MAYOR_QUE_COSTO, NO_FINITO]
+
+
+def test_mensaje():
+    assert mensaje(0) == ""
+    texto = mensaje(np.uint8(PRECIO_NO_POSITIVO | FILA_INCOMPLETA))
+    assert texto.split("\n") == [MENSAJES[PRECIO_NO_POSITIVO], MENSAJES[FILA_INCOMPLETA]]
+
+
+def test_contar():
+    codigos = [0, NO_FINITO, PRECIO_NO_POSITIVO | PRECIO_NO_MAYOR_QUE_COSTO, PRECIO_NO_MAYOR_QUE_COSTO,
+               FUERA_DE_CENTAVOS]
+    conteo = contar(codigos)
+    assert set(conteo) == set(NOMBRES.values())
+    assert conteo["no_finito"] == 1
+    assert conteo["precio_no_positivo"] == 1
+    assert conteo["precio_no_mayor_que_costo"] == 2
+    assert conteo["fuera_de_centavos"] == 1
+    assert conteo["fila_incompleta"] == 0
@@ -0,0 +1,87 @@
+import numpy as np
+from collections import namedtuple
+
+# Reglas de validación de escenarios, compartidas por las GUI y el modo por
+# lotes. Trabajan sobre arreglos completos: devuelven una máscara de filas
+# válidas y, por fila, un código con un bit por cada regla que no se cumple.
+#
+# Costos fijos en cero son válidos (el punto de equilibrio es 0 unidades);
+# antes conta.py los aceptaba y nb .py/fin.py no.
+
+NO_FINITO = 1                   # algún dato es NaN o infinito (o no se pudo leer)
+PRECIO_NO_POSITIVO = 2          # precio <= 0
+COSTO_FIJO_NEGATIVO = 4         # costo fijo < 0
+COSTO_VARIABLE_NEGATIVO = 8     # costo variable < 0
+PRECIO_NO_MAYOR_QUE_COSTO = 16  # precio <= costo variable: no hay punto de equilibrio
+UNIDADES_NEGATIVAS = 32         # unidades < 0
+FILA_INCOMPLETA = 64            # a la fila del archivo le faltan columnas (solo en lotes)
+FUERA_DE_CENTAVOS = 128         # algún monto o resultado no cabe en centavos int64 (solo lotes --centavos)
+
+MENSAJES = {
+    NO_FINITO: "Todos los valores deben ser números finitos.",
+    PRECIO_NO_POSITIVO: "El precio debe ser mayor que cero.",
+    COSTO_FIJO_NEGATIVO: "Los costos fijos no pueden ser negativos.",
+    COSTO_VARIABLE_NEGATIVO: "El costo variable no puede ser negativo.",
+    PRECIO_NO_MAYOR_QUE_COSTO: "El precio debe ser mayor que el costo variable.",
+    UNIDADES_NEGATIVAS: "Las unidades no pueden ser negativas.",
+    FILA_INCOMPLETA: "Faltan columnas en la fila.",
+    FUERA_DE_CENTAVOS: "Los montos no caben en centavos enteros (int64).",
+}
+
+# Nombres cortos para resúmenes y archivos de rechazos
+NOMBRES = {
+    NO_FINITO: "no_finito",
+    PRECIO_NO_POSITIVO: "precio_no_positivo",
+    COSTO_FIJO_NEGATIVO: "costo_fijo_negativo",
+    COSTO_VARIABLE_NEGATIVO: "costo_variable_negativo",
+    PRECIO_NO_MAYOR_QUE_COSTO: "precio_no_mayor_que_costo",
+    UNIDADES_NEGATIVAS: "unidades_negativas",
+    FILA_INCOMPLETA: "fila_incompleta",
+    FUERA_DE_CENTAVOS: "fuera_de_centavos",
+}
+
+Validacion = namedtuple("Validacion", ["validos", "codigos"])
+
+
+def validar(precio, costo_fijo, costo_variable, unidades=None):
+    """Valida escenarios elemento a elemento; devuelve (máscara de válidos, códigos uint8)."""
+    precio = np.asarray(precio, dtype=np.float64)
+    costo_fijo = np.asarray(costo_fijo, dtype=np.float64)
+    costo_variable = np.asarray(costo_variable, dtype=np.float64)
+    datos = [precio, costo_fijo, costo_variable]
+    if unidades is not None:
+        unidades = np.asarray(unidades, dtype=np.float64)
+        datos.append(unidades)
+
+    forma = np.broadcast_shapes(*(d.shape for d in datos))
+    codigos = np.zeros(forma, dtype=np.uint8)
+    finitos = np.ones(forma, dtype=bool)
+    for dato in datos:
+        finitos &= np.isfinite(dato)
+    codigos[~finitos] |= NO_FINITO
+
+    # Las comparaciones con NaN son falsas, así que una celda no finita solo marca NO_FINITO
+    with np.errstate(invalid="ignore"):
+        reglas = [
+            (precio <= 0, PRECIO_NO_POSITIVO),
+            (costo_fijo < 0, COSTO_FIJO_NEGATIVO),
+            (costo_variable < 0, COSTO_VARIABLE_NEGATIVO),
+            (precio <= costo_variable, PRECIO_NO_MAYOR_QUE_COSTO),
+        ]
+        if unidades is not None:
+            reglas.append((unidades < 0, UNIDADES_NEGATIVAS))
+    for falla, bit in reglas:
+        codigos[np.broadcast_to(falla, forma)] |= bit
+
+    return Validacion(codigos == 0, codigos)
+
+
+def mensaje(codigo):
+    """Texto para la GUI con todas las reglas que incumple un código (vacío si es válido)."""
+    return "\n".join(texto for bit, texto in MENSAJES.items() if int(codigo) & bit)
+
+
+def contar(codigos):
+    """Filas que incumplen cada regla: {nombre: cantidad} (una fila puede contar en varias)."""
+    codigos = np.asarray(codigos, dtype=np.uint8)
+    return {NOMBRES[bit]: int(np.count_nonzero(codigos & bit)) for bit in NOMBRES}
@@ -1,14 +1,20 @@
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
-import matplotlib.pyplot as plt
+from nucleo import punto_equilibrio
+from cache_graficas import GraficasEnSegundoPlano
+from dibujos import dibujar_wef
 
 def calcular_punto_equilibrio():
     try:
         p = float(entry_precio.get())
         cv = float(entry_costo_variable.get())
         cf = float(entry_costo_fijo.get())
-        x = cf / (p - cv)
+        x = punto_equilibrio(cf, p - cv)
+        if not np.isfinite(x):
+            resultado.set("El precio debe ser mayor que el costo variable.")
+            tabla.delete(*tabla.get_children())
+            return
         ventas_totales = x * p
         costos_variables_totales = x * cv
         margen_contribucion_total = ventas_totales - costos_variables_totales
@@ -31,22 +37,18 @@ def calcular_punto_equilibrio():
         resultado.set("Por favor, ingrese valores numéricos válidos.")
 
 def graficar(p, cv, cf, x):
-    unidades = np.arange(0, x*2, 1)
-    ingresos = unidades * p
-    costos_totales = cf + (unidades * cv)
-    utilidad = ingresos - costos_totales
-
-    plt.figure(figsize=(10, 6))
-    plt.plot(unidades, ingresos, label='Ingresos')
-    plt.plot(unidades, costos_totales, label='Costos Totales')
-    plt.plot(unidades, utilidad, label='Utilidad')
-    plt.axvline(x=x, color='r', linestyle='--', label='Punto de Equilibrio')
-    plt.xlabel('Unidades Vendidas')
-    plt.ylabel('Quetzales')
-    plt.title('Análisis del Punto de Equilibrio')
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    # Se dibuja en segundo plano (o sale de la caché en disco) y se muestra como imagen
+    graficas.solicitar("wef", dibujar_wef, (p, cv, cf, x), mostrar_grafica, error_grafica)
+
+def mostrar_grafica(ruta):
+    imagen = tk.PhotoImage(file=ruta)
+    label_grafica.config(image=imagen, text="")
+    label_grafica.image = imagen  # conservar la referencia
+
+def error_grafica(error):
+    # La imagen anterior ya no corresponde a los datos: se quita y se muestra el error en su lugar
+    label_grafica.config(image="", text=f"No se pudo generar la gráfica: {error}")
+    label_grafica.image = None
 
 # Configuración de la interfaz gráfica
 root = tk.Tk()
@@ -79,4 +81,9 @@ tabla.heading("Concepto", text="Concepto")
 tabla.heading("Valor", text="Valor")
 tabla.grid(column=1, row=6, columnspan=2, sticky=(tk.W, tk.E))
 
+# Gráfica (imagen PNG generada en segundo plano)
+label_grafica = ttk.Label(frame)
+label_grafica.grid(column=1, row=7, columnspan=2)
+graficas = GraficasEnSegundoPlano(root)
+
 root.mainloop()